@@ -1,30 +1,56 @@
+import functools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
 from config.logger_config import configure_logger
+from config.pipeline_config import PIPELINE_CONFIG
 from crawler import start_polling_thread, poll_table
-from validators.field_data_validator import validate_field
-from utils.db_util import get_session, get_columns_from_store
-from models.files import insert_data, fetch_files_to_process, update_file_status
-import pandas as pd
+from validators.schema_registry import get_schema
+from utils.db_util import get_session, get_columns_from_store, unit_of_work
+from models.files import insert_data, find_completed_duplicate, fetch_files_to_process, fetch_pending_files, update_file_status, update_files_status
+from models.pipeline_metrics import track_file
+from utils.checksum_util import calculate_checksum
+from utils.metrics_server import start_metrics_server
+from utils.pipeline_metrics import collect_stages, peak_memory_bytes, timed_stage
+
+# pandas, Pandera and the validators are imported by the functions that process a file, so
+# the watcher starts without loading them; `benchmarks/import_budget.py` keeps it that way.
 
 # Configure logger
 logger = configure_logger(__name__)
 
 # Fetch column list for the 'field_bronze_table'
 field_column_list = get_columns_from_store('field_bronze_table')
-logger.info(f"Fetched column list for 'field_bronze_table': {field_column_list}")
+logger.info("Fetched column list for 'field_bronze_table': %s", field_column_list)
 
-def insert_fields_data_in_db(filepath):
+def insert_fields_data_in_db(filepath, checksum=None):
     """
     Insert field data into the database.
 
     :param filepath: Path to the file to insert data from.
+    :param checksum: Checksum computed while the file was uploaded; calculated when not given.
     """
     with get_session() as session:
         try:
-            logger.info(f"Inserting data from file: {filepath}")
-            insert_data(session, str(filepath), 'field', '')
+            logger.info("Inserting data from file: %s", filepath)
+            if checksum is None:
+                checksum = calculate_checksum(str(filepath))
+
+            # A byte-identical file that was already validated is not processed again
+            original = find_completed_duplicate(session, checksum)
+            if original is not None:
+                logger.info("File %s is identical to file ID %s; reusing its results.", filepath, original.id)
+                from validators.field_data_validator import reuse_results
+                insert_data(session, str(filepath), 'field', f"Duplicate of file ID {original.id}", checksum=checksum, status='3')
+                reuse_results(original.id, original.filename, os.path.basename(str(filepath)))
+                return
+
+            insert_data(session, str(filepath), 'field', '', checksum=checksum)
             logger.info("Data insertion completed successfully.")
         except Exception as e:
-            logger.error(f"Error inserting data from file {filepath}: {e}")
+            logger.error("Error inserting data from file %s: %s", filepath, e)
 
 def validate_columns(df, column_list):
     """
@@ -35,14 +61,94 @@ def validate_columns(df, column_list):
     """
     missing_columns = [col for col in column_list if col not in df.columns]
     if missing_columns:
-        logger.warning(f"Missing columns: {missing_columns}")
+        logger.warning("Missing columns: %s", missing_columns)
     return len(missing_columns)
 
+def results_not_stored(session, file_id):
+    """
+    Set a file whose validated rows could not be stored to error instead of complete.
+
+    :param session: Session used to update the file status.
+    :param file_id: ID of the file.
+    :return: False, for the caller to return.
+    """
+    logger.error("Validation results could not be stored. Updating file status to error.")
+    update_file_status(session, '4', file_id, "Error: Validation results could not be stored")
+    return False
+
+def validate_staged_file(session, file):
+    """
+    Validate a file staged in DuckDB and update its status.
+
+    :param session: Session used to update the file status.
+    :param file: Row of the file to process.
+    :return: True if the file was validated, False if its columns did not match or its rows
+        could not be stored.
+    """
+    from validators.field_data_validator import validate_field_staged
+
+    update_file_status(session, '2', file.id)
+    missing_columns, stored = validate_field_staged(file.filepath, file.id, file.filename, field_column_list)
+    if missing_columns:
+        logger.warning("Missing columns: %s", missing_columns)
+        logger.error("Column validation failed. Updating file status to error.")
+        update_file_status(session, '4', file.id, "Error: Columns do not match")
+        return False
+    if not stored:
+        return results_not_stored(session, file.id)
+
+    logger.info("Field validation completed successfully. Updating file status to complete.")
+    update_file_status(session, '3', file.id)
+    return True
+
+def validate_pandas_file(session, file):
+    """
+    Validate a file parsed with pandas and update its status.
+
+    :param session: Session used to update the file status.
+    :param file: Row of the file to process.
+    :return: True if the file was validated, False if its columns did not match or its rows
+        could not be stored.
+    """
+    import pandas as pd
+    from validators.field_data_validator import validate_field, validate_field_in_chunks
+
+    chunk_rows = PIPELINE_CONFIG["chunk_rows"]
+    with timed_stage("read_csv"):
+        if chunk_rows:
+            # Streaming mode: only read the header here, rows are read chunk by chunk
+            df = pd.read_csv(file.filepath, nrows=0)
+        else:
+            df = pd.read_csv(file.filepath)
+
+    # Validate columns
+    if validate_columns(df, field_column_list):
+        logger.error("Column validation failed. Updating file status to error.")
+        update_file_status(session, '4', file.id, "Error: Columns do not match")
+        return False
+
+    logger.info("Column validation passed. Updating file status to processing.")
+    update_file_status(session, '2', file.id)
+
+    # Perform field validation
+    if chunk_rows:
+        stored = validate_field_in_chunks(file.filepath, file.id, file.filename, chunk_rows)
+    else:
+        stored = validate_field(df, file.id, file.filename)
+    if not stored:
+        return results_not_stored(session, file.id)
+    logger.info("Field validation completed successfully. Updating file status to complete.")
+    update_file_status(session, '3', file.id)
+    return True
+
 def read_fields_data_in_db():
     """
     Read data from the database, validate it, and update file statuses.
+
+    The file's rows, errors, statuses and metrics are committed together as one unit of work.
+    A file whose validation raises is set to error, so it is not picked up again.
     """
-    with get_session() as session:
+    with unit_of_work(), get_session() as session:
         try:
             logger.info("Fetching files to process.")
             results = fetch_files_to_process(session)
@@ -50,33 +156,222 @@ def read_fields_data_in_db():
                 logger.info("No files to process.")
                 return
 
-            logger.info(f"Processing file: {results.filepath}")
-            df = pd.read_csv(results.filepath)
+            logger.info("Processing file: %s", results.filepath)
+            with track_file(results.id, results.filepath) as metrics:
+                try:
+                    if PIPELINE_CONFIG["ingest_engine"] == "duckdb":
+                        completed = validate_staged_file(session, results)
+                    else:
+                        completed = validate_pandas_file(session, results)
+                except Exception as e:
+                    logger.error("An error occurred while processing file %s: %s", results.filename, e)
+                    # Discard the file's partial writes; the error status then commits on its own
+                    session.rollback()
+                    update_file_status(session, '4', results.id, f"Error: {e}")
+                    completed = False
+                if not completed:
+                    metrics.status = "error"
+        except Exception as e:
+            logger.error("An error occurred while processing files: %s", e)
+
+def claim_file_batch(session):
+    """
+    Claim pending files for one validation batch, bounded by a file count and a byte budget.
+
+    :param session: Session used to mark the files as processing.
+    :return: List of (id, filename, filepath) rows.
+    """
+    batch = []
+    batch_bytes = 0
+    for file in fetch_pending_files(session, PIPELINE_CONFIG["batch_files"]):
+        size = os.path.getsize(file.filepath) if os.path.exists(file.filepath) else 0
+        # A file larger than the budget still forms a batch of its own
+        if batch and batch_bytes + size > PIPELINE_CONFIG["batch_bytes"]:
+            break
+        batch.append(file)
+        batch_bytes += size
+
+    if batch:
+        update_files_status(session, '2', [file.id for file in batch])
+    return batch
+
+def read_files_batch_in_db():
+    """
+    Validate a batch of small pending files as one frame and commit their results at once.
+
+    Files failing to parse or missing columns are set to error on their own. If the batch
+    cannot be committed, its files are validated one by one instead.
+    """
+    import pandas as pd
+    from validators.field_data_validator import validate_field_batch, save_results
+
+    with get_session() as session:
+        try:
+            files = claim_file_batch(session)
+            if not files:
+                logger.info("No files to process.")
+                return
+
+            logger.info("Processing a batch of %s files.", len(files))
+            batch_start = time.perf_counter()
+            frames = {}
+            with collect_stages() as batch_metrics:
+                for file in files:
+                    try:
+                        with timed_stage("read_csv"):
+                            df = pd.read_csv(file.filepath)
+                        remarks = "Error: Columns do not match" if validate_columns(df, field_column_list) else None
+                    except Exception as e:
+                        remarks = f"Error: {e}"
+                    if remarks is None:
+                        frames[file.id] = df
+                        continue
+
+                    logger.error("Could not validate file %s: %s. Updating file status to error.", file.filename, remarks)
+                    update_file_status(session, '4', file.id, remarks)
+                    with track_file(file.id, file.filepath) as metrics:
+                        metrics.status = "error"
+                if not frames:
+                    return
 
-            # Validate columns
-            if validate_columns(df, field_column_list):
+                validated = [file for file in files if file.id in frames]
+                try:
+                    results = validate_field_batch(session, frames)
+                except Exception as e:
+                    logger.error("An error occurred while validating the batch: %s", e)
+                    results = None
+                # Rows, errors and statuses of the whole batch are committed together
+                if results is None or not update_files_status(session, '3', [file.id for file in validated]):
+                    session.rollback()
+                    logger.warning("Batch could not be committed; validating its files one by one.")
+                    for file in validated:
+                        with track_file(file.id, file.filepath) as metrics:
+                            if not validate_pandas_file(session, file):
+                                metrics.status = "error"
+                    return
+
+            logger.info("Batch validated successfully; exporting the results of %s files.", len(validated))
+            # The metrics of the whole batch are committed at once
+            with unit_of_work():
+                for file in validated:
+                    with track_file(file.id, file.filepath) as metrics:
+                        # Batch stages are shared by all of its files
+                        metrics.started = batch_start
+                        for stage, seconds in batch_metrics.stage_durations.items():
+                            metrics.add_stage(stage, seconds)
+                        file_rows, file_errors = results[file.id]
+                        metrics.row_count, metrics.error_count = len(file_rows), len(file_errors)
+                        save_results(file.id, file.filename, file_errors)
+        except Exception as e:
+            logger.error("An error occurred while processing the batch: %s", e)
+
+def write_validation_result(future, file_id, file_name, filepath, submitted):
+    """
+    Persist the result of a validator process. Runs in the writer process only.
+
+    :param future: Completed future returned by `validate_file_task`.
+    :param file_id: ID of the validated file.
+    :param file_name: Name of the validated file.
+    :param filepath: Path of the validated file.
+    :param submitted: perf_counter() value when the file was handed to the pool.
+    """
+    from validators.field_data_validator import log_and_save_results
+
+    # Rows, errors, status and metrics of the file are committed together
+    with unit_of_work(), get_session() as session, track_file(file_id, filepath) as metrics:
+        # The file's processing time includes the time spent in the validator process
+        metrics.started = submitted
+        try:
+            result = future.result()
+            for stage, seconds in result["timings"].items():
+                metrics.add_stage(stage, seconds)
+            metrics.peak_memory_bytes = max(result["peak_memory_bytes"] or 0, peak_memory_bytes() or 0) or None
+            if result["missing_columns"]:
+                logger.warning("Missing columns: %s", result['missing_columns'])
                 logger.error("Column validation failed. Updating file status to error.")
-                update_file_status(session, '4', results.id, "Error: Columns do not match")
-            else:
-                logger.info("Column validation passed. Updating file status to processing.")
-                update_file_status(session, '2', results.id)
-
-                # Perform field validation
-                validate_field(df, results.id, results.filename)
-                logger.info("Field validation completed successfully. Updating file status to complete.")
-                update_file_status(session, '3', results.id)
+                update_file_status(session, '4', file_id, "Error: Columns do not match")
+                metrics.status = "error"
+                return
+
+            if not log_and_save_results(result["df"], file_id, file_name, result["errors_df"]):
+                results_not_stored(session, file_id)
+                metrics.status = "error"
+                return
+            logger.info("Field validation completed successfully. Updating file status to complete.")
+            update_file_status(session, '3', file_id)
         except Exception as e:
-            logger.error(f"An error occurred while processing files: {e}")
+            logger.error("An error occurred while processing file %s: %s", file_name, e)
+            update_file_status(session, '4', file_id, f"Error: {e}")
+            metrics.status = "error"
+
+def process_files_in_parallel(executor, max_in_flight):
+    """
+    Drain pending files through the validator process pool.
+
+    Validator processes parse and validate the files; this process is the only one that
+    opens the DuckDB database and writes their results.
+
+    :param executor: Process pool running `validate_file_task`.
+    :param max_in_flight: Maximum number of files handed to the pool at once.
+    """
+    from validators.field_data_validator import generate_schema_code
+    from validators.validation_worker import validate_file_task
+
+    try:
+        schema_code = get_schema("field_bronze_table", generate_schema_code)
+    except Exception as e:
+        logger.error("An error occurred while preparing the validation schema: %s", e)
+        return
+
+    in_flight = {}
+    while True:
+        # Keep the pool busy with pending files
+        if len(in_flight) < max_in_flight:
+            in_flight_ids = [file_id for file_id, *_ in in_flight.values()]
+            with unit_of_work(), get_session() as session:
+                pending_files = fetch_pending_files(session, max_in_flight - len(in_flight), in_flight_ids)
+                for file_id, file_name, filepath in pending_files:
+                    logger.info("Processing file: %s", filepath)
+                    update_file_status(session, '2', file_id)
+                    future = executor.submit(validate_file_task, file_id, filepath, field_column_list, schema_code)
+                    in_flight[future] = (file_id, file_name, filepath, time.perf_counter())
+
+        if not in_flight:
+            return
+
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            write_validation_result(future, *in_flight.pop(future))
 
 def start_app():
     """
     Main entry point for executing the database initialization script.
     """
+    if PIPELINE_CONFIG["metrics_port"]:
+        try:
+            start_metrics_server(PIPELINE_CONFIG["metrics_port"])
+        except OSError as e:
+            # Metrics are optional; keep validating files without the endpoint
+            logger.error("Could not start the metrics server: %s", e)
+
     # Start the polling thread and begin processing
     try:
         logger.info("Starting polling thread for data insertion.")
         start_polling_thread(insert_fields_data_in_db)
         logger.info("Polling thread started successfully.")
-        poll_table(read_fields_data_in_db)
+
+        workers = PIPELINE_CONFIG["validation_workers"]
+        if workers > 0:
+            logger.info("Starting %s validation worker processes.", workers)
+            # Spawned workers start clean and never inherit the writer's DuckDB connections
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                poll_table(functools.partial(process_files_in_parallel, executor, workers * 2))
+        elif PIPELINE_CONFIG["batch_files"] > 1 and PIPELINE_CONFIG["ingest_engine"] == "pandas" and not PIPELINE_CONFIG["chunk_rows"]:
+            logger.info("Validating up to %s files per batch.", PIPELINE_CONFIG['batch_files'])
+            poll_table(read_files_batch_in_db)
+        else:
+            if PIPELINE_CONFIG["batch_files"] > 1:
+                logger.warning("Batching only applies to the pandas engine without chunking; validating files one by one.")
+            poll_table(read_fields_data_in_db)
     except Exception as e:
-        logger.error(f"An error occurred during polling: {e}")
+        logger.error("An error occurred during polling: %s", e)
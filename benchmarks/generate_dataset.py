@@ -0,0 +1,128 @@
+import argparse
+import csv
+import math
+import random
+from datetime import date, timedelta
+
+# CRS notations found in the uploads, with the (min_x, min_y, max_x, max_y) extent polygon
+# centres are drawn from and the polygon radius, in the units of the CRS
+CRS_VARIANTS = {
+    "EPSG:4326": ((-170, -80, 170, 80), 1),
+    "EPSG:3857": ((-1.9e7, -1.5e7, 1.9e7, 1.5e7), 1e5),
+    "EPSG::4267": ((-125, 25, -70, 50), 1),
+    "Geographic2D:EPSG::4267": ((-125, 25, -70, 50), 1),
+    "BoundGeographic2D:EPSG::4267_EPSG::15851": ((-125, 25, -70, 50), 1),
+    "BoundProjected:EPSG::26715_EPSG::15851": ((200000, 1000000, 800000, 9000000), 1e4),
+}
+
+# Extent and radius of CRS variants given on the command line
+DEFAULT_EXTENT = CRS_VARIANTS["EPSG:4326"]
+
+FIELD_TYPES = ["OilField", "GasField", "MixedField"]
+
+# Errors injected into a share of the fields, one per field, matching the custom checks
+ERROR_KINDS = [
+    "future_discovery_date",
+    "Inconsistent_field_data",
+    "polygon_incomplete",
+    "polygon_not_closed",
+    "polygon_self_intersecting",
+    "crs_inconsistent",
+]
+
+HEADER = ["FieldName", "FieldType", "DiscoveryDate", "X", "Y", "CRS", "Source", "ParentFieldName"]
+
+def _polygon(rng, vertices, extent=DEFAULT_EXTENT):
+    """
+    Build a closed polygon around a random centre.
+
+    Vertices are taken at increasing angles around the centre, so the boundary is simple and
+    runs counterclockwise.
+
+    :param rng: random.Random instance.
+    :param vertices: Number of distinct vertices; the first one is repeated to close the ring.
+    :param extent: Tuple of ((min_x, min_y, max_x, max_y), radius) the polygon is drawn in.
+    :return: List of (x, y) tuples.
+    """
+    (min_x, min_y, max_x, max_y), max_radius = extent
+    centre_x, centre_y = rng.uniform(min_x, max_x), rng.uniform(min_y, max_y)
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(vertices))
+    ring = []
+    for angle in angles:
+        radius = rng.uniform(0.2, 1) * max_radius
+        ring.append((round(centre_x + radius * math.cos(angle), 6), round(centre_y + radius * math.sin(angle), 6)))
+    return ring + [ring[0]]
+
+def generate_field_rows(fields=1000, vertices=20, error_rate=0.05, crs_variants=None, seed=0):
+    """
+    Generate field boundary rows: one closed polygon per FieldName, rows of a field contiguous.
+
+    :param fields: Number of FieldName groups.
+    :param vertices: Distinct vertices per polygon.
+    :param error_rate: Share of fields (0-1) given one of ERROR_KINDS.
+    :param crs_variants: CRS strings to choose from; defaults to CRS_VARIANTS. Polygons of
+        CRS strings missing from CRS_VARIANTS are drawn in the DEFAULT_EXTENT.
+    :param seed: Random seed, so runs are comparable.
+    :return: Iterator of row lists in HEADER order.
+    """
+    rng = random.Random(seed)
+    crs_variants = list(crs_variants or CRS_VARIANTS)
+    for number in range(fields):
+        field_name = f"Field_{number:07d}"
+        field_type = rng.choice(FIELD_TYPES)
+        discovery_date = date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 70))
+        crs = rng.choice(crs_variants)
+        parent = f"Field_{rng.randrange(number):07d}" if number and rng.random() < 0.1 else ""
+        error = rng.choice(ERROR_KINDS) if rng.random() < error_rate else None
+
+        points = _polygon(rng, vertices, CRS_VARIANTS.get(crs, DEFAULT_EXTENT))
+        if error == "polygon_not_closed":
+            points = points[:-1]
+        if error == "polygon_self_intersecting" and vertices >= 4:
+            # The boundary passes through its fourth vertex twice
+            points[1] = points[3]
+        if error == "future_discovery_date":
+            discovery_date = date.today() + timedelta(days=rng.randrange(1, 3650))
+
+        for vertex, (x, y) in enumerate(points):
+            row_type, row_date, row_crs = field_type, discovery_date, crs
+            if error == "Inconsistent_field_data" and vertex == 1:
+                row_type = next(t for t in FIELD_TYPES if t != field_type)
+            if error == "polygon_incomplete" and vertex == 1:
+                row_crs = ""
+            if error == "crs_inconsistent" and vertex == 1:
+                # The second vertex names another CRS
+                row_crs = "EPSG:4269" if crs != "EPSG:4269" else "EPSG:4326"
+            yield [field_name, row_type, row_date.isoformat(), x, y, row_crs, "Synthetic", parent]
+
+def generate_field_dataset(path, fields=1000, vertices=20, error_rate=0.05, crs_variants=None, seed=0):
+    """
+    Write a synthetic field boundary CSV.
+
+    :param path: Output CSV path.
+    :return: Number of data rows written.
+    """
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for row in generate_field_rows(fields, vertices, error_rate, crs_variants, seed):
+            writer.writerow(row)
+            count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic field boundary dataset.")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--fields", type=int, default=1000, help="Number of FieldName groups")
+    parser.add_argument("--vertices", type=int, default=20, help="Distinct vertices per polygon")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of fields with an injected error")
+    parser.add_argument("--crs", nargs="+", default=None, help="CRS variants to choose from")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    rows = generate_field_dataset(args.output, args.fields, args.vertices, args.error_rate, args.crs, args.seed)
+    print(f"Wrote {rows} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
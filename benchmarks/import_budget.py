@@ -0,0 +1,115 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules loaded before the watcher starts, in import order, with their budget in milliseconds
+IMPORT_BUDGETS = {
+    "startup": 1500,
+    "app": 300,
+}
+
+# Dependencies that must only be imported once a file is processed
+DEFERRED_MODULES = ["pandas", "pandera"]
+
+def parse_importtime(output):
+    """
+    Parse the report written by `python -X importtime`.
+
+    Nested imports are listed before the module importing them, so every line up to a
+    top-level module belongs to that module.
+
+    :param output: stderr of the interpreter.
+    :return: {top-level module: (cumulative milliseconds, set of the modules it imported)}.
+    """
+    report = {}
+    nested = set()
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        nested.add(name.strip())
+        if not name[1:].startswith(" "):
+            report[name.strip()] = (int(cumulative) / 1000, nested)
+            nested = set()
+    return report
+
+def measure_imports(modules, workdir):
+    """
+    Import the modules in a fresh interpreter, the way `startup.py` loads them.
+
+    :param modules: Module names, imported in this order.
+    :param workdir: Directory holding an initialized database.
+    :return: Parsed importtime report, see `parse_importtime`.
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    statement = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+def check_import_budget(budgets, repeat):
+    """
+    Measure the import time of each module against its budget.
+
+    The database is initialized first in a temporary directory, removed afterwards, so
+    importing `app` reads a real schema catalog without touching `db_files/`.
+
+    :param budgets: {module: budget in milliseconds}, in import order.
+    :param repeat: Number of fresh interpreters to take the median over.
+    :return: List of (module, median ms, budget ms, deferred modules it loaded) tuples.
+    """
+    timings = {module: [] for module in budgets}
+    deferred = {module: set() for module in budgets}
+    with tempfile.TemporaryDirectory(prefix="bronze_import_budget_") as workdir:
+        schema_path = os.path.join(REPO_ROOT, "config", "schema.json")
+        subprocess.run(
+            [sys.executable, "-c", f"import startup; startup.initialize_database_from_json({schema_path!r})"],
+            cwd=workdir, env=dict(os.environ, PYTHONPATH=REPO_ROOT), capture_output=True, check=True
+        )
+
+        for _ in range(repeat):
+            report = measure_imports(list(budgets), workdir)
+            for module in budgets:
+                cumulative, nested = report.get(module, (0.0, set()))
+                timings[module].append(cumulative)
+                deferred[module] |= nested & set(DEFERRED_MODULES)
+
+    return [
+        (module, statistics.median(timings[module]), budget, sorted(deferred[module]))
+        for module, budget in budgets.items()
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the pipeline entry modules.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters per measurement")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS", help="Override the budget of a module")
+    args = parser.parse_args()
+
+    budgets = dict(IMPORT_BUDGETS)
+    for override in args.budget:
+        module, budget = override.split("=", 1)
+        budgets[module] = float(budget)
+
+    failed = False
+    for module, median, budget, deferred in check_import_budget(budgets, args.repeat):
+        print(f"{module:<12} {median:8.1f} ms   budget {budget:8.1f} ms")
+        if median > budget:
+            print(f"Import of {module} is over budget: {median:.1f} ms > {budget:.1f} ms", file=sys.stderr)
+            failed = True
+        if deferred:
+            print(f"Importing {module} loads {', '.join(deferred)}; import them where a file is processed", file=sys.stderr)
+            failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.generate_dataset import generate_field_dataset
+
+# Stages timed on every run, in pipeline order
+STAGES = [
+    "checksum",
+    "read_csv",
+    "schema_generation",
+    "pandera_validation",
+    "custom_checks",
+    "log_field_bronze_table",
+    "log_errors_to_db",
+    "export",
+    "duckdb_read_csv",
+    "sql_rules",
+]
+
+class StageTimer:
+    """Collects wall-clock durations per stage."""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def __call__(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+
+def run_pipeline_once(dataset, timer):
+    """
+    Run every pipeline stage once on a dataset, timing each one separately.
+
+    Must be called from the benchmark's working directory after the database is initialized.
+
+    :param dataset: Path of the CSV file.
+    :param timer: StageTimer receiving the durations.
+    :return: Dictionary with the row and error counts of the run.
+    """
+    import pandas as pd
+
+    from models.bronze_validation_results_field_data import log_field_bronze_table
+    from models.files import insert_data
+    from models.validation_errors import log_errors_to_db
+    from utils.checksum_util import calculate_checksum
+    from utils.db_util import get_columns_from_store, get_session
+    from utils.duckdb_ingest import drop_staged_table, get_data_column_types, stage_csv
+    from validators.field_data_validator import compile_base_schema, integrate_custom_checks, save_results
+    from validators.field_schema import CUSTOM_CHECKS, run_validation
+    from validators.sql_rules import run_sql_rules
+
+    # Every module shares one logger; keep its output out of the timings
+    logging.getLogger("config.logger_config").setLevel(logging.WARNING)
+
+    file_name = os.path.basename(dataset)
+    with timer("checksum"):
+        checksum = calculate_checksum(dataset)
+    with get_session() as session:
+        file_id = insert_data(session, dataset, "field", "benchmark", checksum=checksum)
+        duckdb_file_id = insert_data(session, dataset, "field", "benchmark", checksum=checksum)
+
+    with timer("read_csv"):
+        df = pd.read_csv(dataset)
+
+    with timer("schema_generation"):
+        integrate_custom_checks("field_bronze_table")
+    base_schema = compile_base_schema("field_bronze_table")
+
+    with timer("pandera_validation"):
+        schema_errors = run_validation(df, base_schema)
+
+    with timer("custom_checks"):
+        rule_errors = [check(df) for check in CUSTOM_CHECKS]
+    errors_df = pd.concat([schema_errors, *rule_errors], ignore_index=True)
+
+    with timer("log_field_bronze_table"):
+        log_field_bronze_table(df, file_id, set(errors_df["row_index"].dropna()))
+    with timer("log_errors_to_db"):
+        log_errors_to_db(errors_df, file_id)
+    with timer("export"):
+        save_results(file_id, file_name, errors_df)
+
+    # The DuckDB ingest path: parallel CSV reader and business rules as SQL
+    column_types = get_data_column_types("field_bronze_table", get_columns_from_store("field_bronze_table"))
+    with get_session() as session:
+        with timer("duckdb_read_csv"):
+            stage_csv(session, dataset, "staging_benchmark", column_types)
+        with timer("sql_rules"):
+            sql_error_count = run_sql_rules(session, "staging_benchmark", duckdb_file_id)
+        drop_staged_table(session, "staging_benchmark")
+
+    return {"rows": len(df), "errors": len(errors_df), "sql_rule_errors": sql_error_count}
+
+def summarize(runs):
+    """
+    Aggregate the stage durations of several runs.
+
+    :param runs: List of {stage: seconds} dictionaries.
+    :return: {stage: {"min", "median", "max", "runs"}} in seconds.
+    """
+    summary = {}
+    for stage in STAGES:
+        values = [run[stage] for run in runs if stage in run]
+        if values:
+            summary[stage] = {
+                "min": min(values),
+                "median": statistics.median(values),
+                "max": max(values),
+                "runs": values,
+            }
+    return summary
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare median stage durations with a previous result file.
+
+    :param results: Results of this run.
+    :param baseline: Results loaded from a previous run.
+    :param threshold: Allowed slowdown factor, e.g. 1.2 for 20%.
+    :return: List of (stage, baseline median, current median) tuples that regressed.
+    """
+    regressions = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if previous and current["median"] > previous["median"] * threshold:
+            regressions.append((stage, previous["median"], current["median"]))
+    return regressions
+
+def run_benchmarks(fields, vertices, error_rate, repeat, dataset=None, seed=0, keep_workdir=False):
+    """
+    Time the pipeline stages against a temporary DuckDB database.
+
+    The process moves into a temporary directory, so the database (`db_files/`) and the
+    exports (`output/`) it creates never touch the working tree. The directory is removed
+    afterwards unless `keep_workdir` is set.
+
+    :return: Dictionary of parameters, environment and per-stage timings.
+    """
+    workdir = tempfile.mkdtemp(prefix="bronze_benchmark_")
+    original_cwd = os.getcwd()
+    try:
+        if dataset is None:
+            dataset = os.path.join(workdir, "benchmark_fields.csv")
+            generate_field_dataset(dataset, fields, vertices, error_rate, seed=seed)
+        dataset = os.path.abspath(dataset)
+        os.chdir(workdir)
+
+        import duckdb
+        import pandas as pd
+        import startup
+
+        startup.initialize_database_from_json(os.path.join(REPO_ROOT, "config", "schema.json"))
+
+        runs = []
+        counts = {}
+        for _ in range(repeat):
+            timer = StageTimer()
+            counts = run_pipeline_once(dataset, timer)
+            runs.append(timer.timings)
+        dataset_bytes = os.path.getsize(dataset)
+    finally:
+        os.chdir(original_cwd)
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "parameters": {
+            "fields": fields,
+            "vertices": vertices,
+            "error_rate": error_rate,
+            "repeat": repeat,
+            "seed": seed,
+            "dataset": dataset,
+            "dataset_bytes": dataset_bytes,
+            **counts,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "duckdb": duckdb.__version__,
+            "pandas": pd.__version__,
+        },
+        "workdir": workdir if keep_workdir else None,
+        "stages": summarize(runs),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each stage of the validation pipeline.")
+    parser.add_argument("--fields", type=int, default=1000, help="Number of FieldName groups")
+    parser.add_argument("--vertices", type=int, default=20, help="Distinct vertices per polygon")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of fields with an injected error")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated dataset")
+    parser.add_argument("--dataset", help="Existing CSV to benchmark instead of a generated one")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="Previous JSON results to compare the stage medians with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Allowed slowdown factor against the baseline")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep the temporary database and exports for inspection")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(
+        args.fields, args.vertices, args.error_rate, args.repeat, args.dataset, args.seed, args.keep_workdir
+    )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        for stage, timing in results["stages"].items():
+            print(f"{stage:<24} {timing['median'] * 1000:10.1f} ms")
+    else:
+        print(json.dumps(results, indent=2))
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        for stage, previous, current in regressions:
+            print(f"Regression in {stage}: {previous * 1000:.1f} ms -> {current * 1000:.1f} ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from colorama import Fore, Style, init
 
 # Initialize colorama for Windows compatibility
@@ -7,10 +15,114 @@ init(autoreset=True)
 
 create_file: bool = False
 
+# Logging configuration, overridable through environment variables
+LOG_CONFIG = {
+    # "text" writes colored lines to the console; "json" writes one JSON object per line, without color codes
+    "format": os.getenv("LOG_FORMAT", "text").lower(),
+    # Minimum level of the messages written
+    "level": os.getenv("LOG_LEVEL", "INFO").upper(),
+}
+
+LOG_LINE_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_configure_lock = threading.Lock()
+
+class ColoredFormatter(logging.Formatter):
+    """Colors the level and message of console lines without changing the record seen by other handlers."""
+
+    LEVEL_COLORS = {
+        "DEBUG": Fore.BLUE,
+        "INFO": Fore.GREEN,
+        "WARNING": Fore.YELLOW,
+        "ERROR": Fore.RED,
+        "CRITICAL": Fore.MAGENTA,
+    }
+
+    def format(self, record):
+        level_color = self.LEVEL_COLORS.get(record.levelname, "")
+        record = copy.copy(record)
+        record.levelname = f"{level_color}{record.levelname}{Style.RESET_ALL}"
+        record.msg = f"{level_color}{record.msg}{Style.RESET_ALL}"
+        return super().format(record)
+
+class JsonFormatter(logging.Formatter):
+    """Writes each record as one JSON object per line, for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of messages logged with `extra={"rate_limit": seconds}`.
+
+    A message is a repeat when the same format string (and optional "rate_key" extra, e.g. a
+    file path) was let through less than `rate_limit` seconds ago. The next message let through
+    reports how many repeats were dropped. Messages without "rate_limit" are never dropped.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._last_emitted = {}
+
+    def filter(self, record):
+        interval = getattr(record, "rate_limit", None)
+        if not interval:
+            return True
+
+        key = (record.msg, getattr(record, "rate_key", None))
+        now = time.monotonic()
+        with self._lock:
+            emitted, suppressed = self._last_emitted.get(key, (None, 0))
+            if emitted is not None and now - emitted < interval:
+                self._last_emitted[key] = (emitted, suppressed + 1)
+                return False
+            self._last_emitted[key] = (now, 0)
+            # Forget keys that stayed quiet, such as files that finished uploading
+            if len(self._last_emitted) > 1024:
+                self._last_emitted = {
+                    k: v for k, v in self._last_emitted.items() if now - v[0] < interval or k == key
+                }
+
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records for the listener thread, which formats and writes them."""
+
+    def prepare(self, record):
+        # Arguments are interpolated here, while they still hold their current values; the
+        # line formatting, color codes and I/O are left to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 def configure_logger(log_file_name: str):
     """
     Configures and returns a logger instance with optional file logging and colored console output.
 
+    Messages are put on a queue and written by a background listener thread, so logging never
+    waits on the console or the log file. The listener is stopped, and the queue flushed, when
+    the interpreter exits. Pass arguments %-style (`logger.info("Processing %s", path)`) so
+    messages below the configured level are never formatted.
+
     Parameters:
     - log_file_name (str): Name of the file to log messages.
     - create_file (bool): Whether to create the log file if it doesn't exist.
@@ -19,10 +131,21 @@ def configure_logger(log_file_name: str):
     - logging.Logger: Configured logger instance.
     """
     logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
 
     # Prevent adding multiple handlers if the logger is reused
-    if not logger.handlers:
+    with _configure_lock:
+        if logger.handlers:
+            return logger
+        logger.setLevel(LOG_CONFIG["level"])
+
+        if LOG_CONFIG["format"] == "json":
+            file_formatter = JsonFormatter()
+            stream_formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(LOG_LINE_FORMAT)
+            stream_formatter = ColoredFormatter(LOG_LINE_FORMAT)
+
+        handlers = []
         if create_file and not os.path.exists(log_file_name):
             # Create the log file directory if it doesn't exist
             os.makedirs(os.path.dirname(log_file_name), exist_ok=True)
@@ -30,31 +153,20 @@ def configure_logger(log_file_name: str):
         # File handler (only if create_file is True)
         if create_file:
             file_handler = logging.FileHandler(log_file_name)
-            file_handler.setLevel(logging.INFO)
-            file_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
-
-        # Stream handler with color-coded log levels and messages
-        class ColoredFormatter(logging.Formatter):
-            LEVEL_COLORS = {
-                "DEBUG": Fore.BLUE,
-                "INFO": Fore.GREEN,
-                "WARNING": Fore.YELLOW,
-                "ERROR": Fore.RED,
-                "CRITICAL": Fore.MAGENTA,
-            }
-
-            def format(self, record):
-                level_color = self.LEVEL_COLORS.get(record.levelname, "")
-                record.levelname = f"{level_color}{record.levelname}{Style.RESET_ALL}"
-                record.msg = f"{level_color}{record.msg}{Style.RESET_ALL}"
-                return super().format(record)
+            handlers.append(file_handler)
 
+        # Stream handler with color-coded log levels and messages, or JSON lines
         stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(logging.INFO)
-        stream_formatter = ColoredFormatter("%(asctime)s - %(levelname)s - %(message)s")
         stream_handler.setFormatter(stream_formatter)
-        logger.addHandler(stream_handler)
+        handlers.append(stream_handler)
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers)
+        listener.start()
+        atexit.register(listener.stop)
+
+        logger.addFilter(RateLimitFilter())
+        logger.addHandler(_DeferredQueueHandler(log_queue))
 
     return logger
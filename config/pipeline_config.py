@@ -0,0 +1,21 @@
+import os
+
+# Processing pipeline configuration, overridable through environment variables
+PIPELINE_CONFIG = {
+    # Number of validator processes; 0 validates files one by one on the main thread
+    "validation_workers": int(os.getenv("VALIDATION_WORKERS", "0")),
+    # Rows per chunk when validating files as a stream; 0 reads each file in one piece
+    "chunk_rows": int(os.getenv("VALIDATION_CHUNK_ROWS", "0")),
+    # CSV parser for uploads: "pandas" or "duckdb" (DuckDB's parallel reader, typed from the table DDL)
+    "ingest_engine": os.getenv("INGEST_ENGINE", "pandas").lower(),
+    # Validation result format: "csv", "parquet" (zstd) or "partitioned" (Parquet dataset by file_id / validation_date)
+    "output_format": os.getenv("OUTPUT_FORMAT", "csv").lower(),
+    # hashlib algorithm of the upload checksums used to detect duplicate files, e.g. "sha256" or "blake2b"
+    "checksum_algorithm": os.getenv("CHECKSUM_ALGORITHM", "sha256").lower(),
+    # Maximum number of pending files validated together in one batch; 0 or 1 validates them one by one
+    "batch_files": int(os.getenv("VALIDATION_BATCH_FILES", "0")),
+    # Maximum total size in bytes of the files of one batch
+    "batch_bytes": int(os.getenv("VALIDATION_BATCH_BYTES", str(16 * 1024 * 1024))),
+    # Port of the Prometheus metrics endpoint; 0 disables it
+    "metrics_port": int(os.getenv("METRICS_PORT", "5000")),
+}
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Base directory
@@ -9,6 +10,22 @@ CRAWLER_CONFIG = {
     "Fields_FOLDER": BASE_DIR / "uploads"
 }
 
+# Upload watcher configuration
+WATCHER_CONFIG = {
+    # "auto" uses inotify on Linux and falls back to polling; "inotify" or "poll" force a backend
+    "backend": os.getenv("WATCHER_BACKEND", "auto").lower(),
+    # Interval (in seconds) between scans of the polling backend
+    "poll_interval": 5,
+    # Interval (in seconds) between size checks of files that are still being copied
+    "check_interval": 1,
+    # Time (in seconds) with no modifications before a file is considered complete
+    "stabilization_time": 10,
+    # Time (in seconds) without size changes before a copy is considered abandoned
+    "abandonment_time": 1800,
+    # Minimum time (in seconds) between two copy progress messages of the same file
+    "progress_log_interval": 10,
+}
+
 # Ensure directories exist
 for folder in CRAWLER_CONFIG.values():
     folder.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
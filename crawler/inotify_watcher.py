@@ -0,0 +1,96 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+# inotify_init1 flags
+IN_CLOEXEC = 0o2000000
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_BUFFER_SIZE = 64 * 1024
+
+def _load_libc():
+    """Load libc and make sure it exposes the inotify calls."""
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify is only available on Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("libc does not provide inotify")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+class InotifyWatcher:
+    """
+    Minimal inotify binding watching a single directory for completed files.
+
+    IN_CLOSE_WRITE fires when a writer closes a file it had open for writing and IN_MOVED_TO
+    when a file is renamed into the directory, so both mark a file whose content is complete.
+    """
+
+    def __init__(self, directory, mask=IN_CLOSE_WRITE | IN_MOVED_TO):
+        """
+        :param directory: Directory to watch.
+        :param mask: inotify event mask to subscribe to.
+        :raises OSError: If inotify is unavailable or the watch cannot be added.
+        """
+        libc = _load_libc()
+        self._fd = libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._wd = libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), mask)
+        if self._wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+
+    def fileno(self):
+        """Return the inotify file descriptor."""
+        return self._fd
+
+    def read_events(self, timeout=None):
+        """
+        Wait for events and return them.
+
+        :param timeout: Maximum time (in seconds) to wait; None waits indefinitely.
+        :return: List of (mask, name) tuples; empty if the timeout expired.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+
+        data = os.read(self._fd, _READ_BUFFER_SIZE)
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,143 @@
+import os
+import time
+
+from config.logger_config import configure_logger
+from utils.checksum_util import IncrementalChecksum
+
+logger = configure_logger("watcher.log")
+
+class _PendingFile:
+    """Stabilization state of a single file."""
+
+    __slots__ = ("last_size", "last_activity_time", "checksum")
+
+    def __init__(self, now):
+        self.last_size = -1  # Track the last observed file size
+        self.last_activity_time = now  # Track the last time the file size changed
+        self.checksum = IncrementalChecksum()  # Hash of the bytes copied so far
+
+class FileStabilizationTracker:
+    """
+    Tracks every file that is still being copied and reports each one as soon as it stabilizes.
+
+    A file is ready once its size did not change between two checks and it has not been
+    modified for `stabilization_time` seconds. A file whose size has not changed for
+    `abandonment_time` seconds without stabilizing is reported as abandoned. All pending files
+    are checked on every `check()` call, so a slow upload never delays the others.
+
+    Bytes are hashed as they arrive, so a ready file's checksum is known without reading it again.
+    """
+
+    def __init__(self, stabilization_time=10, abandonment_time=1800, progress_log_interval=10):
+        """
+        :param stabilization_time: Time (in seconds) with no modifications before considering a file ready
+        :param abandonment_time: Maximum time (in seconds) with no activity before considering a file abandoned
+        :param progress_log_interval: Minimum time (in seconds) between two copy progress messages of a file
+        """
+        self.stabilization_time = stabilization_time
+        self.abandonment_time = abandonment_time
+        self.progress_log_interval = progress_log_interval
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, filepath):
+        return filepath in self._pending
+
+    def add(self, filepath):
+        """
+        Start tracking a file.
+
+        :param filepath: Path of the file to track
+        """
+        if filepath not in self._pending:
+            logger.info("Waiting for file to complete: %s", filepath)
+            self._pending[filepath] = _PendingFile(time.time())
+
+    def discard(self, filepath):
+        """
+        Stop tracking a file if it is pending.
+
+        :param filepath: Path of the file to forget
+        """
+        self._pending.pop(filepath, None)
+
+    def release(self, filepath):
+        """
+        Stop tracking a file that is known to be complete and return its checksum.
+
+        :param filepath: Path of the completed file
+        :return: Checksum of the file, or None if it was not tracked or could not be read
+        """
+        state = self._pending.pop(filepath, None)
+        if state is None:
+            return None
+        try:
+            return state.checksum.hexdigest(filepath)
+        except OSError as e:
+            logger.error("Error hashing file %s: %s", filepath, e)
+            return None
+
+    def check(self):
+        """
+        Check every pending file once.
+
+        :return: Tuple of (ready, abandoned) lists; ready holds (file path, checksum) tuples and
+            abandoned holds file paths. Neither is tracked any more.
+        """
+        ready = []
+        abandoned = []
+        now = time.time()
+
+        for filepath, state in list(self._pending.items()):
+            try:
+                # Ensure the file is accessible
+                if not os.access(filepath, os.R_OK):
+                    if not os.path.exists(filepath):
+                        raise FileNotFoundError(filepath)
+                    logger.info("File %s is not accessible yet.", filepath,
+                                extra={"rate_limit": self.progress_log_interval, "rate_key": filepath})
+                    continue
+
+                # Get current file size and modification time
+                stat_result = os.stat(filepath)
+                current_size = stat_result.st_size
+                current_modified_time = stat_result.st_mtime
+
+                # Detect incremental size changes
+                if state.last_size >= 0:
+                    increment = current_size - state.last_size
+                    if increment > 0:
+                        logger.info("Copied: +%s bytes | Total: %s bytes | %s", increment, current_size, filepath,
+                                    extra={"rate_limit": self.progress_log_interval, "rate_key": filepath})
+                        state.last_activity_time = now  # Update activity timer
+                        state.checksum.update(filepath)
+                    elif (now - state.last_activity_time) > self.abandonment_time:
+                        # Check for abandonment if no size change
+                        logger.warning("File copy abandoned after %s seconds of inactivity: %s", self.abandonment_time, filepath)
+                        del self._pending[filepath]
+                        abandoned.append(filepath)
+                        continue
+                else:
+                    logger.info("Current file size: %s bytes | %s", current_size, filepath)
+
+                # Check if the file has stabilized
+                if current_size == state.last_size and (now - current_modified_time) >= self.stabilization_time:
+                    checksum = state.checksum.hexdigest(filepath)
+                    logger.info("File stabilized: %s with size %s bytes.", filepath, current_size)
+                    del self._pending[filepath]
+                    ready.append((filepath, checksum))
+                    continue
+
+                # Update last observed file size
+                state.last_size = current_size
+
+            except FileNotFoundError:
+                logger.warning("File %s was removed before it stabilized.", filepath)
+                del self._pending[filepath]
+                abandoned.append(filepath)
+            except (OSError, PermissionError) as e:
+                logger.error("Error accessing file %s: %s", filepath, e)
+
+        return ready, abandoned
@@ -1,107 +1,190 @@
 import time
 from pathlib import Path
-from crawler.crawlerconfig import CRAWLER_CONFIG
+from config.logger_config import configure_logger
+from crawler.crawlerconfig import CRAWLER_CONFIG, WATCHER_CONFIG
+from crawler.inotify_watcher import (
+    InotifyWatcher, IN_CLOSE_WRITE, IN_CREATE, IN_DELETE, IN_MOVED_FROM, IN_MOVED_TO, IN_Q_OVERFLOW, IN_IGNORED
+)
+from crawler.stabilization import FileStabilizationTracker
 import threading
 import os
 
-def _wait_for_file_complete(filepath, stabilization_time=10, check_interval=5, abandonment_time=1800):
+logger = configure_logger("watcher.log")
+
+def _hand_off_stabilized_files(tracker, callback):
+    """
+    Check the pending files once and trigger the callback for each file that stabilized.
+
+    :param tracker: FileStabilizationTracker holding the pending files
+    :param callback: Function called with the path and checksum of each ready file
+    :return: Paths of the files handed off
     """
-    Wait until the file size stabilizes and is not modified for a certain duration.
-    Detect abandoned copy operations after prolonged inactivity.
-
-    :param filepath: Path of the file to check
-    :param stabilization_time: Time (in seconds) with no modifications before considering the file ready
-    :param check_interval: Interval (in seconds) between file size checks
-    :param abandonment_time: Maximum time (in seconds) with no activity before considering the file abandoned
-    :return: True if the file is ready for processing, False if the copy operation is abandoned
+    ready_files, abandoned_files = tracker.check()
+    for file in abandoned_files:
+        logger.warning("File not ready: %s", file)
+    for file, checksum in ready_files:
+        if callback:
+            callback(file, checksum)
+    return [file for file, _ in ready_files]
+
+def _list_csv_files(directory):
     """
-    print(f"Waiting for file to complete: {filepath}")
-    last_size = -1  # Track the last observed file size
-    last_activity_time = time.time()  # Track the last time the file size changed
+    List the .csv files in a directory using a single scandir pass.
 
-    while True:
-        try:
-            # Ensure the file is accessible
-            if not os.access(filepath, os.R_OK):
-                print(f"File {filepath} is not accessible yet.")
-                time.sleep(check_interval)
-                continue
-
-            # Get current file size and modification time
-            current_size = os.path.getsize(filepath)
-            current_modified_time = os.stat(filepath).st_mtime
-
-            # Detect incremental size changes
-            if last_size >= 0:
-                increment = current_size - last_size
-                if increment > 0:
-                    print(f"Copied: +{increment} bytes | Total: {current_size} bytes.")
-                    last_activity_time = time.time()  # Update activity timer
-                else:
-                    # Check for abandonment if no size change
-                    if (time.time() - last_activity_time) > abandonment_time:
-                        print(f"File copy abandoned after {abandonment_time} seconds of inactivity: {filepath}")
-                        return False
-            else:
-                print(f"Current file size: {current_size} bytes.")
-
-            # Check if the file has stabilized
-            if current_size == last_size and (time.time() - current_modified_time) >= stabilization_time:
-                print(f"File stabilized: {filepath} with size {current_size} bytes.")
-                return True
-
-            # Update last observed file size
-            last_size = current_size
-
-        except (OSError, PermissionError) as e:
-            print(f"Error accessing file {filepath}: {e}")
-
-        time.sleep(check_interval)
-
-
-def poll_folder(callback=None):
+    :param directory: Directory to scan
+    :return: Set of Path objects
+    """
+    with os.scandir(directory) as entries:
+        return {
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(".csv") and entry.is_file()
+        }
+
+def poll_folder(callback=None, seen_files=None):
     """
     Poll the uploads folder for new .csv files that are updated after the script starts
     and trigger a callback for each new file.
+
+    The folder is only rescanned when its modification time changes, so idle folders holding
+    many historical files are not listed every interval.
+
+    :param callback: Function called with the path and checksum of each new file
+    :param seen_files: Paths already handed off, e.g. by `inotify_folder` before it stopped;
+        they are not handed to the callback again while they stay in the folder
     """
     # Define the folder to watch
     directory_to_watch = Path(CRAWLER_CONFIG["Fields_FOLDER"])
 
-    print(f"Polling folder: {directory_to_watch} for new csv files updated after the script starts...")
-    seen_files = set()
-    script_start_time = time.time()  # Record the script's start time
+    logger.info("Polling folder: %s for new csv files updated after the script starts...", directory_to_watch)
+    seen_files = set(seen_files or ())
+    last_directory_mtime = None
+    last_scan_time = 0
+    tracker = FileStabilizationTracker(
+        WATCHER_CONFIG["stabilization_time"], WATCHER_CONFIG["abandonment_time"], WATCHER_CONFIG["progress_log_interval"]
+    )
 
     while True:
         # try:
-        # Get all .csv files in the folder
-        current_files = {
-            f for f in directory_to_watch.iterdir()
-            if f.is_file() and f.suffix == ".csv"
-        }
+        # Rescan only when files were added, removed or renamed since the last scan. Changes
+        # within the filesystem's timestamp granularity are covered by rescanning recent mtimes.
+        if time.time() - last_scan_time >= WATCHER_CONFIG["poll_interval"]:
+            last_scan_time = time.time()
+            directory_mtime = os.stat(directory_to_watch).st_mtime
+            if directory_mtime != last_directory_mtime or (time.time() - directory_mtime) < 2:
+                last_directory_mtime = directory_mtime
 
-        # Detect new files
-        new_files = current_files - seen_files
-        for file in new_files:
-            print(f"New file detected: {file}")
+                # Get all .csv files in the folder
+                current_files = _list_csv_files(directory_to_watch)
 
-            # Wait for the file to stabilize
-            if _wait_for_file_complete(file):
-                if callback:
-                    callback(file)
-            else:
-                print(f"File not ready: {file}")
-        # Update seen files
-        seen_files.update(new_files)
+                # Detect new files and track them until they stabilize
+                for file in current_files - seen_files:
+                    logger.info("New file detected: %s", file)
+                    tracker.add(file)
+
+                # Forget files that were removed so the set only tracks the folder's content
+                seen_files = current_files
+
+        # Hand off every pending file that stabilized, independently of the others
+        _hand_off_stabilized_files(tracker, callback)
 
         # except Exception as e:
-        #     print(f"Error during polling: {e}")
+        #     logger.error("Error during polling: %s", e)
+
+        time.sleep(WATCHER_CONFIG["check_interval"])
+
+def inotify_folder(callback=None, handed_off_files=None):
+    """
+    Watch the uploads folder with inotify and trigger a callback for each completed .csv file.
+
+    Files already present at start are handed to the callback once they stabilize, like the
+    first scan of `poll_folder`. After that, files are picked up as soon as their writer closes them
+    (IN_CLOSE_WRITE) or they are moved into the folder (IN_MOVED_TO), without rescanning. Files
+    created in the folder (IN_CREATE) are tracked while they are written, so they are hashed as
+    they grow.
+
+    A file is handed to the callback once: closing it again after that, e.g. when an editor or
+    `touch` opens it, is ignored until it is deleted or moved out of the folder. A file moved
+    into the folder is always a new upload, even under the name of one already handed off.
+
+    :param callback: Function called with the path and checksum of each completed file
+    :param handed_off_files: Set updated in place with the files handed to the callback, so a
+        caller falling back to `poll_folder` does not hand them off again
+    :raises OSError: If inotify is not available for the folder.
+    """
+    directory_to_watch = Path(CRAWLER_CONFIG["Fields_FOLDER"])
+
+    events = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVED_FROM
+    with InotifyWatcher(directory_to_watch, events) as watcher:
+        logger.info("Watching folder with inotify: %s for new csv files...", directory_to_watch)
+
+        # Files present at start stabilize in the background while events are handled. The watch
+        # is active before the scan, so a file still being written is completed by its event.
+        tracker = FileStabilizationTracker(
+            WATCHER_CONFIG["stabilization_time"], WATCHER_CONFIG["abandonment_time"], WATCHER_CONFIG["progress_log_interval"]
+        )
+        for file in _list_csv_files(directory_to_watch):
+            logger.info("Existing file detected: %s", file)
+            tracker.add(file)
+
+        # Files already handed to the callback, so later close events do not hand them off again
+        if handed_off_files is None:
+            handed_off_files = set()
+
+        while True:
+            timeout = WATCHER_CONFIG["check_interval"] if len(tracker) else None
+            for mask, name in watcher.read_events(timeout):
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning("inotify event queue overflowed; some uploads may need to be re-dropped.")
+                    continue
+                if mask & IN_IGNORED:
+                    raise OSError(f"inotify watch on {directory_to_watch} was removed")
+                if not name.endswith(".csv"):
+                    continue
+
+                file = directory_to_watch / name
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    tracker.discard(file)
+                    handed_off_files.discard(file)
+                    continue
+                if mask & IN_CREATE:
+                    tracker.add(file)
+                    continue
+                if mask & IN_MOVED_TO:
+                    handed_off_files.discard(file)
+                elif file in handed_off_files:
+                    continue
+
+                # The writer closed the file, so it no longer needs to stabilize
+                checksum = tracker.release(file)
+
+                logger.info("New file detected: %s", file)
+                handed_off_files.add(file)
+                if callback:
+                    callback(file, checksum)
+
+            if len(tracker):
+                handed_off_files.update(_hand_off_stabilized_files(tracker, callback))
+
+def watch_folder(callback=None):
+    """
+    Watch the uploads folder with the configured backend, falling back to polling
+    when inotify is not available.
+    """
+    backend = WATCHER_CONFIG["backend"]
+    # Files inotify handed off before its watch was removed are not delivered again by the poller
+    handed_off_files = set()
+    if backend in ("auto", "inotify"):
+        try:
+            inotify_folder(callback, handed_off_files)
+        except OSError as e:
+            logger.warning("inotify watcher unavailable (%s); falling back to polling.", e)
+    poll_folder(callback, handed_off_files)
 
-        time.sleep(5)  # Poll every 5 seconds
 def start_polling_thread(callback=None):
     """
-    Start the poll_folder function in a new thread.
+    Start the watch_folder function in a new thread.
     """
-    polling_thread = threading.Thread(target=poll_folder, args=(callback,), daemon=True)
+    polling_thread = threading.Thread(target=watch_folder, args=(callback,), daemon=True)
     polling_thread.start()
     return polling_thread
 
@@ -115,7 +198,7 @@ def poll_table(callback=None):
         interval (int): Time interval (in seconds) between polls.
         callback (function, optional): Function to process query results.
     """
-    print("Starting table polling...")
+    logger.info("Starting table polling...")
     try:
         while True:
 
@@ -125,4 +208,4 @@ def poll_table(callback=None):
             # Wait for the next poll
             time.sleep(10)
     except KeyboardInterrupt:
-        print("\nPolling stopped by user.")
\ No newline at end of file
+        logger.info("Polling stopped by user.")
\ No newline at end of file
@@ -1,23 +1,46 @@
 import logging
 
 from config.logger_config import configure_logger
+from utils.bulk_insert_util import bulk_insert_dataframe
 from utils.db_util import get_session
 from datetime import datetime
 import pandas as pd
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from sqlalchemy import String
+from utils.generate_sqlalchemy_model import get_model
+from utils.id_allocator import reserve_ids
 
 # Configure logging
 logger = configure_logger("field_bronze_table.log")
 
-FieldBronzeTableModel = None
-# Generate the SQLAlchemy model class dynamically for the 'field_bronze_table' table
-try:
-    if FieldBronzeTableModel is None:
-        FieldBronzeTableModel = generate_model_for_table('field_bronze_table')
-        logger.info(f"Generated model class for table: {FieldBronzeTableModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'field_bronze_table': {e}")
-    # Ensure FieldBronzeTableModel is defined as None if generation fails
+# Text stored for a missing value of a NOT NULL text column, as the per-row inserts stored NaN;
+# rows failing not_nullable are kept with the rest of the file
+MISSING_TEXT_VALUE = "nan"
+
+def __getattr__(name):
+    # The model is generated on first use, so importing this module does not read the database
+    if name == "FieldBronzeTableModel":
+        return get_model("field_bronze_table")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def insert_field_bronze_rows(session, df: pd.DataFrame):
+    """
+    Adds validated rows to the 'field_bronze_table' within the caller's transaction.
+
+    Parameters:
+    - session: SQLAlchemy session; the caller commits.
+    - df (pd.DataFrame): Rows carrying their row_index, file_id and validation_status columns.
+    """
+    FieldBronzeTableModel = get_model("field_bronze_table")
+    df["id"] = reserve_ids(session, FieldBronzeTableModel.__tablename__, len(df))
+    df["validation_timestamp"] = datetime.now()
+
+    # Hand the DataFrame to DuckDB for a single columnar INSERT ... SELECT
+    columns = [column for column in FieldBronzeTableModel.__table__.columns if column.name in df.columns]
+    fill_values = {
+        column.name: MISSING_TEXT_VALUE
+        for column in columns if not column.nullable and isinstance(column.type, String)
+    }
+    bulk_insert_dataframe(session, FieldBronzeTableModel.__tablename__, df, [column.name for column in columns], fill_values)
 
 def log_field_bronze_table(df: pd.DataFrame, file_id: int, error_index_set):
     """
@@ -27,33 +50,28 @@ def log_field_bronze_table(df: pd.DataFrame, file_id: int, error_index_set):
     - df (pd.DataFrame): DataFrame containing the data to log.
     - file_id (int): ID of the file being processed.
     - error_index_set (set): Set of indices that failed validation.
+
+    Returns:
+    - bool: True if the rows were committed.
     """
+    FieldBronzeTableModel = get_model("field_bronze_table")
     if FieldBronzeTableModel is None:
         logger.error("FieldBronzeTableModel is not defined. Cannot log data.")
-        return
+        return False
 
     with get_session() as session:
         try:
-            # Determine the starting ID for the new rows
-            max_id = session.query(FieldBronzeTableModel.id).order_by(FieldBronzeTableModel.id.desc()).first()
-            max_id = max_id[0] if max_id else 0
-
             # Add required columns to the DataFrame
-            df["id"] = range(max_id + 1, max_id + 1 + len(df))
             df["row_index"] = df.index
             df["file_id"] = file_id
             df["validation_status"] = [
                 "Failed" if idx in error_index_set else "Passed" for idx in df.index
             ]
-            df["validation_timestamp"] = datetime.now()
-
-            # Convert the DataFrame to a list of dictionaries
-            data_to_insert = df.to_dict(orient="records")
-
-            # Use bulk_insert_mappings for efficient insertion
-            session.bulk_insert_mappings(FieldBronzeTableModel, data_to_insert)
+            insert_field_bronze_rows(session, df)
             session.commit()
             logger.info("Validation results logged successfully.")
+            return True
         except Exception as e:
-            logger.error(f"Error logging validation results: {e}")
+            logger.error("Error logging validation results: %s", e)
             session.rollback()
+            return False
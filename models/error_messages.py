@@ -1,15 +1,54 @@
+import threading
+
+from sqlalchemy import text
+
 from config.logger_config import configure_logger
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from utils.generate_sqlalchemy_model import get_model
 
 # Configure logger
 logger = configure_logger("error_messages.log")
 
-ErrorMessagesModel = None
-# Generate the SQLAlchemy model class dynamically for the 'validation_errors' table
-try:
-    if ErrorMessagesModel is None:
-        ErrorMessagesModel = generate_model_for_table('error_messages')
-        logger.info(f"Generated model class for table: {ErrorMessagesModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'error_messages': {e}")
-    # Ensure ValidationErrorsModel is defined as None if generation fails
\ No newline at end of file
+def __getattr__(name):
+    # The model is generated on first use, so importing this module does not read the database
+    if name == "ErrorMessagesModel":
+        return get_model("error_messages")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Cached catalog: DataFrame indexed by error_code, loaded on first use
+_error_catalog = None
+_catalog_lock = threading.Lock()
+
+def load_error_catalog(session):
+    """
+    Read the `error_messages` table.
+
+    :param session: SQLAlchemy session
+    :return: DataFrame with the error_message and error_severity columns, indexed by error_code
+    """
+    import pandas as pd
+
+    rows = session.execute(text("SELECT error_code, error_message, error_severity FROM error_messages")).fetchall()
+    return pd.DataFrame(rows, columns=["error_code", "error_message", "error_severity"]).set_index("error_code")
+
+def get_error_catalog(session):
+    """
+    Return the error catalog, reading `error_messages` only once per process.
+
+    The table is only written when the database is initialized from `config/schema.json`,
+    which calls `clear_error_catalog` so the next lookup reads the new messages.
+
+    :param session: SQLAlchemy session used on the first lookup
+    :return: DataFrame with the error_message and error_severity columns, indexed by error_code
+    """
+    global _error_catalog
+    with _catalog_lock:
+        if _error_catalog is None:
+            _error_catalog = load_error_catalog(session)
+            logger.info("Loaded %s error messages.", len(_error_catalog))
+        return _error_catalog
+
+def clear_error_catalog():
+    """Drop the cached catalog so the next lookup reads the table again."""
+    global _error_catalog
+    with _catalog_lock:
+        _error_catalog = None
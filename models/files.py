@@ -1,27 +1,35 @@
 import os
 import logging
 
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
 from config.logger_config import configure_logger
-from utils.checksum_util import calculate_checksum
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from utils.checksum_util import calculate_checksum, is_checksum
+from utils.generate_sqlalchemy_model import get_model
+from utils.id_allocator import reserve_ids
 
 # Configure logger
 logger = configure_logger("files_operations.log")
 
-FileModelClass = None
-# Generate the SQLAlchemy model class dynamically for the 'files' table
-try:
-    if FileModelClass is None:
-        FileModelClass = generate_model_for_table('files')
-        logger.info(f"Generated model class for table: {FileModelClass.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'files': {e}")
-    # Ensure FileModelClass is defined as None if generation fails
+# Statuses of files waiting to be validated: new and processing. The column is TEXT, so the
+# values are compared as text; integers would be cast per row and bypass idx_files_status.
+PENDING_STATUSES = ['1', '2']
 
-def insert_data(session, filepath, datatype, remarks):
+def __getattr__(name):
+    # The model is generated on first use, so importing this module does not read the database
+    if name == "FileModelClass":
+        return get_model("files")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def insert_data(session, filepath, datatype, remarks, checksum=None, status=1):
     """
     Inserts a new record into the `files` table using the FileModelClass.
+
+    :param checksum: Checksum of the file; calculated when not given.
+    :param status: Initial status of the file.
     """
+    FileModelClass = get_model("files")
     if FileModelClass is None:
         logger.error("FileModelClass is not defined. Cannot insert data.")
         return None
@@ -32,15 +40,15 @@ def insert_data(session, filepath, datatype, remarks):
     filename = os.path.basename(filepath)
 
     # Calculate checksum for the file
-    checksum = calculate_checksum(filepath)
+    if checksum is None:
+        checksum = calculate_checksum(filepath)
 
-    # Fetch the last ID and increment it
+    # Allocate the next ID
     try:
-        last_id = session.query(FileModelClass).order_by(FileModelClass.id.desc()).first()
-        new_id = (last_id.id + 1) if last_id else 1
+        new_id = reserve_ids(session, FileModelClass.__tablename__, 1)[0]
     except Exception as e:
-        logger.error(f"Error fetching last ID: {e}")
-        new_id = 1
+        logger.error("Error allocating ID: %s", e)
+        return None
 
     # Create a new instance of the model
     new_file = FileModelClass(
@@ -50,40 +58,121 @@ def insert_data(session, filepath, datatype, remarks):
         datatype=datatype,
         checksum=checksum,
         remarks=remarks,
-        status=1  # Default status
+        status=status
     )
 
     try:
         # Add and commit the new record
         session.add(new_file)
         session.commit()
-        logger.info(f"Inserted: {filename} with checksum {checksum}")
+        logger.info("Inserted: %s with checksum %s", filename, checksum)
         return new_file.id
     except Exception as e:
-        logger.error(f"Error inserting data into the `files` table: {e}")
+        logger.error("Error inserting data into the `files` table: %s", e)
         session.rollback()
         return None
 
+def find_completed_duplicate(session, checksum):
+    """
+    Finds the first completed file (status 3) with the given checksum.
+
+    DuckDB drops the index scan on idx_files_checksum when the checksum filter is combined with
+    other filters, so the files with the checksum are selected in a materialized CTE and the
+    completed one is picked from them.
+
+    :param session: SQLAlchemy session
+    :param checksum: Checksum of the new file
+    :return: (id, filename) row of the completed file, or None; always None when the checksum
+        is an error message rather than a digest.
+    """
+    FileModelClass = get_model("files")
+    if FileModelClass is None:
+        logger.error("FileModelClass is not defined. Cannot look up checksums.")
+        return None
+
+    if not is_checksum(checksum):
+        logger.info("Not looking up duplicates of a file without a checksum: %s", checksum)
+        return None
+
+    try:
+        matches = (
+            select(FileModelClass.id, FileModelClass.filename, FileModelClass.status)
+            .where(FileModelClass.checksum == checksum)
+            .cte("checksum_matches")
+            .prefix_with("MATERIALIZED")
+        )
+        return (
+            session.query(matches.c.id, matches.c.filename)
+            .filter(matches.c.status == '3')
+            .order_by(matches.c.id.asc())
+            .first()
+        )
+    except Exception as e:
+        logger.error("Error looking up checksum %s: %s", checksum, e)
+        return None
+
+def pending_files():
+    """
+    Returns an alias of the `files` table restricted to files with status 1 or 2.
+
+    DuckDB drops the index scan on idx_files_status when the filter is combined with ORDER BY
+    and LIMIT, so the pending files are selected in a materialized CTE and sorted afterwards;
+    the lookup stays an index probe however many completed files the table holds.
+    """
+    FileModelClass = get_model("files")
+    pending = (
+        select(FileModelClass)
+        .where(FileModelClass.status.in_(PENDING_STATUSES))
+        .cte("pending_files")
+        .prefix_with("MATERIALIZED")
+    )
+    return aliased(FileModelClass, pending)
+
 def fetch_files_to_process(session):
     """
     Fetches files with status 1 or 2 from the `files` table for processing.
     """
+    FileModelClass = get_model("files")
     if FileModelClass is None:
         logger.error("FileModelClass is not defined. Cannot fetch files.")
         return None
 
     try:
+        pending = pending_files()
         files_to_process = (
-            session.query(FileModelClass)
-            .filter(FileModelClass.status.in_([1, 2]))
-            .order_by(FileModelClass.status.asc())
+            session.query(pending)
+            .order_by(pending.status.asc())
             .first()
         )
         return files_to_process
     except Exception as e:
-        logger.error(f"Error fetching files from table: {e}")
+        logger.error("Error fetching files from table: %s", e)
         return None
 
+def fetch_pending_files(session, limit, exclude_ids=()):
+    """
+    Fetches up to `limit` files with status 1 or 2 from the `files` table for processing.
+
+    :param session: SQLAlchemy session
+    :param limit: Maximum number of files to return
+    :param exclude_ids: IDs of files that are already being processed
+    :return: List of (id, filename, filepath) rows
+    """
+    FileModelClass = get_model("files")
+    if FileModelClass is None:
+        logger.error("FileModelClass is not defined. Cannot fetch files.")
+        return []
+
+    try:
+        pending = pending_files()
+        query = session.query(pending.id, pending.filename, pending.filepath)
+        if exclude_ids:
+            query = query.filter(pending.id.notin_(list(exclude_ids)))
+        return query.order_by(pending.status.asc(), pending.id.asc()).limit(limit).all()
+    except Exception as e:
+        logger.error("Error fetching files from table: %s", e)
+        return []
+
 def update_file_status(session, status, id, remarks=None):
     """
     Updates the status of a file in the `files` table using the FileModelClass.
@@ -93,6 +182,7 @@ def update_file_status(session, status, id, remarks=None):
     :param id: ID of the file to update
     :param remarks: Optional remarks to add
     """
+    FileModelClass = get_model("files")
     if FileModelClass is None:
         logger.error("FileModelClass is not defined. Cannot update file status.")
         return
@@ -101,7 +191,7 @@ def update_file_status(session, status, id, remarks=None):
         # Query the file record by ID
         file_record = session.query(FileModelClass).filter_by(id=id).first()
         if not file_record:
-            logger.warning(f"No file found with ID {id}")
+            logger.warning("No file found with ID %s", id)
             return
 
         # Update fields
@@ -111,7 +201,58 @@ def update_file_status(session, status, id, remarks=None):
 
         # Commit the changes
         session.commit()
-        logger.info(f"Updated file with ID {id} to status {status}")
+        logger.info("Updated file with ID %s to status %s", id, status)
+    except Exception as e:
+        logger.error("Error updating file status: %s", e)
+        session.rollback()
+
+def update_files_status(session, status, ids, remarks=None):
+    """
+    Updates the status of several files in the `files` table with a single UPDATE and commit.
+
+    Anything else pending on the session is committed together with the new statuses.
+
+    :param session: SQLAlchemy session
+    :param status: New status to set
+    :param ids: IDs of the files to update
+    :param remarks: Optional remarks to add
+    :return: True if the statuses were committed
+    """
+    FileModelClass = get_model("files")
+    if FileModelClass is None:
+        logger.error("FileModelClass is not defined. Cannot update file status.")
+        return False
+
+    values = {"status": status}
+    if remarks is not None:
+        values["remarks"] = remarks
+
+    try:
+        session.query(FileModelClass).filter(FileModelClass.id.in_(list(ids))).update(values, synchronize_session=False)
+        session.commit()
+        logger.info("Updated files with IDs %s to status %s", list(ids), status)
+        return True
     except Exception as e:
-        logger.error(f"Error updating file status: {e}")
+        logger.error("Error updating file status: %s", e)
         session.rollback()
+        return False
+
+def fetch_queue_depth(session):
+    """
+    Counts the files waiting to be validated.
+
+    :param session: SQLAlchemy session
+    :return: Dictionary with the number of new and processing files
+    """
+    FileModelClass = get_model("files")
+    if FileModelClass is None:
+        logger.error("FileModelClass is not defined. Cannot count files.")
+        return {}
+
+    counts = dict(
+        session.query(FileModelClass.status, func.count())
+        .filter(FileModelClass.status.in_(PENDING_STATUSES))
+        .group_by(FileModelClass.status)
+        .all()
+    )
+    return {"new": counts.get('1', 0), "processing": counts.get('2', 0)}
@@ -0,0 +1,62 @@
+import json
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from config.logger_config import configure_logger
+from utils.db_util import get_session
+from utils.id_allocator import reserve_ids
+from utils.pipeline_metrics import collect_file_metrics
+
+# Configure logger
+logger = configure_logger("pipeline_metrics.log")
+
+def log_pipeline_metrics(metrics):
+    """
+    Store the metrics of a processed file in the `pipeline_metrics` table.
+
+    :param metrics: FileMetrics of the file.
+    """
+    with get_session() as session:
+        try:
+            session.execute(
+                text(
+                    "INSERT INTO pipeline_metrics (id, file_id, status, row_count, error_count, bytes_read, "
+                    "peak_memory_bytes, duration_seconds, stage_durations, recorded_at) VALUES (:id, :file_id, "
+                    ":status, :row_count, :error_count, :bytes_read, :peak_memory_bytes, :duration_seconds, "
+                    ":stage_durations, CURRENT_TIMESTAMP)"
+                ),
+                {
+                    "id": reserve_ids(session, "pipeline_metrics", 1)[0],
+                    "file_id": metrics.file_id,
+                    "status": metrics.status,
+                    "row_count": metrics.row_count,
+                    "error_count": metrics.error_count,
+                    "bytes_read": metrics.bytes_read,
+                    "peak_memory_bytes": metrics.peak_memory_bytes,
+                    "duration_seconds": metrics.duration_seconds,
+                    "stage_durations": json.dumps(metrics.stage_durations),
+                }
+            )
+            session.commit()
+            logger.info("Recorded metrics for file ID %s: %.3fs, %s rows.", metrics.file_id, metrics.duration_seconds, metrics.row_count)
+        except Exception as e:
+            logger.error("Error recording metrics for file ID %s: %s", metrics.file_id, e)
+            session.rollback()
+
+@contextmanager
+def track_file(file_id, filepath):
+    """
+    Collect the metrics of one file and store them when it leaves the pipeline.
+
+    :param file_id: ID of the file in the `files` table.
+    :param filepath: Path of the uploaded file.
+    :return: The FileMetrics of the file.
+    """
+    metrics = None
+    try:
+        with collect_file_metrics(file_id, filepath) as metrics:
+            yield metrics
+    finally:
+        if metrics is not None:
+            log_pipeline_metrics(metrics)
@@ -21,6 +21,7 @@ class SQLScriptStore(Base):
     )
     table_name = Column(String, nullable=False)
     data_columns = Column(Text)  # Added data_columns to store the list of columns
+    insert_order = Column(Text)  # Columns new rows are sorted by before they are inserted
 
     __table_args__ = (
         CheckConstraint("zone IN ('COMMON', 'BRONZE', 'SILVER', 'GOLD')"),
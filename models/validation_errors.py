@@ -1,59 +1,66 @@
 from config.logger_config import configure_logger
 from utils.db_util import get_session, text
-from sqlalchemy import func
 from datetime import datetime
-from utils.generate_sqlalchemy_model import generate_model_for_table
+import pandas as pd
+from utils.bulk_insert_util import bulk_insert_dataframe
+from utils.generate_sqlalchemy_model import get_model
+from utils.id_allocator import reserve_ids
 
 # Configure logger
 logger = configure_logger("validation_errors.log")
 
-ValidationErrorsModel = None
-# Generate the SQLAlchemy model class dynamically for the 'validation_errors' table
-try:
-    if ValidationErrorsModel is None:
-        ValidationErrorsModel = generate_model_for_table('validation_errors')
-        logger.info(f"Generated model class for table: {ValidationErrorsModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'validation_errors': {e}")
-    # Ensure ValidationErrorsModel is defined as None if generation fails
+def __getattr__(name):
+    # The model is generated on first use, so importing this module does not read the database
+    if name == "ValidationErrorsModel":
+        return get_model("validation_errors")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def insert_validation_errors(session, errors_df: pd.DataFrame):
+    """
+    Add validation errors to the database within the caller's transaction.
+
+    :param session: SQLAlchemy session; the caller commits.
+    :param errors_df: DataFrame with one row per error, carrying the file_id of each error.
+    """
+    ValidationErrorsModel = get_model("validation_errors")
+    errors_df["error_id"] = reserve_ids(session, ValidationErrorsModel.__tablename__, len(errors_df))
+    errors_df["created_at"] = datetime.now()
+
+    # Hand the errors to DuckDB for a single columnar INSERT ... SELECT
+    columns = [column.name for column in ValidationErrorsModel.__table__.columns if column.name in errors_df.columns]
+    bulk_insert_dataframe(session, ValidationErrorsModel.__tablename__, errors_df, columns)
 
-def log_errors_to_db(errors: list, file_id: int):
+def log_errors_to_db(errors: pd.DataFrame, file_id: int):
     """
     Log validation errors to the database dynamically using the ValidationErrorsModel.
 
-    :param errors: List of dictionaries containing validation error details.
+    :param errors: DataFrame containing validation error details, one row per error.
     :param file_id: ID of the file associated with the errors.
+    :return: True if the errors were committed or there were none.
     """
+    ValidationErrorsModel = get_model("validation_errors")
     if ValidationErrorsModel is None:
         logger.error("ValidationErrorsModel is not defined. Cannot log errors.")
-        return
+        return False
 
     with get_session() as session:
-        # Handle empty errors list
-        if not errors:
+        # Handle empty errors frame
+        if errors.empty:
             logger.info("No errors to log.")
-            return
+            return True
 
         logger.info("Logging errors to the database...")
 
-        # Fetch the maximum existing error_id and calculate new IDs
-        max_id = session.query(func.max(ValidationErrorsModel.error_id)).scalar() or 0
-        new_error_id_start = max_id + 1
-
-        # Add required fields to each error
-        for idx, error in enumerate(errors):
-            error["error_id"] = new_error_id_start + idx
-            error["file_id"] = file_id
-            error["created_at"] = datetime.now()
-
-        # Create instances of the ValidationErrorsModel
-        error_records = [ValidationErrorsModel(**error) for error in errors]
+        # Add required fields to the errors
+        errors_df = errors.reset_index(drop=True)
+        errors_df["file_id"] = file_id
 
         try:
-            # Add the records to the session and commit
-            session.bulk_save_objects(error_records)
+            insert_validation_errors(session, errors_df)
             session.commit()
-            logger.info(f"{len(errors)} validation errors logged successfully.")
+            logger.info("%s validation errors logged successfully.", len(errors))
+            return True
         except Exception as e:
-            logger.error(f"Error logging validation errors: {e}")
+            logger.error("Error logging validation errors: %s", e)
             session.rollback()
+            return False
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 
@@ -5,22 +6,67 @@ from config.logger_config import configure_logger
 from sqlalchemy import text
 
 from models.sql_script_store import SQLScriptStore
-from utils.db_util import get_session, engine
+from utils.db_util import clear_schema_catalog, get_read_session, get_session
 
 logger = configure_logger(__name__)
 
 # Path to the JSON schema file
 JSON_FILE_PATH = "config/schema.json"
 
-def initialize_database_from_json(json_file_path=JSON_FILE_PATH):
+def create_indexes(session, entry):
+    """
+    Creates the indexes declared on a schema entry, skipping those that already exist.
+
+    DuckDB only uses an index for selective lookups (equality or IN on the indexed columns),
+    so only columns filtered that way, such as `files.status`, are worth declaring.
+
+    :param session: SQLAlchemy session
+    :param entry: Schema entry; its optional "indexes" list holds {"name", "columns"} objects.
+    """
+    for index in entry.get("indexes", []):
+        unique = "UNIQUE " if index.get("unique") else ""
+        session.execute(text(
+            f"CREATE {unique}INDEX IF NOT EXISTS {index['name']} ON {entry['table_name']} ({index['columns']})"
+        ))
+        logger.info("Ensured index %s on %s (%s).", index['name'], entry['table_name'], index['columns'])
+
+def compute_schema_hash(schema_data):
+    """
+    Hashes the schema entries; key order and whitespace of the JSON file do not matter.
+
+    :param schema_data: Entries loaded from the JSON schema file.
+    :return: SHA-256 hex digest.
+    """
+    canonical = json.dumps(schema_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def fetch_applied_schema_hash():
+    """
+    Returns the hash of the schema last applied to the database.
+
+    :return: Hex digest, or None for a new database or one created before schema versioning.
+    """
+    with get_read_session() as session:
+        try:
+            return session.execute(text("SELECT schema_hash FROM schema_version ORDER BY applied_at DESC LIMIT 1")).scalar()
+        except Exception as e:
+            logger.info("No applied schema version found: %s", e)
+            return None
+
+def initialize_database_from_json(json_file_path=JSON_FILE_PATH, force=False):
     """
     Executes all SQL statements from a JSON schema file to initialize the database.
     Stores table definitions into the sql_script_store table, including column lists.
 
+    The statements run in a single transaction and the hash of the file is recorded in
+    schema_version. When the database already holds that hash, nothing is executed, so a
+    restart costs one query.
+
     :param json_file_path: Path to the JSON file containing schema definitions.
+    :param force: Apply the statements even if the schema is unchanged.
     """
     if not os.path.exists(json_file_path):
-        logger.error(f"JSON schema file not found: {json_file_path}")
+        logger.error("JSON schema file not found: %s", json_file_path)
         raise FileNotFoundError(f"JSON schema file not found: {json_file_path}")
 
     with open(json_file_path, "r") as file:
@@ -28,53 +74,76 @@ def initialize_database_from_json(json_file_path=JSON_FILE_PATH):
 
     # Validate that the JSON is a list of objects with required keys
     required_keys = {"zone", "query", "query_type", "table_name"}
+    required_index_keys = {"name", "columns"}
     for entry in schema_data:
         if not required_keys.issubset(entry.keys()):
-            logger.error(f"Invalid JSON entry: {entry}. Required keys: {required_keys}")
+            logger.error("Invalid JSON entry: %s. Required keys: %s", entry, required_keys)
             raise ValueError(f"Invalid JSON entry: {entry}. Required keys: {required_keys}")
+        for index in entry.get("indexes", []):
+            if not required_index_keys.issubset(index.keys()):
+                logger.error("Invalid index in JSON entry: %s. Required keys: %s", index, required_index_keys)
+                raise ValueError(f"Invalid index in JSON entry: {index}. Required keys: {required_index_keys}")
+
+    schema_hash = compute_schema_hash(schema_data)
+    if not force and fetch_applied_schema_hash() == schema_hash:
+        logger.info("Database schema is up to date (version %s); skipping initialization.", schema_hash[:12])
+        return
 
     with get_session() as session:
+        # Definitions are stored once every statement has run, so columns added to
+        # sql_script_store by an ALTER entry exist before the first definition is written
+        definitions = []
         for entry in schema_data:
             query = entry["query"]
             try:
                 # Execute the table creation query
-                logger.info(f"Executing statement for table: {entry['table_name']} in zone: {entry['zone']}")
+                logger.info("Executing statement for table: %s in zone: %s", entry['table_name'], entry['zone'])
                 session.execute(text(query))
-                session.commit()
-
-                if "data_columns" in entry:
-                    data_columns_str = entry['data_columns']
-                else:
-                    data_columns_str = None
-
-                # Insert the table definition into the sql_script_store table
-                sql_script_entry = SQLScriptStore(
-                    zone=entry["zone"],
-                    query=query,
-                    query_type=entry["query_type"],
-                    table_name=entry["table_name"],
-                    data_columns=data_columns_str
-                )
-                session.add(sql_script_entry)
-                logger.info(f"Stored table definition for {entry['table_name']} with columns: {data_columns_str}.")
+                create_indexes(session, entry)
             except Exception as e:
-                logger.error(f"Error executing statement for table {entry['table_name']}:{query}Error: {e}")
-        session.commit()
-
-        # Display tables in the database
+                # Nothing of this version is kept; the next start applies it again
+                logger.error("Error executing statement for table %s:%sError: %s", entry['table_name'], query, e)
+                raise
+
+            if "data_columns" in entry:
+                data_columns_str = entry['data_columns']
+            else:
+                data_columns_str = None
+
+            definitions.append(SQLScriptStore(
+                zone=entry["zone"],
+                query=query,
+                query_type=entry["query_type"],
+                table_name=entry["table_name"],
+                data_columns=data_columns_str,
+                insert_order=entry.get("insert_order")
+            ))
+
+        # Insert or refresh the table definitions in the sql_script_store table
+        for definition in definitions:
+            session.merge(definition)
+            logger.info("Stored table definition for %s with columns: %s.", definition.table_name, definition.data_columns)
+        session.execute(
+            text("INSERT OR REPLACE INTO schema_version (schema_hash, applied_at) VALUES (:schema_hash, CURRENT_TIMESTAMP)"),
+            {"schema_hash": schema_hash}
+        )
+
+    # Display tables in the database
+    with get_read_session() as session:
         try:
             tables = session.execute(text("SHOW TABLES")).fetchall()
             logger.info("Tables in the database:")
             for table in tables:
-                logger.info(f"- {table[0]}")
+                logger.info("- %s", table[0])
         except Exception as e:
-            logger.error("Could not retrieve tables from the database:", e)
+            logger.error("Could not retrieve tables from the database: %s", e)
+
+    # Table definitions and error_messages may have changed
+    clear_schema_catalog()
+    from models.error_messages import clear_error_catalog
+    clear_error_catalog()
 
-    logger.info("Database schema initialization complete.")
-    with get_session() as connection:
-        result = connection.execute(text("PRAGMA table_info('sql_script_store')"))
-        for row in result.fetchall():
-            logger.debug(row)
+    logger.info("Database schema initialization complete (version %s).", schema_hash[:12])
 
 if __name__ == "__main__":
     """
@@ -85,7 +154,7 @@ if __name__ == "__main__":
         initialize_database_from_json()
         logger.info("Database initialization completed successfully.")
     except Exception as e:
-        logger.error(f"An error occurred during database initialization: {e}")
+        logger.error("An error occurred during database initialization: %s", e)
 
     logger.info("Database initialized. Starting the application...")
     # Import and start the application
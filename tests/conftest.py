@@ -0,0 +1,30 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """
+    Point the application at a fresh DuckDB database initialized from config/schema.json.
+
+    The test runs in a temporary directory, so exports land there instead of `output/`.
+    """
+    import startup
+    import utils.db_util as db_util
+    import utils.id_allocator as id_allocator
+
+    monkeypatch.chdir(tmp_path)
+    engine = create_engine(f"duckdb:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(db_util, "engine", engine)
+    monkeypatch.setattr(db_util, "SessionLocal", sessionmaker(autobegin=True, autoflush=False, bind=engine))
+    monkeypatch.setattr(id_allocator, "_next_ids", {})
+    db_util.clear_schema_catalog()
+
+    startup.initialize_database_from_json(os.path.join(REPO_ROOT, "config", "schema.json"))
+    yield engine
+    db_util.clear_schema_catalog()
+    engine.dispose()
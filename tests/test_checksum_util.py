@@ -0,0 +1,51 @@
+import os
+
+from utils.checksum_util import IncrementalChecksum, calculate_checksum, is_checksum
+
+def write(path, content, mtime_ns):
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_incremental_checksum_hashes_appended_bytes_only(tmp_path):
+    upload = tmp_path / "upload.csv"
+    checksum = IncrementalChecksum()
+    write(upload, b"FieldName\n", 1_000_000_000)
+    assert checksum.update(upload) == 10
+
+    with open(upload, "ab") as f:
+        f.write(b"A\nB\n")
+    assert checksum.update(upload) == 4
+    assert checksum.hexdigest(upload) == calculate_checksum(upload)
+
+def test_incremental_checksum_restarts_when_the_file_shrinks(tmp_path):
+    upload = tmp_path / "upload.csv"
+    checksum = IncrementalChecksum()
+    write(upload, b"FieldName\nA\nB\n", 1_000_000_000)
+    checksum.update(upload)
+
+    write(upload, b"FieldName\n", 2_000_000_000)
+    assert checksum.update(upload) == 10
+    assert checksum.hexdigest(upload) == calculate_checksum(upload)
+
+def test_incremental_checksum_restarts_when_the_file_is_rewritten_in_place(tmp_path):
+    upload = tmp_path / "upload.csv"
+    checksum = IncrementalChecksum()
+    write(upload, b"\0" * 14, 1_000_000_000)
+    checksum.update(upload)
+
+    # Same size, new content and modification time, like a writer that preallocates the file
+    write(upload, b"FieldName\nA\nB\n", 2_000_000_000)
+    assert checksum.update(upload) == 14
+    assert checksum.hexdigest(upload) == calculate_checksum(upload)
+
+def test_incremental_checksum_keeps_an_unchanged_file(tmp_path):
+    upload = tmp_path / "upload.csv"
+    checksum = IncrementalChecksum()
+    write(upload, b"FieldName\nA\n", 1_000_000_000)
+    checksum.update(upload)
+    assert checksum.update(upload) == 0
+
+def test_is_checksum_rejects_error_messages(tmp_path):
+    assert is_checksum(calculate_checksum(tmp_path / "missing.csv")) is False
+    write(tmp_path / "upload.csv", b"FieldName\n", 1_000_000_000)
+    assert is_checksum(calculate_checksum(tmp_path / "upload.csv")) is True
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from validators.crs import check_crs
+from validators.field_rules import find_crs_errors
+
+@pytest.mark.parametrize("value, error_code", [
+    ("EPSG:4326", None),
+    ("Geographic2D:EPSG::4267", None),
+    (" epsg:4267 ", None),
+    ("BoundProjected:EPSG::26715_EPSG::15851", None),
+    ("EPSG:999999", "crs_unknown"),
+    ("BoundProjected:EPSG::26715_EPSG::99999", "crs_unknown"),
+    ("Projected:EPSG::4326", "crs_kind_mismatch"),
+    ("BoundGeographic2D:EPSG::4267_EPSG::1133", "crs_kind_mismatch"),
+    ("WGS84", "crs_invalid_format"),
+    ("BoundProjected:EPSG::26715", "crs_invalid_format"),
+    ("Projected:EPSG::26715_EPSG::15851", "crs_invalid_format"),
+])
+def test_check_crs(value, error_code):
+    assert check_crs(value).error_code == error_code
+
+def test_check_crs_names_the_crs_whatever_the_notation():
+    assert check_crs("EPSG:4267").key == check_crs("Geographic2D:EPSG::4267").key
+    assert check_crs("EPSG:4326").bounds == (-180, -90, 180, 90)
+    assert check_crs("EPSG:999999").bounds is None
+
+def crs_frame(rows):
+    return pd.DataFrame(rows, columns=["FieldName", "X", "Y", "CRS"])
+
+def flagged(errors, error_code):
+    return sorted(errors.loc[errors["error_code"] == error_code, "row_index"].tolist())
+
+def test_find_crs_errors_flags_coordinates_outside_the_crs_bounds():
+    errors = find_crs_errors(crs_frame([
+        ["A", 10, 50, "EPSG:4326"],
+        ["A", 200, 50, "EPSG:4326"],
+        ["B", 10, 50, "EPSG:4267"],
+        ["C", 999, 999, "EPSG:999999"],
+        ["D", None, None, None],
+    ]))
+    assert flagged(errors, "crs_out_of_bounds") == [1, 2]
+    assert flagged(errors, "crs_unknown") == [3]
+    assert flagged(errors, "crs_inconsistent") == []
+
+def test_find_crs_errors_flags_every_row_of_a_field_with_two_crs():
+    errors = find_crs_errors(crs_frame([
+        ["A", -100, 40, "EPSG:4267"],
+        ["A", -100, 41, "Geographic2D:EPSG::4267"],
+        ["B", -100, 40, "EPSG:4267"],
+        ["B", -100, 41, "EPSG:4269"],
+        ["B", None, None, None],
+    ]))
+    assert flagged(errors, "crs_inconsistent") == [2, 3, 4]
+    assert set(errors.loc[errors["error_code"] == "crs_inconsistent", "field_name"]) == {"B"}
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import shutil
+
+from models.files import find_completed_duplicate, insert_data
+from utils.checksum_util import calculate_checksum, is_checksum
+from utils.db_util import get_session, text
+
+def write_upload(path, content="FieldName,FieldType\nA,OilField\n"):
+    with open(path, "w") as f:
+        f.write(content)
+    return str(path)
+
+def file_rows():
+    with get_session() as session:
+        return session.execute(text("SELECT id, status, remarks FROM files ORDER BY id")).fetchall()
+
+def test_is_checksum_accepts_digests_only():
+    assert is_checksum(hashlib.sha256(b"upload").hexdigest())
+    assert is_checksum(hashlib.sha256(b"upload").hexdigest().upper())
+    assert not is_checksum(hashlib.md5(b"upload").hexdigest())
+    assert not is_checksum("File not found")
+    assert not is_checksum("Error: [Errno 13] Permission denied")
+    assert not is_checksum(None)
+
+def test_calculate_checksum_of_a_missing_file_is_not_a_checksum(tmp_path):
+    assert not is_checksum(calculate_checksum(str(tmp_path / "missing.csv")))
+
+def test_find_completed_duplicate_returns_the_first_completed_file(database):
+    checksum = hashlib.sha256(b"upload").hexdigest()
+    with get_session() as session:
+        insert_data(session, "a.csv", "field", "", checksum=checksum, status='4')
+        second = insert_data(session, "b.csv", "field", "", checksum=checksum, status='3')
+        insert_data(session, "c.csv", "field", "", checksum=checksum, status='3')
+        insert_data(session, "d.csv", "field", "", checksum=hashlib.sha256(b"other").hexdigest(), status='3')
+
+        original = find_completed_duplicate(session, checksum)
+        assert (original.id, original.filename) == (second, "b.csv")
+        assert find_completed_duplicate(session, hashlib.sha256(b"new").hexdigest()) is None
+
+def test_find_completed_duplicate_ignores_error_messages(database):
+    with get_session() as session:
+        insert_data(session, "gone.csv", "field", "", checksum="File not found", status='3')
+        assert find_completed_duplicate(session, "File not found") is None
+
+def test_identical_upload_reuses_the_results_of_the_completed_file(database, tmp_path):
+    import app
+
+    original = write_upload(tmp_path / "original.csv")
+    with get_session() as session:
+        original_id = insert_data(session, original, "field", "", status='3')
+    os.makedirs("output")
+    with open("output/original.csv_validation_results.csv", "w") as f:
+        f.write("row_index,error_message\n")
+
+    app.insert_fields_data_in_db(shutil.copyfile(original, tmp_path / "copy.csv"))
+
+    assert file_rows()[-1][1:] == ('3', f"Duplicate of file ID {original_id}")
+    assert os.path.exists("output/copy.csv_validation_results.csv")
+
+def test_unreadable_uploads_are_never_duplicates(database, tmp_path):
+    import app
+
+    with get_session() as session:
+        insert_data(session, str(tmp_path / "gone.csv"), "field", "", checksum="File not found", status='3')
+
+    app.insert_fields_data_in_db(str(tmp_path / "missing.csv"))
+
+    assert file_rows()[-1][1:] == ('1', '')
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from validators.field_data_validator import iter_field_group_chunks, plan_field_group_chunks
+
+def write_upload(path, field_names):
+    pd.DataFrame({
+        "FieldName": field_names,
+        "X": range(len(field_names)),
+    }).to_csv(path, index=False)
+    return path
+
+def read_chunks(path, chunk_rows):
+    return list(iter_field_group_chunks(path, chunk_rows, plan_field_group_chunks(path, chunk_rows)))
+
+def assert_whole_groups(chunks, row_count):
+    """Every row comes back once, in file order within its chunk, and no FieldName spans two chunks."""
+    assert sorted(index for chunk in chunks for index in chunk.index) == list(range(row_count))
+    for chunk in chunks:
+        assert chunk.index.is_monotonic_increasing
+        assert (chunk["X"].to_numpy() == chunk.index.to_numpy()).all()
+    chunk_names = [set(chunk["FieldName"].dropna()) for chunk in chunks]
+    assert sum(len(names) for names in chunk_names) == len(set().union(*chunk_names))
+
+def test_contiguous_groups_are_packed_into_chunks(tmp_path):
+    upload = write_upload(tmp_path / "upload.csv", ["A", "A", "B", "B", "C", "D", "D", "D"])
+    chunk_of_row, chunk_last_row = plan_field_group_chunks(upload, 3)
+    assert chunk_of_row.tolist() == [0, 0, 0, 0, 1, 1, 1, 1]
+    assert chunk_last_row.tolist() == [3, 7]
+
+    chunks = read_chunks(upload, 3)
+    assert [chunk["FieldName"].tolist() for chunk in chunks] == [["A", "A", "B", "B"], ["C", "D", "D", "D"]]
+
+def test_group_larger_than_a_chunk_forms_a_chunk_of_its_own(tmp_path):
+    upload = write_upload(tmp_path / "upload.csv", ["A"] + ["B"] * 7 + ["C"])
+    chunks = read_chunks(upload, 3)
+    assert [set(chunk["FieldName"]) for chunk in chunks] == [{"A"}, {"B"}, {"C"}]
+    assert_whole_groups(chunks, 9)
+
+def test_non_contiguous_groups_stay_whole(tmp_path):
+    names = ["A", "B", "C", "A", "D", "B", "E", "F", "A", "G", "C", "H"]
+    upload = write_upload(tmp_path / "upload.csv", names)
+    for chunk_rows in (1, 2, 3, 5, 20):
+        chunks = read_chunks(upload, chunk_rows)
+        assert_whole_groups(chunks, len(names))
+
+    chunk_of_row, _ = plan_field_group_chunks(upload, 2)
+    for name in set(names):
+        assert len({chunk_of_row[row] for row, row_name in enumerate(names) if row_name == name}) == 1
+
+def test_rows_without_a_field_name_belong_to_no_group(tmp_path):
+    names = ["A", None, "B", None, "A", None]
+    upload = write_upload(tmp_path / "upload.csv", names)
+    chunks = read_chunks(upload, 2)
+    assert_whole_groups(chunks, len(names))
+    assert sum(chunk["FieldName"].isna().sum() for chunk in chunks) == 3
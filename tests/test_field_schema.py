@@ -0,0 +1,49 @@
+import pandas as pd
+
+from validators.dates import parse_dates
+from validators.field_schema import CUSTOM_CHECKS, build_custom_schema, build_schema, run_validation
+
+SCHEMA_CODE = """
+class DynamicFieldSchema(pa.DataFrameModel):
+    FieldName: Series[str] = pa.Field(nullable=False, coerce=True)
+    FieldType: Series[str] = pa.Field(nullable=True, coerce=True)
+    DiscoveryDate: Series[pd.Timestamp] = pa.Field(nullable=True, coerce=True)
+    X: Series[float] = pa.Field(nullable=True, coerce=True)
+    Y: Series[float] = pa.Field(nullable=True, coerce=True)
+    CRS: Series[str] = pa.Field(nullable=True, coerce=True)
+"""
+
+def field_frame(rows):
+    return pd.DataFrame(rows, columns=["FieldName", "FieldType", "DiscoveryDate", "X", "Y", "CRS"])
+
+SQUARE = field_frame([
+    ["A", "OilField", "01/02/2000", x, y, "EPSG:4326"]
+    for x, y in [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
+])
+
+def test_custom_schema_reports_schema_and_rule_errors():
+    df = SQUARE.copy()
+    df.loc[1, "FieldType"] = "GasField"
+    df.loc[2, "FieldName"] = None
+    errors = run_validation(df, build_custom_schema(SCHEMA_CODE))
+    assert ("FieldName", "not_nullable") in set(zip(errors["field_name"], errors["error_code"]))
+    assert "Inconsistent_field_data" in set(errors["error_code"])
+
+def test_errors_do_not_carry_over_to_the_next_file():
+    schema = build_custom_schema(SCHEMA_CODE)
+    failing = SQUARE.copy()
+    failing.loc[0, "CRS"] = "not a crs"
+    assert len(run_validation(failing, schema))
+    assert run_validation(SQUARE.copy(), schema).empty
+
+def test_base_schema_runs_no_custom_checks():
+    df = SQUARE.copy()
+    df.loc[0, "CRS"] = "not a crs"
+    assert run_validation(df.copy(), build_schema(SCHEMA_CODE)).empty
+    errors = run_validation(df.copy(), build_custom_schema(SCHEMA_CODE))
+    assert errors["error_code"].tolist() == ["crs_invalid_format", "crs_inconsistent", "crs_inconsistent",
+                                             "crs_inconsistent", "crs_inconsistent", "crs_inconsistent"]
+
+def test_custom_checks_return_error_frames():
+    for check in CUSTOM_CHECKS:
+        assert check(SQUARE.assign(DiscoveryDate=parse_dates(SQUARE["DiscoveryDate"]))).empty
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from models.files import insert_data
+from utils.db_util import get_columns_from_store, get_session
+from validators.dates import parse_dates
+from validators.field_data_validator import validate_field, validate_field_staged
+
+# The first DiscoveryDate is ISO 8601 and the later ones day first, in every supported layout
+UPLOAD = """FieldName,FieldType,DiscoveryDate,X,Y,CRS,Source,ParentFieldName
+Iso,OilField,2023-08-02,0,0,EPSG:4326,Survey,
+Iso,OilField,2023-08-02,1,0,EPSG:4326,Survey,
+Iso,OilField,2023-08-02,1,1,EPSG:4326,Survey,
+Iso,OilField,2023-08-02,0,0,EPSG:4326,Survey,
+Slash,GasField,02/08/2023,0,0,EPSG:4326,Survey,
+Slash,GasField,02/08/2023,1,0,EPSG:4326,Survey,
+Slash,GasField,02/08/2023,1,1,EPSG:4326,Survey,
+Slash,GasField,02/08/2023,0,0,EPSG:4326,Survey,
+Mixed,GasField,13-01-2021,0,0,EPSG:4326,Survey,
+Mixed,GasField,13.01.2021,1,0,EPSG:4326,Survey,
+Mixed,GasField,2021-01-13 08:30:00,1,1,EPSG:4326,Survey,
+Mixed,GasField,13/01/2021 08:30:00,0,0,EPSG:4326,Survey,
+Future,OilField,2999-01-01,0,0,EPSG:4326,Survey,
+Future,OilField,,1,0,EPSG:4326,Survey,
+Future,OilField,01/01/2999,1,1,EPSG:4326,Survey,
+"""
+
+def exported_results(file_name):
+    results = pd.read_csv(f"output/{file_name}_validation_results.csv")
+    return results.drop(columns=["id", "file_id", "validation_timestamp"])
+
+def test_parse_dates_reads_iso_then_day_first():
+    values = pd.Series(["2023-08-02", "02/08/2023", "2/8/2023", "02-08-2023 10:15:00", "08/02/23", "2023/08/02", None])
+    assert parse_dates(values).tolist()[:4] == [pd.Timestamp("2023-08-02")] * 3 + [pd.Timestamp("2023-08-02 10:15")]
+    assert parse_dates(values)[4:].isna().all()
+
+def test_pandas_and_duckdb_engines_read_dates_alike(database, tmp_path):
+    upload = tmp_path / "dates.csv"
+    upload.write_text(UPLOAD)
+    with get_session() as session:
+        pandas_id = insert_data(session, str(upload), "field", "", checksum="pandas")
+        duckdb_id = insert_data(session, str(upload), "field", "", checksum="duckdb")
+
+    assert validate_field(pd.read_csv(upload), pandas_id, "pandas.csv")
+    assert validate_field_staged(str(upload), duckdb_id, "duckdb.csv", get_columns_from_store("field_bronze_table")) == ([], True)
+
+    pandas_results, duckdb_results = exported_results("pandas.csv"), exported_results("duckdb.csv")
+    pd.testing.assert_frame_equal(pandas_results, duckdb_results)
+    dates = pd.to_datetime(pandas_results.groupby("FieldName", sort=False)["DiscoveryDate"].first())
+    assert dates.to_dict() == {
+        "Iso": pd.Timestamp("2023-08-02"),
+        "Slash": pd.Timestamp("2023-08-02"),
+        "Mixed": pd.Timestamp("2021-01-13"),
+        "Future": pd.Timestamp("2999-01-01"),
+    }
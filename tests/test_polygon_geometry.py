@@ -0,0 +1,139 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validators.field_rules import find_polygon_shape_errors, find_self_intersecting_polygons
+from validators.polygon_geometry import (
+    PAIRWISE_MAX_VERTICES, build_rings, find_self_intersecting_rings, measure_rings, ring_self_intersects,
+    segments_intersect,
+)
+
+def comb_ring(teeth, notch_depth=1.0):
+    """Return the vertices of a comb: a bar along y = 0 with `teeth` notches cut down from y = 2."""
+    vertices = [(0.0, 0.0), (2.0 * teeth + 1, 0.0), (2.0 * teeth + 1, 2.0)]
+    for tooth in reversed(range(teeth)):
+        vertices += [(2.0 * tooth + 2, 2.0), (2.0 * tooth + 2, 2.0 - notch_depth), (2.0 * tooth + 1, 2.0 - notch_depth), (2.0 * tooth + 1, 2.0)]
+    return vertices + [(0.0, 2.0)]
+
+def rotate(vertices, angle):
+    cos, sin = np.cos(angle), np.sin(angle)
+    return [(float(x * cos - y * sin), float(x * sin + y * cos)) for x, y in vertices]
+
+def brute_force_self_intersects(vertices):
+    """Compare every pair of edges; consecutive edges only count when the boundary folds back."""
+    count = len(vertices)
+    for first in range(count):
+        for second in range(first + 1, count):
+            if second - first in (1, count - 1):
+                shared, a, b = (
+                    (vertices[second], vertices[first], vertices[(second + 1) % count]) if second - first == 1
+                    else (vertices[first], vertices[second], vertices[first + 1])
+                )
+                ax, ay, bx, by = a[0] - shared[0], a[1] - shared[1], b[0] - shared[0], b[1] - shared[1]
+                if ax * by - ay * bx == 0 and ax * bx + ay * by > 0:
+                    return True
+            elif segments_intersect(vertices[first], vertices[(first + 1) % count], vertices[second], vertices[(second + 1) % count]):
+                return True
+    return False
+
+def ring_arrays(vertices):
+    x, y = (np.array(values, dtype=float) for values in zip(*vertices))
+    return x, y
+
+def rings_frame(rings):
+    """Build an upload frame with one FieldName per ring."""
+    rows = [
+        {"FieldName": name, "X": x, "Y": y, "CRS": "EPSG:4326"}
+        for name, vertices in rings.items() for x, y in vertices
+    ]
+    return pd.DataFrame(rows)
+
+def test_build_rings_drops_repeated_and_closing_vertices():
+    ring_ids = np.array([0, 0, 0, 0, 0, 1, 1])
+    x = np.array([0.0, 1.0, 1.0, 1.0, 0.0, 5.0, 6.0])
+    y = np.array([0.0, 0.0, 0.0, 1.0, 0.0, 5.0, 6.0])
+    ring_ids, x, y, positions = build_rings(ring_ids, x, y)
+    assert ring_ids.tolist() == [0, 0, 0, 1, 1]
+    assert positions.tolist() == [0, 1, 3, 5, 6]
+
+def test_measure_rings_signs_area_by_orientation():
+    square = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+    x, y = ring_arrays(square + square[::-1])
+    vertex_count, area, extent = measure_rings(np.repeat([0, 1], 4), x, y, 2)
+    assert vertex_count.tolist() == [4, 4]
+    assert area.tolist() == [1.0, -1.0]
+    assert extent.tolist() == [1.0, 1.0]
+
+def test_large_comb_is_simple():
+    vertices = comb_ring(100)
+    assert len(vertices) > PAIRWISE_MAX_VERTICES
+    assert not ring_self_intersects(*ring_arrays(vertices))
+    assert not ring_self_intersects(*ring_arrays(rotate(vertices, 0.3)))
+
+@pytest.mark.parametrize("notch_depth", [2.0, 2.5])
+def test_large_comb_with_a_notch_reaching_the_bar_intersects(notch_depth):
+    vertices = comb_ring(100)
+    # The notch of one tooth touches (2.0) or cuts through (2.5) the bar along y = 0
+    vertices[3 + 4 * 50 + 1] = (vertices[3 + 4 * 50 + 1][0], 2.0 - notch_depth)
+    vertices[3 + 4 * 50 + 2] = (vertices[3 + 4 * 50 + 2][0], 2.0 - notch_depth)
+    assert ring_self_intersects(*ring_arrays(vertices))
+    assert ring_self_intersects(*ring_arrays(rotate(vertices, 0.3)))
+
+def test_find_self_intersecting_rings_sweeps_large_rings():
+    simple = rotate(comb_ring(40), 1.1)
+    crossing = comb_ring(40, notch_depth=2.5)
+    x, y = ring_arrays(simple + crossing)
+    ring_ids = np.repeat([0, 1], [len(simple), len(crossing)])
+    vertex_count = np.bincount(ring_ids)
+    assert vertex_count.min() > PAIRWISE_MAX_VERTICES
+    assert find_self_intersecting_rings(ring_ids, x, y, vertex_count).tolist() == [1]
+
+@pytest.mark.parametrize("vertex_count", [4, 7, 12, 80])
+def test_ring_self_intersects_matches_brute_force(vertex_count):
+    # Small integer grids give many collinear, touching and overlapping edges
+    generator = random.Random(vertex_count)
+    for _ in range(300):
+        vertices = [(generator.randint(0, 6), generator.randint(0, 6)) for _ in range(vertex_count)]
+        vertices = [vertex for index, vertex in enumerate(vertices) if vertex != vertices[index - 1]]
+        if len(vertices) < 3:
+            continue
+        assert ring_self_intersects(*ring_arrays(vertices)) == brute_force_self_intersects(vertices), vertices
+
+def test_find_self_intersecting_rings_matches_brute_force():
+    generator = random.Random(0)
+    rings = []
+    for _ in range(200):
+        count = generator.choice([3, 5, 8, 70])
+        vertices = [(generator.randint(0, 9), generator.randint(0, 9)) for _ in range(count)]
+        vertices = [vertex for index, vertex in enumerate(vertices) if vertex != vertices[index - 1]]
+        if len(vertices) >= 3:
+            rings.append(vertices)
+    x, y = ring_arrays([vertex for vertices in rings for vertex in vertices])
+    ring_ids = np.repeat(np.arange(len(rings)), [len(vertices) for vertices in rings])
+    expected = [ring for ring, vertices in enumerate(rings) if brute_force_self_intersects(vertices)]
+    assert find_self_intersecting_rings(ring_ids, x, y, np.bincount(ring_ids)).tolist() == expected
+
+def test_polygon_shape_errors_ignore_orientation():
+    square = [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
+    df = rings_frame({
+        "counterclockwise": square,
+        "clockwise": square[::-1],
+        "line": [(0, 0), (1, 1), (2, 2), (0, 0)],
+        "point": [(3, 3), (3, 3)],
+    })
+    errors = find_polygon_shape_errors(df)
+    assert sorted(set(zip(errors["field_name"], errors["error_code"]))) == [
+        ("line", "polygon_zero_area"),
+        ("point", "polygon_too_few_vertices"),
+    ]
+
+def test_self_intersecting_polygons_flag_every_coordinate_row():
+    df = rings_frame({
+        "bowtie": [(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)],
+        "square": [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)],
+    })
+    errors = find_self_intersecting_polygons(df)
+    assert errors["row_index"].tolist() == [0, 1, 2, 3, 4]
+    assert set(errors["error_code"]) == {"polygon_self_intersecting"}
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from crawler import stabilization
+from crawler.stabilization import FileStabilizationTracker
+from utils.checksum_util import calculate_checksum
+
+START = 1_000_000.0
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the tracker's clock with one the test moves forward."""
+    now = [START]
+    monkeypatch.setattr(stabilization.time, "time", lambda: now[0])
+    return now
+
+def write(path, content, mtime):
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+
+def test_file_is_ready_once_its_size_holds_for_the_stabilization_time(tmp_path, clock):
+    upload = tmp_path / "upload.csv"
+    write(upload, b"FieldName\n", START)
+    tracker = FileStabilizationTracker(stabilization_time=10, abandonment_time=100)
+    tracker.add(upload)
+
+    # The first check only records the size
+    assert tracker.check() == ([], [])
+    clock[0] = START + 5
+    assert tracker.check() == ([], [])
+    assert upload in tracker
+
+    clock[0] = START + 10
+    assert tracker.check() == ([(upload, calculate_checksum(upload))], [])
+    assert len(tracker) == 0
+
+def test_growing_file_waits_while_another_one_stabilizes(tmp_path, clock):
+    slow = tmp_path / "slow.csv"
+    done = tmp_path / "done.csv"
+    write(slow, b"FieldName\n", START)
+    write(done, b"FieldName\nA\n", START)
+    tracker = FileStabilizationTracker(stabilization_time=10, abandonment_time=100)
+    tracker.add(slow)
+    tracker.add(done)
+    tracker.check()
+
+    clock[0] = START + 20
+    write(slow, b"FieldName\nA\nB\n", START + 20)
+    ready, abandoned = tracker.check()
+    assert ready == [(done, calculate_checksum(done))] and abandoned == []
+    assert slow in tracker
+
+    clock[0] = START + 40
+    assert tracker.check() == ([(slow, calculate_checksum(slow))], [])
+
+def test_file_without_progress_is_abandoned(tmp_path, clock):
+    upload = tmp_path / "upload.csv"
+    write(upload, b"FieldName\n", START)
+    tracker = FileStabilizationTracker(stabilization_time=10, abandonment_time=100)
+    tracker.add(upload)
+    tracker.check()
+
+    # Touched recently, so not stable, but its size has not changed for longer than allowed
+    clock[0] = START + 200
+    os.utime(upload, (START + 195, START + 195))
+    assert tracker.check() == ([], [upload])
+    assert upload not in tracker
+
+def test_removed_file_is_abandoned(tmp_path, clock):
+    upload = tmp_path / "upload.csv"
+    write(upload, b"FieldName\n", START)
+    tracker = FileStabilizationTracker(stabilization_time=10, abandonment_time=100)
+    tracker.add(upload)
+    tracker.check()
+
+    upload.unlink()
+    assert tracker.check() == ([], [upload])
+    assert len(tracker) == 0
+
+def test_release_returns_the_checksum_of_a_tracked_file(tmp_path, clock):
+    upload = tmp_path / "upload.csv"
+    write(upload, b"FieldName\nA\n", START)
+    tracker = FileStabilizationTracker()
+    tracker.add(upload)
+    tracker.check()
+
+    assert tracker.release(upload) == calculate_checksum(upload)
+    assert tracker.release(upload) is None
+    assert upload not in tracker
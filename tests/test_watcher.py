@@ -0,0 +1,65 @@
+import pytest
+
+from crawler import watcher
+
+class _StopWatching(Exception):
+    """Raised from the patched sleep to leave the watcher loop."""
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    """Point the watcher at an empty uploads folder with instant stabilization."""
+    monkeypatch.setitem(watcher.CRAWLER_CONFIG, "Fields_FOLDER", tmp_path)
+    monkeypatch.setitem(watcher.WATCHER_CONFIG, "poll_interval", 0)
+    monkeypatch.setitem(watcher.WATCHER_CONFIG, "stabilization_time", 0)
+    return tmp_path
+
+def _stop_after(monkeypatch, loops):
+    """Make the watcher loop stop after the given number of sleeps."""
+    calls = []
+
+    def sleep(_):
+        calls.append(None)
+        if len(calls) >= loops:
+            raise _StopWatching()
+
+    monkeypatch.setattr(watcher.time, "sleep", sleep)
+
+def test_poll_folder_skips_seeded_files(uploads, monkeypatch):
+    handed_off = uploads / "handed_off.csv"
+    new = uploads / "new.csv"
+    handed_off.write_text("FieldName\nA\n")
+    new.write_text("FieldName\nB\n")
+
+    delivered = []
+    _stop_after(monkeypatch, 3)
+    with pytest.raises(_StopWatching):
+        watcher.poll_folder(lambda file, checksum: delivered.append(file), {handed_off})
+
+    assert delivered == [new]
+
+def test_poll_folder_without_seed_delivers_every_file(uploads, monkeypatch):
+    for name in ("a.csv", "b.csv"):
+        (uploads / name).write_text("FieldName\nA\n")
+
+    delivered = []
+    _stop_after(monkeypatch, 3)
+    with pytest.raises(_StopWatching):
+        watcher.poll_folder(lambda file, checksum: delivered.append(file))
+
+    assert sorted(delivered) == [uploads / "a.csv", uploads / "b.csv"]
+
+def test_watch_folder_seeds_poller_with_inotify_hand_offs(uploads, monkeypatch):
+    handed_off = uploads / "handed_off.csv"
+
+    def inotify_folder(callback, handed_off_files):
+        handed_off_files.add(handed_off)
+        raise OSError("inotify watch was removed")
+
+    seeds = []
+    monkeypatch.setitem(watcher.WATCHER_CONFIG, "backend", "auto")
+    monkeypatch.setattr(watcher, "inotify_folder", inotify_folder)
+    monkeypatch.setattr(watcher, "poll_folder", lambda callback, seen_files: seeds.append(set(seen_files)))
+
+    watcher.watch_folder()
+
+    assert seeds == [{handed_off}]
@@ -0,0 +1,83 @@
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config.logger_config import configure_logger
+from utils.db_util import get_insert_order
+
+# Configure logger
+logger = configure_logger("bulk_insert.log")
+
+def get_duckdb_connection(session):
+    """
+    Return the raw DuckDB connection underlying a SQLAlchemy session.
+
+    The connection is taken from the session's current transaction, so anything executed on it
+    is committed or rolled back together with the session.
+
+    :param session: SQLAlchemy session bound to the DuckDB engine.
+    :return: DuckDB connection (duckdb_engine wrapper).
+    """
+    return session.connection().connection.driver_connection
+
+@contextmanager
+def registered_frame(session, df: pd.DataFrame, prefix="frame"):
+    """
+    Expose a DataFrame to SQL on the session's DuckDB connection for the duration of the block.
+
+    :param session: SQLAlchemy session bound to the DuckDB engine.
+    :param df: DataFrame to expose; DuckDB scans it in place without copying it.
+    :param prefix: Prefix of the generated relation name.
+    :return: Name of the relation.
+    """
+    relation_name = f"{prefix}_{uuid.uuid4().hex}"
+    connection = get_duckdb_connection(session)
+    connection.register(relation_name, df)
+    try:
+        yield relation_name
+    finally:
+        connection.unregister(relation_name)
+
+def bulk_insert_dataframe(session, table_name, df: pd.DataFrame, columns=None, fill_values=None):
+    """
+    Insert a DataFrame into a table with a single `INSERT INTO ... SELECT` executed by DuckDB.
+
+    The DataFrame is registered as a relation on the session's DuckDB connection and scanned
+    columnar by the engine, instead of being converted into one parameterized INSERT per row.
+    Rows are written in the table's declared insertion order (see `get_insert_order`).
+
+    :param session: SQLAlchemy session bound to the DuckDB engine.
+    :param table_name: Name of the target table.
+    :param df: DataFrame holding the rows to insert.
+    :param columns: Columns to insert; defaults to all DataFrame columns.
+    :param fill_values: Dictionary mapping columns to the text stored in place of their missing
+        values; DuckDB reads pandas NaN as NULL.
+    :return: Number of rows inserted.
+    """
+    if df.empty:
+        return 0
+
+    columns = list(columns) if columns is not None else list(df.columns)
+    column_sql = ", ".join(f'"{column}"' for column in columns)
+    select_list = []
+    for column in columns:
+        if fill_values and column in fill_values:
+            fill_value = fill_values[column].replace("'", "''")
+            select_list.append(f'COALESCE(CAST("{column}" AS TEXT), \'{fill_value}\') AS "{column}"')
+        else:
+            select_list.append(f'"{column}"')
+    select_sql = ", ".join(select_list)
+    # Sort only when needed: callers usually pass the rows of a file in order already
+    order_columns = [column for column in get_insert_order(table_name) if column in columns]
+    order_sql = ""
+    if order_columns and not pd.MultiIndex.from_frame(df[order_columns]).is_monotonic_increasing:
+        order_sql = " ORDER BY " + ", ".join(f'"{column}"' for column in order_columns)
+
+    with registered_frame(session, df, f"bulk_{table_name}") as relation_name:
+        get_duckdb_connection(session).execute(
+            f'INSERT INTO {table_name} ({column_sql}) SELECT {select_sql} FROM "{relation_name}"{order_sql}'
+        )
+
+    logger.info("Bulk inserted %s rows into '%s'.", len(df), table_name)
+    return len(df)
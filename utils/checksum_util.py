@@ -1,28 +1,138 @@
 import hashlib
+import os
+import string
 
 from config.logger_config import configure_logger
+from config.pipeline_config import PIPELINE_CONFIG
 
 # Configure logger
 logger = configure_logger("checksum.log")
 
-def calculate_checksum(filepath):
+# Size of the buffer files are read into while hashing
+HASH_BUFFER_SIZE = 1024 * 1024
+
+def new_hasher(algorithm=None):
+    """
+    Create a hash object for the configured checksum algorithm.
+
+    :param algorithm: hashlib algorithm name; defaults to PIPELINE_CONFIG["checksum_algorithm"].
+    :return: hashlib hash object.
+    """
+    return hashlib.new(algorithm or PIPELINE_CONFIG["checksum_algorithm"])
+
+def is_checksum(value, algorithm=None):
+    """
+    Check whether a value is a hexadecimal digest of the checksum algorithm.
+
+    `calculate_checksum` returns an error message instead of a digest when the file cannot be
+    read, and such messages must never be matched against the checksums of other files.
+
+    :param value: Value returned by `calculate_checksum` or `IncrementalChecksum.hexdigest`.
+    :param algorithm: hashlib algorithm name; defaults to PIPELINE_CONFIG["checksum_algorithm"].
+    :return: True if the value is a digest.
+    """
+    return (
+        isinstance(value, str) and
+        len(value) == new_hasher(algorithm).digest_size * 2 and
+        all(character in string.hexdigits for character in value)
+    )
+
+def _hash_from(hasher, f, length=None):
+    """
+    Feed a file into a hash object from its current position.
+
+    :param hasher: hashlib hash object.
+    :param f: File opened in binary mode.
+    :param length: Maximum number of bytes to read; None reads to the end of the file.
+    :return: Number of bytes hashed.
+    """
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    hashed = 0
+    while length is None or hashed < length:
+        size = HASH_BUFFER_SIZE if length is None else min(HASH_BUFFER_SIZE, length - hashed)
+        read = f.readinto(view[:size])
+        if not read:
+            break
+        hasher.update(view[:read])
+        hashed += read
+    return hashed
+
+def calculate_checksum(filepath, algorithm=None):
     """
-    Calculate the SHA-256 checksum of a file.
+    Calculate the checksum of a file.
 
     :param filepath: Path to the file.
-    :return: SHA-256 checksum as a hexadecimal string, or an error message.
+    :param algorithm: hashlib algorithm name; defaults to PIPELINE_CONFIG["checksum_algorithm"].
+    :return: Checksum as a hexadecimal string, or an error message.
     """
     try:
-        hash_sha256 = hashlib.sha256()
+        hasher = new_hasher(algorithm)
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        checksum = hash_sha256.hexdigest()
-        logger.info(f"Checksum calculated successfully for file: {filepath}")
+            _hash_from(hasher, f)
+        checksum = hasher.hexdigest()
+        logger.info("Checksum calculated successfully for file: %s", filepath)
         return checksum
     except FileNotFoundError:
-        logger.error(f"File not found: {filepath}")
+        logger.error("File not found: %s", filepath)
         return "File not found"
     except Exception as e:
-        logger.error(f"Error calculating checksum for file {filepath}: {e}")
+        logger.error("Error calculating checksum for file %s: %s", filepath, e)
         return f"Error: {e}"
+
+class IncrementalChecksum:
+    """
+    Checksum of a file that is still growing, hashing only the bytes appended since the last update.
+
+    Most uploads are written sequentially, so the bytes already hashed do not change. The size
+    and modification time seen when the file was last hashed are kept: if the file shrank, or
+    was modified without growing (a writer that preallocates the file or rewrites it in place),
+    hashing starts over.
+    """
+
+    def __init__(self, algorithm=None):
+        """
+        :param algorithm: hashlib algorithm name; defaults to PIPELINE_CONFIG["checksum_algorithm"].
+        """
+        self.algorithm = algorithm
+        self._hasher = new_hasher(algorithm)
+        self.hashed_size = 0
+        self.hashed_mtime_ns = None
+
+    def update(self, filepath):
+        """
+        Hash the bytes appended to the file since the last call.
+
+        :param filepath: Path of the file.
+        :return: Number of bytes hashed.
+        """
+        # Taken before reading, so a write made while the file is read shows up on the next call
+        stat_result = os.stat(filepath)
+        if stat_result.st_size < self.hashed_size:
+            logger.info("File %s shrank while being hashed; restarting its checksum.", filepath)
+            self._restart()
+        elif stat_result.st_size == self.hashed_size and stat_result.st_mtime_ns != self.hashed_mtime_ns:
+            logger.info("File %s was modified in place while being hashed; restarting its checksum.", filepath)
+            self._restart()
+
+        with open(filepath, "rb") as f:
+            f.seek(self.hashed_size)
+            hashed = _hash_from(self._hasher, f)
+        self.hashed_size += hashed
+        self.hashed_mtime_ns = stat_result.st_mtime_ns
+        return hashed
+
+    def _restart(self):
+        """Forget the bytes hashed so far."""
+        self._hasher = new_hasher(self.algorithm)
+        self.hashed_size = 0
+
+    def hexdigest(self, filepath):
+        """
+        Hash any remaining bytes and return the checksum of the complete file.
+
+        :param filepath: Path of the file.
+        :return: Checksum as a hexadecimal string.
+        """
+        self.update(filepath)
+        return self._hasher.hexdigest()
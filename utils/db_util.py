@@ -1,8 +1,10 @@
+import contextvars
 import os
+import threading
 
 from sqlalchemy import create_engine, text, Column, String, Text, CheckConstraint, PrimaryKeyConstraint
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from contextlib import contextmanager
 from config.logger_config import configure_logger
 from models.sql_script_store import SQLScriptStore
@@ -27,12 +29,53 @@ engine = create_engine(DATABASE_URL)
 # Create a configured "Session" class
 SessionLocal = sessionmaker(autobegin=True, autoflush=False, bind=engine)
 
+# Connection of the unit of work open in the current thread, if any
+_active_unit = contextvars.ContextVar("unit_of_work", default=None)
+
+@contextmanager
+def unit_of_work():
+    """
+    Group every write made below this block into a single transaction and commit.
+
+    Sessions opened with `get_session` inside the block share one connection and its
+    transaction: their commits only flush, and the unit commits once when the block ends,
+    so a file costs one WAL sync instead of one per helper. An exception leaving the block
+    rolls everything back. A helper that rolls back (after logging an error) discards the
+    unit's earlier writes; later sessions in the block then commit on their own, so error
+    statuses are still recorded. Nested units join the outer one.
+
+    :return: The connection shared by the unit.
+    """
+    if _active_unit.get() is not None:
+        yield _active_unit.get()
+        return
+
+    with engine.connect() as connection:
+        connection.begin()
+        token = _active_unit.set(connection)
+        try:
+            yield connection
+            if connection.in_transaction():
+                connection.commit()
+        except Exception:
+            if connection.in_transaction():
+                connection.rollback()
+            raise
+        finally:
+            _active_unit.reset(token)
+
 @contextmanager
 def get_session():
     """
     Provides a transactional scope for database operations.
+
+    Inside a `unit_of_work` the session joins the unit's transaction instead of committing its own.
     """
-    session = SessionLocal()
+    connection = _active_unit.get()
+    if connection is not None:
+        session = Session(bind=connection, autoflush=False, join_transaction_mode="rollback_only")
+    else:
+        session = SessionLocal()
     try:
         yield session
         session.commit()  # Explicitly commit the transaction
@@ -42,6 +85,51 @@ def get_session():
     finally:
         session.close()
 
+@contextmanager
+def get_read_session():
+    """
+    Provides a session for lookups that never write, such as schema metadata.
+
+    It always reads through a pooled connection of its own and ends with a rollback, so it
+    issues no commit and never joins, nor waits for, a unit of work.
+    """
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+# CREATE definitions stored in sql_script_store, read once per process: {table_name: row}
+_schema_catalog = None
+_schema_catalog_lock = threading.Lock()
+
+def get_schema_catalog():
+    """
+    Return the stored CREATE definition of every table, read from sql_script_store once per process.
+
+    Models, column lists and insertion orders are all resolved from this snapshot, so importing
+    the model modules costs one query. `startup` clears it whenever it applies a new schema.
+
+    :return: Dictionary mapping table names to rows with query, data_columns and insert_order.
+    """
+    global _schema_catalog
+    with _schema_catalog_lock:
+        if _schema_catalog is None:
+            with get_read_session() as session:
+                # No bound parameters: binding one makes DuckDB import pandas, which the
+                # model modules no longer need at import time
+                rows = session.execute(text(
+                    "SELECT table_name, query, data_columns, insert_order FROM sql_script_store WHERE query_type = 'CREATE'"
+                )).fetchall()
+            _schema_catalog = {row.table_name: row for row in rows}
+            logger.info("Loaded schema catalog with %s table definitions.", len(_schema_catalog))
+        return _schema_catalog
+
+def clear_schema_catalog():
+    """Drop the cached schema catalog so the next lookup reads sql_script_store again."""
+    global _schema_catalog
+    with _schema_catalog_lock:
+        _schema_catalog = None
 
 def get_columns_from_store(table_name):
     """
@@ -50,14 +138,31 @@ def get_columns_from_store(table_name):
     :param table_name: Name of the table to fetch the column list for.
     :return: List of column names or None if not found.
     """
-    with get_session() as session:
-        try:
-            result = session.query(SQLScriptStore.data_columns).filter(SQLScriptStore.table_name == table_name).first()
-            if result and result.data_columns:
-                return result.data_columns.split(",")  # Convert the comma-separated string to a list
-            else:
-                logger.info(f"No column list found for table '{table_name}'.")
-                return None
-        except Exception as e:
-            logger.error(f"Error fetching columns for table '{table_name}': {e}")
-            return None
\ No newline at end of file
+    try:
+        definition = get_schema_catalog().get(table_name)
+    except Exception as e:
+        logger.error("Error fetching columns for table '%s': %s", table_name, e)
+        return None
+
+    if definition and definition.data_columns:
+        return definition.data_columns.split(",")  # Convert the comma-separated string to a list
+    logger.info("No column list found for table '%s'.", table_name)
+    return None
+
+def get_insert_order(table_name):
+    """
+    Fetch the columns new rows of a table are sorted by before they are inserted.
+
+    Rows stored in this order keep the min/max statistics of each row group narrow, so DuckDB
+    skips the row groups of other files when a query filters on file_id.
+
+    :param table_name: Name of the table.
+    :return: List of column names; empty if the table declares no insertion order.
+    """
+    try:
+        definition = get_schema_catalog().get(table_name)
+    except Exception as e:
+        # Rows are still inserted, just unsorted
+        logger.error("Error fetching insertion order for table '%s': %s", table_name, e)
+        return []
+    return definition.insert_order.split(",") if definition and definition.insert_order else []
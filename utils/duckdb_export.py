@@ -0,0 +1,53 @@
+import os
+
+from config.logger_config import configure_logger
+from utils.bulk_insert_util import get_duckdb_connection
+
+# Configure logger
+logger = configure_logger("duckdb_export.log")
+
+# COPY options per output format
+OUTPUT_FORMAT_OPTIONS = {
+    "csv": "FORMAT CSV, HEADER",
+    "parquet": "FORMAT PARQUET, COMPRESSION ZSTD",
+}
+
+def _escape(path):
+    """Escape a path for use in a SQL string literal."""
+    return str(path).replace("'", "''")
+
+def copy_query_to_file(session, query, output_path, output_format="csv"):
+    """
+    Write the result of a query to a file with DuckDB's `COPY (...) TO`.
+
+    Rows stream from the engine to the file, so the result is never materialized in Python.
+
+    :param session: SQLAlchemy session bound to the DuckDB engine.
+    :param query: SQL query.
+    :param output_path: Path of the file to write.
+    :param output_format: Key of OUTPUT_FORMAT_OPTIONS.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    get_duckdb_connection(session).execute(
+        f"COPY ({query}) TO '{_escape(output_path)}' ({OUTPUT_FORMAT_OPTIONS[output_format]})"
+    )
+    logger.info("Exported query result to '%s'.", output_path)
+
+def copy_query_to_dataset(session, query, output_dir, partition_by):
+    """
+    Append the result of a query to a Hive-partitioned Parquet dataset.
+
+    Each call adds new files under `<column>=<value>/` directories, so earlier exports are kept.
+
+    :param session: SQLAlchemy session bound to the DuckDB engine.
+    :param query: SQL query.
+    :param output_dir: Root directory of the dataset.
+    :param partition_by: Columns of the query result to partition by.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    partition_columns = ", ".join(partition_by)
+    get_duckdb_connection(session).execute(
+        f"COPY ({query}) TO '{_escape(output_dir)}' "
+        f"({OUTPUT_FORMAT_OPTIONS['parquet']}, PARTITION_BY ({partition_columns}), APPEND)"
+    )
+    logger.info("Appended query result to dataset '%s' partitioned by %s.", output_dir, partition_columns)
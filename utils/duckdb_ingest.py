@@ -0,0 +1,135 @@
+from config.logger_config import configure_logger
+from utils.bulk_insert_util import get_duckdb_connection
+from utils.generate_sqlalchemy_model import get_create_schema_from_db, parse_create_table_sql
+from validators.dates import DAY_FIRST_DATE_FORMATS, DAY_FIRST_DATE_PATTERN, ISO_DATE_PATTERN
+from validators.field_rules import empty_error_frame
+
+# Configure logger
+logger = configure_logger("duckdb_ingest.log")
+
+# Strings read as NULL, matching the default missing-value markers of pandas.read_csv
+NULL_STRINGS = ["", "NA", "N/A", "NULL", "null", "NaN", "nan", "n/a", "<NA>", "None"]
+
+# Error code recorded for values that cannot be converted to their column type
+TYPE_COERCION_ERROR_CODE = "invalid_data_type"
+
+def _quote(identifier):
+    """Quote a SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _cast_expression(column, sql_type):
+    """
+    Build the expression converting a VARCHAR staging column to its DDL type, NULL on failure.
+
+    :param column: Quoted column name.
+    :param sql_type: Column type from the CREATE TABLE statement.
+    :return: SQL expression.
+    """
+    sql_type = sql_type.upper()
+    if sql_type in ("TEXT", "VARCHAR", "STRING"):
+        return column
+    if sql_type in ("TIMESTAMP", "DATE"):
+        # Same reading as `parse_dates` on the pandas path: ISO 8601, otherwise day first
+        day_first = ", ".join(f"try_strptime({column}, '{date_format}')" for date_format in DAY_FIRST_DATE_FORMATS)
+        return (
+            f"CASE WHEN regexp_matches({column}, '{ISO_DATE_PATTERN}') THEN TRY_CAST({column} AS TIMESTAMP) "
+            f"WHEN regexp_matches({column}, '{DAY_FIRST_DATE_PATTERN}') THEN COALESCE({day_first}) END"
+        )
+    if sql_type in ("REAL", "FLOAT", "DOUBLE", "NUMERIC", "DECIMAL"):
+        return f"TRY_CAST({column} AS DOUBLE)"
+    if sql_type in ("INTEGER", "BIGINT", "SMALLINT"):
+        return f"TRY_CAST({column} AS BIGINT)"
+    if sql_type == "BOOLEAN":
+        return f"TRY_CAST({column} AS BOOLEAN)"
+    return column
+
+def get_data_column_types(table_name, data_columns):
+    """
+    Read the types of the data columns from the table's stored CREATE statement.
+
+    :param table_name: Name of the target table.
+    :param data_columns: Columns expected in the uploaded files.
+    :return: Dictionary mapping each data column to its SQL type.
+    """
+    _, columns = parse_create_table_sql(get_create_schema_from_db(table_name))
+    column_types = {column["name"]: column["type"] for column in columns}
+    return {column: column_types.get(column, "TEXT") for column in data_columns}
+
+def stage_csv(session, filepath, staging_table, column_types):
+    """
+    Load a CSV into a typed temporary staging table with DuckDB's parallel CSV reader.
+
+    The file is first read as VARCHAR so no row is rejected, then every data column is
+    converted to its DDL type. `row_index` is the row's position in the file.
+
+    :param session: SQLAlchemy session whose connection owns the temporary tables.
+    :param filepath: Path of the CSV file.
+    :param staging_table: Name of the typed staging table to create.
+    :param column_types: Dictionary mapping data columns to SQL types.
+    :return: Tuple of (columns found in the file, DataFrame of type coercion errors).
+    """
+    connection = get_duckdb_connection(session)
+    raw_table = f"{staging_table}_raw"
+
+    connection.execute(
+        f"CREATE OR REPLACE TEMP TABLE {raw_table} AS "
+        f"SELECT * FROM read_csv(?, header = true, all_varchar = true, nullstr = ?)",
+        [str(filepath), NULL_STRINGS]
+    )
+    file_columns = [row[0] for row in connection.execute(f"DESCRIBE {raw_table}").fetchall()]
+
+    try:
+        # Rows keep the file order, so the offset from the first rowid is the row index in the file
+        first_rowid = connection.execute(f"SELECT COALESCE(MIN(rowid), 0) FROM {raw_table}").fetchone()[0]
+        row_index = f"rowid - {first_rowid}"
+
+        present_columns = [column for column in column_types if column in file_columns]
+        select_list = ", ".join([f"{row_index} AS row_index"] + [
+            f"{_cast_expression(_quote(column), column_types[column])} AS {_quote(column)}"
+            for column in present_columns
+        ])
+        connection.execute(
+            f"CREATE OR REPLACE TEMP TABLE {staging_table} AS "
+            f"SELECT {select_list} FROM {raw_table}"
+        )
+
+        # Values present in the file that could not be converted are row errors
+        coercion_checks = [
+            f"SELECT {row_index} AS row_index, '{column}' AS field_name, 'row_validation' AS error_type, "
+            f"'{TYPE_COERCION_ERROR_CODE}' AS error_code FROM {raw_table} "
+            f"WHERE {_quote(column)} IS NOT NULL AND {_cast_expression(_quote(column), column_types[column])} IS NULL"
+            for column in present_columns
+            if _cast_expression(_quote(column), column_types[column]) != _quote(column)
+        ]
+        if coercion_checks:
+            errors_df = connection.execute(" UNION ALL ".join(coercion_checks) + " ORDER BY row_index").df()
+            errors_df["row_index"] = errors_df["row_index"].astype("Int64")
+        else:
+            errors_df = empty_error_frame()
+    finally:
+        connection.execute(f"DROP TABLE IF EXISTS {raw_table}")
+
+    logger.info("Staged %s into '%s' with %s type coercion errors.", filepath, staging_table, len(errors_df))
+    return file_columns, errors_df
+
+def read_staged_frame(session, staging_table):
+    """
+    Fetch a staging table as a DataFrame indexed by row index.
+
+    :param session: SQLAlchemy session whose connection owns the staging table.
+    :param staging_table: Name of the staging table.
+    :return: DataFrame of the staged rows in file order.
+    """
+    df = get_duckdb_connection(session).execute(f"SELECT * FROM {staging_table} ORDER BY row_index").df()
+    df = df.set_index("row_index")
+    df.index.name = None
+    return df
+
+def drop_staged_table(session, staging_table):
+    """
+    Drop a staging table created by `stage_csv`.
+
+    :param session: SQLAlchemy session whose connection owns the staging table.
+    :param staging_table: Name of the staging table.
+    """
+    get_duckdb_connection(session).execute(f"DROP TABLE IF EXISTS {staging_table}")
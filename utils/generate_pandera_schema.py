@@ -1,7 +1,7 @@
 from sqlalchemy import text
 
 from config.logger_config import configure_logger
-from utils.db_util import get_session
+from utils.db_util import get_read_session, get_schema_catalog
 
 # Configure logger
 logger = configure_logger("table_info.log")
@@ -25,25 +25,21 @@ TYPE_MAPPING = {
 
 def fetch_data_columns(table_name):
     """
-    Fetch the 'data_columns' field for the specified table from the sql_script_store table.
+    Fetch the 'data_columns' field for the specified table from the cached sql_script_store catalog.
 
     :param table_name: Name of the table to fetch data_columns for.
     :return: List of column names or None if not found.
     """
-    with get_session() as connection:
-        try:
-            result = connection.execute(
-                text('SELECT "data_columns" FROM sql_script_store WHERE table_name = :table_name'),
-                {"table_name": table_name}
-            ).fetchone()
-            if result and result[0]:
-                return result[0].split(",")  # Convert the comma-separated string to a list
-            else:
-                logger.info(f"No data_columns found for table '{table_name}'.")
-                return None
-        except Exception as e:
-            logger.error(f"Error fetching data_columns for table '{table_name}': {e}")
+    try:
+        definition = get_schema_catalog().get(table_name)
+        if definition and definition.data_columns:
+            return definition.data_columns.split(",")  # Convert the comma-separated string to a list
+        else:
+            logger.info("No data_columns found for table '%s'.", table_name)
             return None
+    except Exception as e:
+        logger.error("Error fetching data_columns for table '%s': %s", table_name, e)
+        return None
 
 def fetch_table_info(table_name):
     """
@@ -52,14 +48,31 @@ def fetch_table_info(table_name):
     :param table_name: The name of the table to inspect.
     :return: List of column info as tuples.
     """
-    with get_session() as connection:
+    with get_read_session() as connection:
         try:
             result = connection.execute(text(f"PRAGMA table_info('{table_name}')")).fetchall()
             return result
         except Exception as e:
-            logger.error(f"Error fetching table info for table '{table_name}': {e}")
+            logger.error("Error fetching table info for table '%s': %s", table_name, e)
             return None
 
+def fetch_schema_definition(table_name):
+    """
+    Fetch the stored CREATE statement and 'data_columns' for a table from the cached catalog.
+
+    :param table_name: Name of the table to fetch the definition for.
+    :return: Tuple of (query, data_columns) or None if not found.
+    """
+    try:
+        definition = get_schema_catalog().get(table_name)
+        if definition:
+            return definition.query, definition.data_columns
+        logger.info("No schema definition found for table '%s'.", table_name)
+        return None
+    except Exception as e:
+        logger.error("Error fetching schema definition for table '%s': %s", table_name, e)
+        return None
+
 def generate_pandera_class_from_table_info(table_name, class_name="GeneratedDataFrameModel"):
     """
     Generates a Pandera DataFrameModel class from a table's schema.
@@ -75,10 +88,10 @@ def generate_pandera_class_from_table_info(table_name, class_name="GeneratedData
     data_columns = fetch_data_columns(table_name)
 
     if not table_info:
-        logger.warning(f"No schema found for table '{table_name}'. Please ensure the table exists.")
+        logger.warning("No schema found for table '%s'. Please ensure the table exists.", table_name)
         return None
     if not data_columns:
-        logger.warning(f"No 'data_columns' metadata found for table '{table_name}' in sql_script_store.")
+        logger.warning("No 'data_columns' metadata found for table '%s' in sql_script_store.", table_name)
 
     # Generate the Pandera class
     class_lines = [f"class {class_name}(pa.DataFrameModel):"]
@@ -94,5 +107,5 @@ def generate_pandera_class_from_table_info(table_name, class_name="GeneratedData
             nullable = "False" if not_null else "True"
             class_lines.append(f"    {col_name}: Series[{pandera_type}] = pa.Field(nullable={nullable}, coerce=True)")
 
-    logger.info(f"Generated Pandera DataFrameModel class for table '{table_name}'.")
+    logger.info("Generated Pandera DataFrameModel class for table '%s'.", table_name)
     return "\n".join(class_lines)
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, Text, Float, TIMESTAMP, text
+from sqlalchemy import Column, Integer, Text, Float, TIMESTAMP
 from sqlalchemy.ext.declarative import declarative_base
 import re
+import threading
 
 from config.logger_config import configure_logger
-from utils.db_util import get_session
+from utils.db_util import get_schema_catalog
 
 # Configure logger
 logger = configure_logger("model_generation.log")
@@ -22,27 +23,22 @@ SQL_TYPE_MAP = {
 
 def get_create_schema_from_db(table_name):
     """
-    Query the `sql_script_store` table to retrieve the CREATE TABLE schema for the given table.
+    Retrieve the CREATE TABLE schema for the given table from the cached `sql_script_store` catalog.
 
     :param table_name: The name of the table to get the schema for.
     :return: The CREATE TABLE SQL statement.
     """
-    with get_session() as session:
-        try:
-            result = session.execute(
-                text("SELECT query FROM sql_script_store WHERE table_name = :table_name"),
-                {"table_name": table_name}
-            ).fetchone()
-
-            if not result:
-                logger.error(f"No schema found for table: {table_name}")
-                raise ValueError(f"No schema found for table: {table_name}")
-
-            logger.info(f"Schema retrieved for table '{table_name}': {result[0]}")
-            return result[0]
-        except Exception as e:
-            logger.error(f"Error retrieving schema for table '{table_name}': {e}")
-            raise
+    try:
+        definition = get_schema_catalog().get(table_name)
+        if definition is None:
+            logger.error("No schema found for table: %s", table_name)
+            raise ValueError(f"No schema found for table: {table_name}")
+
+        logger.info("Schema retrieved for table '%s': %s", table_name, definition.query)
+        return definition.query
+    except Exception as e:
+        logger.error("Error retrieving schema for table '%s': %s", table_name, e)
+        raise
 
 def parse_create_table_sql(sql):
     """
@@ -82,10 +78,10 @@ def parse_create_table_sql(sql):
                 "primary_key": primary_key
             })
 
-        logger.info(f"Parsed table '{table_name}' with columns: {columns}")
+        logger.info("Parsed table '%s' with columns: %s", table_name, columns)
         return table_name, columns
     except Exception as e:
-        logger.error(f"Error parsing CREATE TABLE SQL: {e}")
+        logger.error("Error parsing CREATE TABLE SQL: %s", e)
         raise
 
 def generate_model_class(sql):
@@ -110,11 +106,11 @@ def generate_model_class(sql):
             )
         # Dynamically create a new SQLAlchemy model class
         model_class = type(table_name.capitalize(), (Base,), class_attributes)
-        logger.info(f"Model class generated for table '{table_name}'")
+        logger.info("Model class generated for table '%s'", table_name)
 
         return model_class
     except Exception as e:
-        logger.error(f"Error generating model class: {e}")
+        logger.error("Error generating model class: %s", e)
         raise
 
 def generate_model_for_table(table_name):
@@ -127,7 +123,7 @@ def generate_model_for_table(table_name):
     try:
         # Check if the table already exists in Base.metadata
         if table_name in Base.metadata.tables:
-            logger.info(f"Table '{table_name}' is already defined in metadata. Reusing existing table.")
+            logger.info("Table '%s' is already defined in metadata. Reusing existing table.", table_name)
             existing_table = Base.metadata.tables[table_name]
             class_attributes = {"__tablename__": table_name, "__table__": existing_table}
             model_class = type(table_name.capitalize(), (Base,), class_attributes)
@@ -135,11 +131,35 @@ def generate_model_for_table(table_name):
 
         # Fetch the CREATE TABLE schema from the database
         create_table_sql = get_create_schema_from_db(table_name)
-        logger.info(f"Retrieved schema for table '{table_name}': {create_table_sql}")
+        logger.info("Retrieved schema for table '%s': %s", table_name, create_table_sql)
 
         # Generate the model class using the schema
         return generate_model_class(create_table_sql)
     except Exception as e:
-        logger.error(f"Error generating model for table '{table_name}': {e}")
+        logger.error("Error generating model for table '%s': %s", table_name, e)
         raise
 
+# Models generated so far: {table_name: model class}
+_models = {}
+_models_lock = threading.Lock()
+
+def get_model(table_name):
+    """
+    Return the SQLAlchemy model class of a table, generating it on first use.
+
+    Model modules call this instead of generating their class at import time, so importing
+    them neither reads the database nor parses DDL. A failed generation is retried on the
+    next call.
+
+    :param table_name: The name of the table.
+    :return: The model class, or None if it could not be generated.
+    """
+    with _models_lock:
+        if table_name not in _models:
+            try:
+                _models[table_name] = generate_model_for_table(table_name)
+                logger.info("Generated model class for table: %s", table_name)
+            except Exception as e:
+                logger.error("Error generating model class for table '%s': %s", table_name, e)
+                return None
+        return _models[table_name]
@@ -0,0 +1,49 @@
+import threading
+
+from sqlalchemy import text
+
+from config.logger_config import configure_logger
+
+# Configure logger
+logger = configure_logger("id_allocator.log")
+
+# Primary key column of every table whose ids are allocated here
+ID_COLUMNS = {
+    "files": "id",
+    "field_bronze_table": "id",
+    "validation_errors": "error_id",
+    "pipeline_metrics": "id",
+}
+
+# Next free id per table: {table_name: next_id}
+_next_ids = {}
+_allocator_lock = threading.Lock()
+
+def reserve_ids(session, table_name, count):
+    """
+    Reserve a block of consecutive ids for a table.
+
+    The table's max(id) is read once per process; later blocks are handed out from memory,
+    so a batch costs no query and two writers in this process never receive the same id.
+    Only the process writing to DuckDB allocates ids, so the counter covers every insert.
+
+    :param session: SQLAlchemy session used to seed the counter on first use.
+    :param table_name: Table to allocate ids for; must be listed in ID_COLUMNS.
+    :param count: Number of ids to reserve.
+    :return: range of the reserved ids.
+    """
+    with _allocator_lock:
+        if table_name not in _next_ids:
+            id_column = ID_COLUMNS[table_name]
+            max_id = session.execute(text(f"SELECT MAX({id_column}) FROM {table_name}")).scalar() or 0
+            _next_ids[table_name] = max_id + 1
+            logger.info("Seeded id allocation for '%s' at %s.", table_name, max_id + 1)
+
+        first_id = _next_ids[table_name]
+        _next_ids[table_name] = first_id + count
+    return range(first_id, first_id + count)
+
+def reset_id_allocator():
+    """Forget every counter so the next reservation reseeds it from the database."""
+    with _allocator_lock:
+        _next_ids.clear()
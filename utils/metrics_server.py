@@ -0,0 +1,48 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.logger_config import configure_logger
+from models.files import fetch_queue_depth
+from utils.db_util import get_read_session
+from utils.pipeline_metrics import render_prometheus
+
+# Configure logger
+logger = configure_logger("metrics_server.log")
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the pipeline metrics at /metrics in the Prometheus text format."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        try:
+            with get_read_session() as session:
+                body = render_prometheus(fetch_queue_depth(session)).encode("utf-8")
+        except Exception as e:
+            logger.error("Error rendering metrics: %s", e)
+            self.send_error(500)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the pipeline logs
+        pass
+
+def start_metrics_server(port):
+    """
+    Serve the Prometheus endpoint from a background thread.
+
+    :param port: Port to listen on.
+    :return: The running server.
+    """
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info("Serving Prometheus metrics on port %s at /metrics.", port)
+    return server
@@ -0,0 +1,215 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Metrics of the file being processed by the current thread
+_active_metrics = contextvars.ContextVar("file_metrics", default=None)
+
+def peak_memory_bytes():
+    """Return the peak resident memory of this process, or None if it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+class FileMetrics:
+    """Measurements taken while one file goes through the pipeline."""
+
+    def __init__(self, file_id, filepath):
+        """
+        :param file_id: ID of the file in the `files` table.
+        :param filepath: Path of the uploaded file; None when timing work shared by several files.
+        """
+        self.file_id = file_id
+        self.status = "complete"
+        self.stage_durations = {}
+        self.row_count = 0
+        self.error_count = 0
+        self.bytes_read = os.path.getsize(filepath) if filepath and os.path.exists(filepath) else 0
+        self.peak_memory_bytes = None
+        self.started = time.perf_counter()
+        self.duration_seconds = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage; durations of repeated stages (e.g. per chunk) add up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name, seconds):
+        """Add a duration measured elsewhere, e.g. in a validator process."""
+        self.stage_durations[name] = self.stage_durations.get(name, 0.0) + seconds
+
+class _Histogram:
+    """Cumulative Prometheus histogram."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name, labels=""):
+        separator = "," if labels else ""
+        lines = [
+            f'{name}_bucket{{{labels}{separator}le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+# Process-wide aggregates served to Prometheus
+_registry_lock = threading.Lock()
+_files_processed = {}
+_totals = {"rows": 0, "errors": 0, "bytes_read": 0}
+_file_latency = _Histogram(LATENCY_BUCKETS)
+_stage_latency = {}
+
+@contextmanager
+def collect_file_metrics(file_id, filepath):
+    """
+    Collect the metrics of one file while it goes through the pipeline.
+
+    Stages timed with `timed_stage` anywhere below this block are attributed to the file.
+    An exception marks the file as failed. This module does not touch the database, so it
+    can be used from validator processes; `models.pipeline_metrics.track_file` stores the result.
+
+    :param file_id: ID of the file in the `files` table.
+    :param filepath: Path of the uploaded file.
+    :return: The FileMetrics of the file.
+    """
+    metrics = FileMetrics(file_id, filepath)
+    token = _active_metrics.set(metrics)
+    try:
+        yield metrics
+    except Exception:
+        metrics.status = "error"
+        raise
+    finally:
+        _active_metrics.reset(token)
+        metrics.duration_seconds = time.perf_counter() - metrics.started
+        if metrics.peak_memory_bytes is None:
+            metrics.peak_memory_bytes = peak_memory_bytes()
+        observe_file_metrics(metrics)
+
+@contextmanager
+def collect_stages():
+    """
+    Time work shared by several files, such as a validation batch.
+
+    Stages timed with `timed_stage` below this block are recorded on the returned object rather
+    than on a file; nothing is aggregated, the caller hands the durations to the files involved.
+
+    :return: FileMetrics holding the stage durations.
+    """
+    metrics = FileMetrics(None, None)
+    token = _active_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _active_metrics.reset(token)
+
+def timed_stage(name):
+    """Time a stage of the file tracked by the current thread; does nothing outside `collect_file_metrics`."""
+    metrics = _active_metrics.get()
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+def count_rows(count):
+    """Add validated rows to the file tracked by the current thread."""
+    metrics = _active_metrics.get()
+    if metrics is not None:
+        metrics.row_count += count
+
+def count_errors(count):
+    """Add validation errors to the file tracked by the current thread."""
+    metrics = _active_metrics.get()
+    if metrics is not None:
+        metrics.error_count += count
+
+def observe_file_metrics(metrics):
+    """
+    Add the metrics of a processed file to the aggregates served to Prometheus.
+
+    :param metrics: FileMetrics of the file.
+    """
+    with _registry_lock:
+        _files_processed[metrics.status] = _files_processed.get(metrics.status, 0) + 1
+        _totals["rows"] += metrics.row_count
+        _totals["errors"] += metrics.error_count
+        _totals["bytes_read"] += metrics.bytes_read
+        _file_latency.observe(metrics.duration_seconds)
+        for stage, seconds in metrics.stage_durations.items():
+            _stage_latency.setdefault(stage, _Histogram(LATENCY_BUCKETS)).observe(seconds)
+
+def render_prometheus(queue_depth):
+    """
+    Render the aggregates in the Prometheus text exposition format.
+
+    :param queue_depth: Dictionary mapping file status names to the number of files waiting.
+    :return: Metrics text.
+    """
+    lines = [
+        "# HELP bronze_files_queued Files waiting in the bronze zone pipeline by status.",
+        "# TYPE bronze_files_queued gauge",
+    ]
+    lines += [f'bronze_files_queued{{status="{status}"}} {count}' for status, count in queue_depth.items()]
+
+    with _registry_lock:
+        lines += [
+            "# HELP bronze_files_processed_total Files that left the pipeline by outcome.",
+            "# TYPE bronze_files_processed_total counter",
+        ]
+        lines += [f'bronze_files_processed_total{{status="{status}"}} {count}' for status, count in _files_processed.items()]
+        lines += [
+            "# HELP bronze_rows_processed_total Rows validated.",
+            "# TYPE bronze_rows_processed_total counter",
+            f"bronze_rows_processed_total {_totals['rows']}",
+            "# HELP bronze_validation_errors_total Validation errors recorded.",
+            "# TYPE bronze_validation_errors_total counter",
+            f"bronze_validation_errors_total {_totals['errors']}",
+            "# HELP bronze_bytes_read_total Bytes of uploaded files processed.",
+            "# TYPE bronze_bytes_read_total counter",
+            f"bronze_bytes_read_total {_totals['bytes_read']}",
+            "# HELP bronze_file_processing_seconds Time to process one file.",
+            "# TYPE bronze_file_processing_seconds histogram",
+        ]
+        lines += _file_latency.render("bronze_file_processing_seconds")
+        lines += [
+            "# HELP bronze_stage_seconds Time spent per pipeline stage of one file.",
+            "# TYPE bronze_stage_seconds histogram",
+        ]
+        for stage, histogram in sorted(_stage_latency.items()):
+            lines += histogram.render("bronze_stage_seconds", f'stage="{stage}"')
+
+    peak = peak_memory_bytes()
+    if peak is not None:
+        lines += [
+            "# HELP bronze_peak_memory_bytes Peak resident memory of the pipeline process.",
+            "# TYPE bronze_peak_memory_bytes gauge",
+            f"bronze_peak_memory_bytes {peak}",
+        ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,116 @@
+import functools
+import json
+import re
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from config.logger_config import configure_logger
+
+# Configure logger
+logger = configure_logger("validation.log")
+
+# Bundled subset of the EPSG dataset: horizontal CRSs with the bounds of their area of use, in
+# the CRS's own axes (longitude/latitude or easting/northing), and datum transformations
+CRS_TABLE_PATH = Path(__file__).resolve().parent.parent / "config" / "crs_definitions.json"
+
+# Maximum number of distinct CRS values whose parsed definition is kept in memory
+CRS_CACHE_SIZE = 1024
+
+# [Kind:]Authority:[:]Code[_Authority::Code], e.g. "EPSG:4326", "Geographic2D:EPSG::4267" or
+# "BoundProjected:EPSG::26715_EPSG::15851"; the second code is the transformation of a bound CRS
+CRS_PATTERN = re.compile(
+    r"^(?:(?P<kind>Geographic2D|Projected|BoundGeographic2D|BoundProjected):)?"
+    r"(?P<authority>[A-Za-z]+)::?(?P<code>\d+)"
+    r"(?:_(?P<transform_authority>[A-Za-z]+)::?(?P<transform_code>\d+))?$"
+)
+
+CRSReference = namedtuple("CRSReference", ["kind", "authority", "code", "transform_authority", "transform_code"])
+
+# Result of `check_crs`: error_code is None for a valid CRS, bounds are (min_x, min_y, max_x, max_y)
+# when known, and key names the CRS the same way whatever notation the value used
+CRSCheck = namedtuple("CRSCheck", ["error_code", "bounds", "key"])
+
+_crs_table = None
+_crs_table_lock = threading.Lock()
+
+def get_crs_table():
+    """
+    Return the bundled CRS table, read once per process.
+
+    :return: Tuple of ({EPSG code: CRS entry}, {EPSG code: transformation entry}).
+    """
+    global _crs_table
+    with _crs_table_lock:
+        if _crs_table is None:
+            with open(CRS_TABLE_PATH, "r") as file:
+                table = json.load(file)
+            definitions = {}
+            for entry in table["crs"]:
+                for code in range(entry.get("first", entry.get("code")), entry.get("last", entry.get("code")) + 1):
+                    definitions[code] = entry
+            transformations = {entry["code"]: entry for entry in table["transformations"]}
+            _crs_table = (definitions, transformations)
+            logger.info("Loaded CRS table with %s CRS and %s transformations.", len(definitions), len(transformations))
+        return _crs_table
+
+@functools.lru_cache(maxsize=CRS_CACHE_SIZE)
+def parse_crs(value):
+    """
+    Parse a CRS reference.
+
+    :param value: CRS as written in the upload.
+    :return: CRSReference, or None if the value does not follow the notation.
+    """
+    match = CRS_PATTERN.match(str(value).strip())
+    if match is None:
+        return None
+    reference = CRSReference(
+        kind=match["kind"],
+        authority=match["authority"].upper(),
+        code=int(match["code"]),
+        transform_authority=match["transform_authority"].upper() if match["transform_authority"] else None,
+        transform_code=int(match["transform_code"]) if match["transform_code"] else None,
+    )
+    # A bound CRS needs its transformation, and only a bound CRS can have one
+    is_bound = reference.kind is not None and reference.kind.startswith("Bound")
+    if reference.kind is not None and is_bound != (reference.transform_code is not None):
+        return None
+    return reference
+
+@functools.lru_cache(maxsize=CRS_CACHE_SIZE)
+def check_crs(value):
+    """
+    Parse a CRS value and look it up in the bundled CRS table.
+
+    Meant to run once per distinct value of a file: results are memoized, and the callers map
+    them back to the rows.
+
+    :param value: CRS as written in the upload.
+    :return: CRSCheck; its error_code is "crs_invalid_format", "crs_unknown" (not in the
+        table, so bounds are not checked) or "crs_kind_mismatch", or None.
+    """
+    reference = parse_crs(value)
+    if reference is None:
+        return CRSCheck("crs_invalid_format", None, str(value).strip())
+
+    key = f"{reference.authority}::{reference.code}"
+    if reference.transform_code is not None:
+        key += f"_{reference.transform_authority}::{reference.transform_code}"
+
+    definitions, transformations = get_crs_table()
+    definition = definitions.get(reference.code) if reference.authority == "EPSG" else None
+    transformation = None
+    if reference.transform_code is not None:
+        transformation = transformations.get(reference.transform_code) if reference.transform_authority == "EPSG" else None
+    if definition is None or (reference.transform_code is not None and transformation is None):
+        return CRSCheck("crs_unknown", None, key)
+
+    # The declared type must match the CRS, and a transformation must start from its datum
+    declared_kind = reference.kind.replace("Bound", "") if reference.kind else definition["kind"]
+    if declared_kind != definition["kind"]:
+        return CRSCheck("crs_kind_mismatch", None, key)
+    if transformation is not None and transformation["source"] != definition.get("base", reference.code):
+        return CRSCheck("crs_kind_mismatch", None, key)
+
+    return CRSCheck(None, tuple(definition["bounds"]), key)
@@ -0,0 +1,37 @@
+import pandas as pd
+
+# DiscoveryDate values are read the same way by the pandas and DuckDB engines: year first as
+# ISO 8601 (e.g. "2023-08-02" or "2023-08-02T10:15:00"), otherwise day first with a four-digit
+# year (e.g. "02/08/2023"). Other layouts, such as two-digit years or time zone offsets, are
+# not dates.
+ISO_DATE_PATTERN = r"^\s*\d{4}-\d{1,2}-\d{1,2}([ T]\d{1,2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?\s*$"
+DAY_FIRST_DATE_PATTERN = r"^\d{1,2}[/.-]\d{1,2}[/.-]\d{4}( \d{1,2}:\d{2}:\d{2})?$"
+
+# Day first formats, tried in order on the values matching DAY_FIRST_DATE_PATTERN
+DAY_FIRST_DATE_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%Y %H:%M:%S", "%d-%m-%Y %H:%M:%S"]
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse date strings value by value, as ISO 8601 or day first.
+
+    Each value is parsed on its own, so the result does not depend on the first value of the
+    file or on how the file is split into chunks.
+
+    :param values: Series of date strings; returned unchanged if it already holds datetimes.
+    :return: Series of datetimes, NaT where a value is missing or not a date.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.astype("string")
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[us]")
+
+    iso = text.str.match(ISO_DATE_PATTERN).fillna(False).to_numpy(dtype=bool)
+    parsed[iso] = pd.to_datetime(text[iso], format="ISO8601", errors="coerce").to_numpy(dtype="datetime64[us]")
+
+    day_first = text.str.match(DAY_FIRST_DATE_PATTERN).fillna(False).to_numpy(dtype=bool)
+    for date_format in DAY_FIRST_DATE_FORMATS:
+        missing = day_first & parsed.isna().to_numpy()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(text[missing], format=date_format, errors="coerce").to_numpy(dtype="datetime64[us]")
+    return parsed
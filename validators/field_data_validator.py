@@ -1,209 +1,420 @@
 import os
+import shutil
+import numpy as np
 import pandas as pd
-import pandera as pa
-from datetime import datetime
-from pandera.typing import Series
-from sqlalchemy import func
-from sqlalchemy.orm import aliased
 from config.logger_config import configure_logger
-from models.bronze_validation_results_field_data import log_field_bronze_table, FieldBronzeTableModel
-from models.error_messages import ErrorMessagesModel
-from models.validation_errors import log_errors_to_db, ValidationErrorsModel
-from utils.db_util import get_session
+from config.pipeline_config import PIPELINE_CONFIG
+from models.bronze_validation_results_field_data import insert_field_bronze_rows, log_field_bronze_table
+from models.error_messages import get_error_catalog
+from models.validation_errors import insert_validation_errors, log_errors_to_db
+from utils.bulk_insert_util import registered_frame
+from utils.db_util import get_session, text
+from utils.duckdb_export import copy_query_to_dataset, copy_query_to_file
+from utils.duckdb_ingest import drop_staged_table, get_data_column_types, read_staged_frame, stage_csv
 from utils.generate_pandera_schema import generate_pandera_class_from_table_info
+from utils.generate_sqlalchemy_model import get_model
+from utils.pipeline_metrics import count_errors, count_rows, timed_stage
+from validators.schema_registry import get_schema
+from validators.field_rules import BATCH_KEY, empty_error_frame, find_crs_errors, find_self_intersecting_polygons
+from validators.dates import parse_dates
+from validators.field_schema import build_custom_schema, build_schema, run_validation
+from validators.sql_rules import run_sql_rules
 import traceback
-from sqlalchemy.sql import case
 
 # Configure logger
 logger = configure_logger("validation.log")
 
-# List to store validation errors
-validation_errors = []
-error_index = []
+# Directory receiving the validation results
+OUTPUT_DIR = "output"
+
+# Precedence of the error severities when a row has several errors
+SEVERITY_RANK = {"WARNING": 1, "ERROR": 2}
+
+def generate_schema_code(table_name, class_name="DynamicFieldSchema"):
+    """
+    Generate the source of the Pandera schema for a table.
+    """
+    return generate_pandera_class_from_table_info(table_name, class_name)
 
 def integrate_custom_checks(table_name, class_name="DynamicFieldSchema"):
     """
     Generate Pandera schema with custom validation checks.
     """
     # Generate schema code dynamically
-    schema_code = generate_pandera_class_from_table_info(table_name, class_name)
-    exec_globals = {"pa": pa, "Series": Series, "pd": pd, "datetime": datetime}
-    exec(schema_code, exec_globals)
-    base_schema_class = exec_globals[class_name]
-
-    # Define custom checks as methods in a subclass
-    class CustomDynamicFieldSchema(base_schema_class):
-        # Validate DiscoveryDate is <= today
-        @pa.dataframe_check
-        def validate_discovery_date(cls, df: pd.DataFrame) -> bool:
-            """Check if DiscoveryDate is not in the future."""
-            today = pd.Timestamp(datetime.now().date())
-            invalid_rows = df[df["DiscoveryDate"] > today]
-            if not invalid_rows.empty:
-                for idx in invalid_rows.index:
-                    error_index.append(idx)
-                    validation_errors.append({
-                        "row_index": str(idx),
-                        "field_name": "DiscoveryDate",
-                        "error_type": "row_validation",
-                        "error_code": "future_discovery_date"
-                    })
-            return True
-
-        # Ensure FieldType and DiscoveryDate are consistent for each FieldName
-        @pa.dataframe_check
-        def validate_consistency(cls, df: pd.DataFrame) -> bool:
-            """Check consistency of FieldType and DiscoveryDate within FieldName."""
-            for fieldname, group in df.groupby("FieldName"):
-                if group["FieldType"].nunique() > 1 or group["DiscoveryDate"].nunique() > 1:
-                    error_index.extend(group.index.tolist())
-                    for idx in group.index.tolist():
-                        validation_errors.append({
-                            "row_index": str(idx),
-                            "field_name": fieldname,
-                            "error_type": "group_validation",
-                            "error_code": "Inconsistent_field_data"
-                        })
-            return True
-
-        # Validate Polygon Completeness (X, Y, CRS must all be present or null)
-        @pa.dataframe_check
-        def validate_polygon_completeness(cls, df: pd.DataFrame) -> bool:
-            """Ensure X, Y, CRS are either all present or all null."""
-            for fieldname, group in df.groupby("FieldName"):
-                condition = (
-                        (group["X"].isnull() == group["Y"].isnull()) &
-                        (group["Y"].isnull() == group["CRS"].isnull())
-                )
-                if not condition.all():
-                    error_index.extend(group.index.tolist())
-                    for idx in group.index.tolist():
-                        validation_errors.append({
-                            "row_index": str(idx),
-                            "field_name": fieldname,
-                            "error_type": "group_validation",
-                            "error_code": "polygon_incomplete"
-                        })
-            return True
-
-        # Validate Polygon Closure (First and last X, Y must match)
-        @pa.dataframe_check
-        def validate_polygon_closure(cls, df: pd.DataFrame) -> bool:
-            """Ensure the first and last coordinates of a polygon match."""
-            for fieldname, group in df.groupby("FieldName"):
-                group = group.dropna(subset=["X", "Y"])
-                if len(group) >= 2 and not (
-                        (group.iloc[0]["X"] == group.iloc[-1]["X"]) and
-                        (group.iloc[0]["Y"] == group.iloc[-1]["Y"])
-                ):
-                    error_index.extend(group.index.tolist())
-                    for idx in group.index.tolist():
-                        validation_errors.append({
-                            "row_index": str(idx),
-                            "field_name": fieldname,
-                            "error_type": "group_validation",
-                            "error_code": "polygon_not_closed"
-                        })
-            return True
-
-    return CustomDynamicFieldSchema
-
-
-def log_and_save_results(df, file_id, file_name, validation_errors):
-    """Log validation results and save to CSV."""
-    with get_session() as session:
-        # Extract row indices from validation errors for logging
-        error_indices = {error["row_index"] for error in validation_errors}  # Set of unique indices
+    schema_code = generate_schema_code(table_name, class_name)
+    return build_custom_schema(schema_code, class_name)
+
+
+def log_results(df, file_id, errors_df):
+    """
+    Log validated rows and their validation errors to the database.
+
+    :return: Tuple of (rows_logged, errors_logged), True when the rows, respectively the errors,
+        were committed.
+    """
+    # Extract row indices from validation errors for logging
+    error_indices = set(errors_df["row_index"].dropna())  # Set of unique indices
+    count_rows(len(df))
+    count_errors(len(errors_df))
+
+    with timed_stage("log_field_bronze_table"):
+        rows_logged = log_field_bronze_table(df, file_id, error_indices)
+    if not rows_logged:
+        # The errors of rows that are not stored would point at nothing
+        return False, False
+    with timed_stage("log_errors_to_db"):
+        return rows_logged, log_errors_to_db(errors_df, file_id)
+
+def result_output_path(file_name):
+    """
+    Return where the validation results of a file are written for the configured output format.
+
+    :param file_name: Name of the validated file.
+    :return: Path of the result file, or of the dataset directory for the partitioned format.
+    """
+    output_format = PIPELINE_CONFIG["output_format"]
+    if output_format == "partitioned":
+        return f"{OUTPUT_DIR}/validation_results"
+    return f"{OUTPUT_DIR}/{file_name}_validation_results.{output_format}"
+
+def assemble_error_columns(errors_df, catalog):
+    """
+    Turn the errors of a file into the error_message and error_severity of each failing row.
+
+    Codes are mapped to messages and severities through the in-memory catalog; a row gets its
+    messages joined with ', ' in error code order, whichever order the checks reported them in,
+    and its highest severity. Codes missing from the catalog add nothing.
+
+    :param errors_df: Errors of the file, one row per error.
+    :param catalog: Error catalog returned by `get_error_catalog`.
+    :return: DataFrame with row_index, error_message and error_severity, one row per failing row.
+    """
+    errors = (
+        errors_df[["row_index", "error_code"]].dropna(subset=["row_index"])
+        .sort_values(["row_index", "error_code"], kind="stable")
+        .join(catalog, on="error_code")
+    )
+    row_index = errors["row_index"].astype("int64")
+    # Summing "message, " strings per row is a single grouped pass, unlike a Python join per group
+    known_messages = errors["error_message"].dropna()
+    messages = (known_messages.astype(object) + ", ").groupby(row_index[known_messages.index]).sum().str[:-2]
+    severity_ranks = errors["error_severity"].map(SEVERITY_RANK).groupby(row_index).max()
+    severities = severity_ranks.map({rank: severity for severity, rank in SEVERITY_RANK.items()})
+
+    error_columns = pd.DataFrame({"error_message": messages, "error_severity": severities})
+    return error_columns.rename_axis("row_index").reset_index()
+
+def fetch_file_errors(session, file_id):
+    """Read the logged errors of a file as (row_index, error_code) rows, in a stable order."""
+    rows = session.execute(
+        text("SELECT row_index, error_code FROM validation_errors WHERE file_id = :file_id ORDER BY row_index, error_code, error_id"),
+        {"file_id": file_id}
+    ).fetchall()
+    return pd.DataFrame(rows, columns=["row_index", "error_code"])
 
+def save_results(file_id, file_name, errors_df=None):
+    """
+    Export the logged validation results of a file.
+
+    The messages and severities of the failing rows are assembled in memory from the error
+    catalog and joined by DuckDB to the stored rows while they are written out.
+
+    :param file_id: ID of the validated file.
+    :param file_name: Name of the validated file.
+    :param errors_df: Errors of the file when they are still in memory; read from
+        `validation_errors` otherwise.
+    """
+    with get_session() as session:
         try:
-            # Log validation results
-            log_field_bronze_table(df, file_id, error_indices)
-            log_errors_to_db(validation_errors, file_id)
-
-            # Build SQLAlchemy query to fetch results
-            ValidationErrorsAlias = aliased(ValidationErrorsModel)
-            ErrorMessagesAlias = aliased(ErrorMessagesModel)
-            query = (
-                session.query(
-                    FieldBronzeTableModel.id,
-                    FieldBronzeTableModel.row_index,
-                    FieldBronzeTableModel.file_id,
-                    FieldBronzeTableModel.validation_status,
-                    FieldBronzeTableModel.FieldName,
-                    FieldBronzeTableModel.FieldType,
-                    FieldBronzeTableModel.DiscoveryDate,
-                    FieldBronzeTableModel.X,
-                    FieldBronzeTableModel.Y,
-                    FieldBronzeTableModel.CRS,
-                    FieldBronzeTableModel.Source,
-                    FieldBronzeTableModel.ParentFieldName,
-                    FieldBronzeTableModel.validation_timestamp,
-                    func.group_concat(ErrorMessagesAlias.error_message, ', ').label("error_message"),
-                    # Determine error_severity: show "ERROR" if any error exists, otherwise "WARNING"
-                    case(
-                        (func.sum(case((ErrorMessagesAlias.error_severity == 'ERROR', 1), else_=0)) > 0, 'ERROR'),
-                        (func.sum(case((ErrorMessagesAlias.error_severity == 'WARNING', 1), else_=0)) > 0, 'WARNING'),
-                        else_=''  # Return empty string when there are no warnings or errors
-                    ).label("error_severity")
-                )
-                .outerjoin(
-                    ValidationErrorsAlias,
-                    (FieldBronzeTableModel.row_index == ValidationErrorsAlias.row_index) &
-                    (FieldBronzeTableModel.file_id == ValidationErrorsAlias.file_id)
-                )
-                .outerjoin(
-                    ErrorMessagesAlias,
-                    ValidationErrorsAlias.error_code == ErrorMessagesAlias.error_code
-                )
-                .filter(FieldBronzeTableModel.file_id == file_id)
-                .group_by(
-                    FieldBronzeTableModel.id,
-                    FieldBronzeTableModel.row_index,
-                    FieldBronzeTableModel.file_id,
-                    FieldBronzeTableModel.validation_status,
-                    FieldBronzeTableModel.FieldName,
-                    FieldBronzeTableModel.FieldType,
-                    FieldBronzeTableModel.DiscoveryDate,
-                    FieldBronzeTableModel.X,
-                    FieldBronzeTableModel.Y,
-                    FieldBronzeTableModel.CRS,
-                    FieldBronzeTableModel.Source,
-                    FieldBronzeTableModel.ParentFieldName,
-                    FieldBronzeTableModel.validation_timestamp,
+            if errors_df is None:
+                errors_df = fetch_file_errors(session, file_id)
+            error_columns = assemble_error_columns(errors_df, get_error_catalog(session))
+
+            FieldBronzeTableModel = get_model("field_bronze_table")
+            select_list = [f'b."{column.name}"' for column in FieldBronzeTableModel.__table__.columns]
+            select_list += ["CAST(e.error_message AS TEXT) AS error_message", "CAST(e.error_severity AS TEXT) AS error_severity"]
+            output_format = PIPELINE_CONFIG["output_format"]
+            if output_format == "partitioned":
+                select_list.append("CAST(b.validation_timestamp AS DATE) AS validation_date")
+
+            # DuckDB writes the rows straight to the output
+            output_path = result_output_path(file_name)
+            with timed_stage("export"), registered_frame(session, error_columns, "error_columns") as relation_name:
+                query = (
+                    f'SELECT {", ".join(select_list)} FROM {FieldBronzeTableModel.__tablename__} b '
+                    f'LEFT JOIN "{relation_name}" e ON b.row_index = e.row_index '
+                    f'WHERE b.file_id = {int(file_id)} ORDER BY b.row_index'
                 )
-                .order_by(FieldBronzeTableModel.id)
-            )
-
-            result_df = pd.DataFrame(query.all(), columns=[col["name"] for col in query.column_descriptions])
-            output_dir = "output"
-            os.makedirs(output_dir, exist_ok=True)
-            result_df.to_csv(f"{output_dir}/{file_name}_validation_results.csv", index=False)
-            logger.info(f"Results saved to '{output_dir}/{file_name}_validation_results.csv'.")
+                if output_format == "partitioned":
+                    copy_query_to_dataset(session, query, output_path, ["file_id", "validation_date"])
+                else:
+                    copy_query_to_file(session, query, output_path, output_format)
+            logger.info("Results saved to '%s'.", output_path)
         except Exception as e:
-            logger.error(f"Error logging and saving results: {e}")
+            logger.error("Error saving results: %s", e)
+
+def reuse_results(original_id, original_name, file_name):
+    """
+    Provide the results of an already validated, byte-identical file for a new upload.
+
+    The original's export is copied when it exists, otherwise it is exported again from the
+    stored results. In the partitioned format the original's rows are already in the dataset.
+
+    :param original_id: ID of the completed file with the same checksum.
+    :param original_name: Name of the completed file.
+    :param file_name: Name of the new upload.
+    """
+    if PIPELINE_CONFIG["output_format"] == "partitioned":
+        logger.info("Results of '%s' are those of file ID %s in the dataset.", file_name, original_id)
+        return
+
+    original_path = result_output_path(original_name)
+    output_path = result_output_path(file_name)
+    if original_path == output_path:
+        logger.info("Results of '%s' are already in '%s'.", file_name, output_path)
+    elif os.path.exists(original_path):
+        shutil.copyfile(original_path, output_path)
+        logger.info("Copied results of file ID %s to '%s'.", original_id, output_path)
+    else:
+        save_results(original_id, file_name)
+
+def log_and_save_results(df, file_id, file_name, errors_df):
+    """
+    Log validation results and save to CSV.
+
+    :return: True if the rows were stored; nothing is exported otherwise.
+    """
+    try:
+        rows_logged, errors_logged = log_results(df, file_id, errors_df)
+        if not rows_logged:
+            return False
+        # Only reuse the in-memory errors if they are the ones stored
+        save_results(file_id, file_name, errors_df if errors_logged else None)
+        return True
+    except Exception as e:
+        logger.error("Error logging and saving results: %s", e)
+        return False
 
 def validate_field(df, file_id, file_name):
-    """Main function to validate data."""
+    """
+    Main function to validate data.
+
+    :return: True if the validated rows were stored.
+    """
+    errors_df = empty_error_frame()
+    try:
+        DynamicFieldSchema = get_schema("field_bronze_table", integrate_custom_checks)
+        with timed_stage("validation"):
+            errors_df = run_validation(df, DynamicFieldSchema)
+    except Exception as ex:
+        logger.error("Unexpected error during validation: %s", traceback.format_exc())
+    return log_and_save_results(df, file_id, file_name, errors_df)
+
+def validate_field_batch(session, frames):
+    """
+    Validate several files as one frame and add their results to the session's transaction.
+
+    Rows are tagged with their file ID so the group rules never mix two files. Nothing is
+    committed; the caller commits the results together with the file statuses.
+
+    :param session: SQLAlchemy session receiving the rows and errors.
+    :param frames: Dictionary mapping file IDs to their parsed DataFrames.
+    :return: Dictionary mapping file IDs to their logged (rows, errors) frames.
+    """
+    tagged = []
+    for file_id, df in frames.items():
+        df['DiscoveryDate'] = parse_dates(df['DiscoveryDate'])
+        tagged.append(df.assign(**{BATCH_KEY: file_id, "row_index": df.index}))
+    batch = pd.concat(tagged, ignore_index=True)
+
+    DynamicFieldSchema = get_schema("field_bronze_table", integrate_custom_checks)
+    with timed_stage("validation"):
+        errors_df = run_validation(batch, DynamicFieldSchema)
+
+    # Translate batch positions back to each file's row index
+    located = errors_df[errors_df["row_index"].notna()].copy()
+    positions = located["row_index"].astype("int64").to_numpy()
+    located[BATCH_KEY] = batch[BATCH_KEY].to_numpy()[positions]
+    located["row_index"] = batch["row_index"].to_numpy()[positions]
+    # Errors not tied to a row concern every file of the batch
+    unlocated = errors_df[errors_df["row_index"].isna()]
+    errors_df = pd.concat([located, *(unlocated.assign(**{BATCH_KEY: file_id}) for file_id in frames)], ignore_index=True)
+
+    failed_rows = batch.index.isin(positions)
+    batch["validation_status"] = ["Failed" if failed else "Passed" for failed in failed_rows]
+    with timed_stage("log_field_bronze_table"):
+        insert_field_bronze_rows(session, batch)
+    with timed_stage("log_errors_to_db"):
+        if not errors_df.empty:
+            insert_validation_errors(session, errors_df)
+
+    file_rows = dict(list(batch.groupby(BATCH_KEY, sort=False)))
+    file_errors = dict(list(errors_df.groupby(BATCH_KEY, sort=False)))
+    return {file_id: (file_rows[file_id], file_errors.get(file_id, empty_error_frame())) for file_id in frames}
+
+def compile_base_schema(table_name, class_name="DynamicFieldSchema"):
+    """
+    Generate Pandera schema without the custom checks, which run as SQL on staged uploads.
+    """
+    return build_schema(generate_schema_code(table_name, class_name), class_name)
+
+def validate_field_staged(filepath, file_id, file_name, column_list):
+    """
+    Validate a file through a DuckDB staging table.
+
+    DuckDB parses and types the file, the business rules run as SQL and write their errors
+    directly, and only column types and nullability are checked with Pandera. Polygon
+    self-intersection is checked on the staged rows.
+
+    :param filepath: Path of the CSV file.
+    :param file_id: ID of the file being processed.
+    :param file_name: Name of the file, used for the result export.
+    :param column_list: Columns expected in the file.
+    :return: Tuple of (missing_columns, stored): the file is not validated when the list is
+        not empty, and its results are not exported when its rows could not be stored.
+    """
+    staging_table = "staging_field_bronze_table"
+    column_types = get_data_column_types("field_bronze_table", column_list)
+    stored = False
+
+    with get_session() as session:
+        try:
+            with timed_stage("duckdb_read_csv"):
+                file_columns, errors_df = stage_csv(session, filepath, staging_table, column_types)
+            missing_columns = [column for column in column_list if column not in file_columns]
+            if missing_columns:
+                return missing_columns, False
+
+            df = read_staged_frame(session, staging_table)
+            try:
+                with timed_stage("validation"):
+                    errors_df = pd.concat([
+                        errors_df,
+                        run_validation(df, get_schema("field_bronze_table", compile_base_schema)),
+                        # The sweep line and the CRS table have no SQL counterpart, so they run on the staged rows
+                        find_self_intersecting_polygons(df),
+                        find_crs_errors(df),
+                    ], ignore_index=True)
+                with timed_stage("sql_rules"):
+                    rule_error_count = run_sql_rules(session, staging_table, file_id)
+                session.commit()
+                with timed_stage("log_errors_to_db"):
+                    log_errors_to_db(errors_df, file_id)
+                count_rows(len(df))
+                count_errors(len(errors_df) + rule_error_count)
+
+                # Both Pandera and SQL rule errors are in the database now
+                error_indices = {row[0] for row in session.execute(
+                    text("SELECT DISTINCT row_index FROM validation_errors WHERE file_id = :file_id"),
+                    {"file_id": file_id}
+                )}
+                with timed_stage("log_field_bronze_table"):
+                    stored = log_field_bronze_table(df, file_id, error_indices)
+            except Exception as ex:
+                logger.error("Unexpected error during validation: %s", traceback.format_exc())
+        finally:
+            drop_staged_table(session, staging_table)
+
+    if stored:
+        save_results(file_id, file_name)
+    return [], stored
+
+def plan_field_group_chunks(filepath, chunk_rows):
+    """
+    Assign the rows of a CSV to chunks holding whole FieldName groups, wherever their rows are.
+
+    Only the FieldName column is read, chunk by chunk. Groups are taken in
+    order of their first row and packed into chunks of about `chunk_rows` rows; a group larger
+    than that forms a chunk of its own. Rows without a FieldName belong to no group.
+
+    :param filepath: Path of the CSV file.
+    :param chunk_rows: Number of rows read per chunk.
+    :return: Tuple of (chunk_of_row, chunk_last_row): the chunk of each row and the position
+        of the last row of each chunk.
+    """
+    group_ids = {}
+    row_groups = []
+    for part in pd.read_csv(filepath, usecols=["FieldName"], chunksize=chunk_rows):
+        codes, names = pd.factorize(part["FieldName"])
+        part_ids = np.array([group_ids.setdefault(name, len(group_ids)) for name in names] + [-1], dtype=np.int64)
+        row_groups.append(part_ids[codes])
+
+    group_of_row = np.concatenate(row_groups) if row_groups else np.empty(0, dtype=np.int64)
+    # Each row without a FieldName is a group of its own
+    ungrouped = group_of_row < 0
+    group_of_row[ungrouped] = len(group_ids) + np.arange(int(ungrouped.sum()))
+
+    group_count = len(group_ids) + int(ungrouped.sum())
+    positions = np.arange(len(group_of_row))
+    first_row = np.full(group_count, len(group_of_row), dtype=np.int64)
+    np.minimum.at(first_row, group_of_row, positions)
+    last_row = np.zeros(group_count, dtype=np.int64)
+    np.maximum.at(last_row, group_of_row, positions)
+
+    # A group joins the chunk in which its first row falls, counting rows of whole groups,
+    # unless it is larger than a chunk or follows such a group
+    order = np.argsort(first_row, kind="stable")
+    sizes = np.bincount(group_of_row, minlength=group_count)[order]
+    bucket = (np.cumsum(sizes) - sizes) // chunk_rows
+    oversized = sizes > chunk_rows
+    starts_chunk = np.ones(group_count, dtype=bool)
+    starts_chunk[1:] = (bucket[1:] != bucket[:-1]) | oversized[1:] | oversized[:-1]
+    chunk_of_group = np.empty(group_count, dtype=np.int64)
+    chunk_of_group[order] = np.cumsum(starts_chunk) - 1
+
+    chunk_last_row = np.zeros(int(chunk_of_group.max()) + 1 if group_count else 0, dtype=np.int64)
+    np.maximum.at(chunk_last_row, chunk_of_group, last_row)
+    return chunk_of_group[group_of_row], chunk_last_row
+
+def iter_field_group_chunks(filepath, chunk_rows, plan):
+    """
+    Read a CSV in bounded chunks that only ever contain whole FieldName groups.
+
+    The file is read `chunk_rows` rows at a time and each row is kept aside for its chunk of
+    the plan; a chunk is yielded once its last row has been read, with its rows in file order.
+    When the rows of every FieldName are contiguous, only about one chunk is held at a time.
+    The pandas index keeps counting across chunks, so it still matches the row index in the file.
+
+    :param filepath: Path of the CSV file.
+    :param chunk_rows: Number of rows read per chunk.
+    :param plan: Plan returned by `plan_field_group_chunks` for the same file.
+    :return: Iterator of DataFrames.
+    """
+    chunk_of_row, chunk_last_row = plan
+    pending = {}
+    rows_read = 0
+    for part in pd.read_csv(filepath, chunksize=chunk_rows):
+        part_chunks = chunk_of_row[rows_read:rows_read + len(part)]
+        for chunk_id, rows in part.groupby(part_chunks, sort=False):
+            pending.setdefault(chunk_id, []).append(rows)
+        rows_read += len(part)
+
+        for chunk_id in sorted(chunk_id for chunk_id in pending if chunk_last_row[chunk_id] < rows_read):
+            yield pd.concat(pending.pop(chunk_id)).sort_index()
+
+def validate_field_in_chunks(filepath, file_id, file_name, chunk_rows):
+    """
+    Validate and log a file chunk by chunk so memory stays bounded regardless of its size.
+
+    :param filepath: Path of the CSV file.
+    :param file_id: ID of the file being processed.
+    :param file_name: Name of the file, used for the result export.
+    :param chunk_rows: Number of rows read per chunk.
+    :return: True if the rows of every chunk were stored; nothing is exported otherwise.
+    """
+    stored = False
     try:
-        DynamicFieldSchema = integrate_custom_checks("field_bronze_table")
-        # Convert DiscoveryDate to datetime with dayfirst=True
-        df['DiscoveryDate'] = pd.to_datetime(df['DiscoveryDate'], errors='coerce', dayfirst=True)
-
-        DynamicFieldSchema.validate(df, lazy=True)
-    except pa.errors.SchemaErrors as e:
-        validation_errors.extend(
-            {
-                "row_index": error.get("index"),
-                "field_name": error.get("column"),
-                "error_type": "row_validation",
-                "error_code": error.get("check"),
-            }
-            for _, error in e.failure_cases.iterrows()
-        )
-        logger.warning("Validation schema errors detected.")
+        DynamicFieldSchema = get_schema("field_bronze_table", integrate_custom_checks)
+        plan = plan_field_group_chunks(filepath, chunk_rows)
+        for chunk in iter_field_group_chunks(filepath, chunk_rows, plan):
+            with timed_stage("validation"):
+                errors_df = run_validation(chunk, DynamicFieldSchema)
+            rows_logged, _ = log_results(chunk, file_id, errors_df)
+            if not rows_logged:
+                return False
+        stored = True
     except Exception as ex:
-        logger.error(f"Unexpected error during validation: {traceback.format_exc()}")
-    finally:
-        log_and_save_results(df, file_id, file_name, validation_errors)
-        validation_errors.clear()
-        error_index.clear()
+        logger.error("Unexpected error during validation: %s", traceback.format_exc())
+    if stored:
+        save_results(file_id, file_name)
+    return stored
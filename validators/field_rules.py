@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from validators.crs import check_crs
+from validators.polygon_geometry import build_rings, find_self_intersecting_rings, is_flat, measure_rings
+
+# Columns of the error frames returned by the rule functions
+ERROR_COLUMNS = ["row_index", "field_name", "error_type", "error_code"]
+
+# Column tagging the rows of a batch of files; groups never span two files
+BATCH_KEY = "file_id"
+
+def empty_error_frame():
+    """Return an empty error frame with the standard error columns."""
+    return pd.DataFrame(columns=ERROR_COLUMNS)
+
+def _error_frame(row_index, field_name, error_type, error_code):
+    """
+    Build a columnar error frame.
+
+    :param row_index: Index values of the failing rows.
+    :param field_name: Scalar or vector with the field name reported for each row.
+    :param error_type: Error type ('row_validation' or 'group_validation').
+    :param error_code: Error code as stored in the error_messages table.
+    :return: DataFrame with the standard error columns.
+    """
+    return pd.DataFrame({
+        "row_index": pd.Series(row_index, dtype="Int64"),
+        "field_name": pd.Series(field_name, index=range(len(row_index)), dtype="object"),
+        "error_type": error_type,
+        "error_code": error_code,
+    }, columns=ERROR_COLUMNS)
+
+def _group_keys(df: pd.DataFrame):
+    """Return the columns identifying a FieldName group: per file when validating a batch."""
+    return [BATCH_KEY, "FieldName"] if BATCH_KEY in df.columns else ["FieldName"]
+
+def find_future_discovery_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag rows whose DiscoveryDate is in the future."""
+    today = pd.Timestamp.now().normalize()
+    invalid_rows = df.index[(df["DiscoveryDate"] > today).to_numpy()]
+    return _error_frame(invalid_rows, "DiscoveryDate", "row_validation", "future_discovery_date")
+
+def find_inconsistent_field_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag every row of a FieldName whose FieldType or DiscoveryDate is not unique."""
+    groups = df.groupby(_group_keys(df), sort=False)
+    inconsistent = (
+        (groups["FieldType"].transform("nunique") > 1) |
+        (groups["DiscoveryDate"].transform("nunique") > 1)
+    )
+    failing = df.loc[inconsistent.to_numpy()]
+    return _error_frame(failing.index, failing["FieldName"].to_numpy(), "group_validation", "Inconsistent_field_data")
+
+def find_incomplete_polygons(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag every row of a FieldName where X, Y and CRS are not all present or all null."""
+    x_null = df["X"].isnull()
+    y_null = df["Y"].isnull()
+    crs_null = df["CRS"].isnull()
+    mismatch = (x_null != y_null) | (y_null != crs_null)
+
+    # Rows without a FieldName belong to no group and come back as NaN
+    incomplete = mismatch.groupby([df[key] for key in _group_keys(df)], sort=False).transform("any")
+    failing = df.loc[incomplete.eq(True).to_numpy()]
+    return _error_frame(failing.index, failing["FieldName"].to_numpy(), "group_validation", "polygon_incomplete")
+
+def find_unclosed_polygons(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag the coordinate rows of a FieldName whose first and last X, Y do not match."""
+    group_keys = _group_keys(df)
+    coordinates = df.loc[df["X"].notnull() & df["Y"].notnull(), group_keys + ["X", "Y"]]
+    groups = coordinates.groupby(group_keys, sort=False)
+    unclosed = (
+        (groups["X"].transform("size") >= 2) &
+        (
+            (groups["X"].transform("first") != groups["X"].transform("last")) |
+            (groups["Y"].transform("first") != groups["Y"].transform("last"))
+        )
+    )
+    failing = coordinates.loc[unclosed.to_numpy()]
+    return _error_frame(failing.index, failing["FieldName"].to_numpy(), "group_validation", "polygon_not_closed")
+
+def _polygon_rings(df: pd.DataFrame):
+    """
+    Collect the coordinates of every FieldName as a ring, vertices in row order.
+
+    :return: Tuple of (coordinates, ring_of_row, ring_ids, x, y, ring_count): the rows with
+        numeric X and Y, the ring of each of those rows, and the rings from `build_rings`.
+    """
+    group_keys = _group_keys(df)
+    x = pd.to_numeric(df["X"], errors="coerce")
+    y = pd.to_numeric(df["Y"], errors="coerce")
+    coordinates = df.loc[(x.notnull() & y.notnull()).to_numpy(), group_keys]
+
+    # Rows without a FieldName belong to no ring and are numbered NaN
+    ring_of_row = coordinates.groupby(group_keys, sort=False).ngroup()
+    in_ring = ring_of_row.notna().to_numpy()
+    coordinates, ring_of_row = coordinates.loc[in_ring], ring_of_row[in_ring].to_numpy(dtype=int)
+
+    ring_ids, ring_x, ring_y, _ = build_rings(
+        ring_of_row, x[coordinates.index].to_numpy(dtype=float), y[coordinates.index].to_numpy(dtype=float)
+    )
+    return coordinates, ring_of_row, ring_ids, ring_x, ring_y, int(ring_of_row.max()) + 1 if len(ring_of_row) else 0
+
+def _ring_error_frame(coordinates, ring_of_row, failing_rings, error_code):
+    """Build the error frame flagging the coordinate rows of the failing rings."""
+    failing = coordinates.loc[np.isin(ring_of_row, failing_rings)]
+    return _error_frame(failing.index, failing["FieldName"].to_numpy(), "group_validation", error_code)
+
+def find_polygon_shape_errors(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flag the coordinate rows of a FieldName whose polygon has fewer than 3 distinct vertices
+    or no area. Vertices may run either way around: winding order is not a defect.
+    """
+    coordinates, ring_of_row, ring_ids, x, y, ring_count = _polygon_rings(df)
+    vertex_count, area, extent = measure_rings(ring_ids, x, y, ring_count)
+    flat = is_flat(area, extent)
+    checks = [
+        ("polygon_too_few_vertices", vertex_count < 3),
+        ("polygon_zero_area", (vertex_count >= 3) & flat),
+    ]
+    return pd.concat(
+        [_ring_error_frame(coordinates, ring_of_row, np.flatnonzero(failing), error_code) for error_code, failing in checks],
+        ignore_index=True
+    )
+
+def find_self_intersecting_polygons(df: pd.DataFrame) -> pd.DataFrame:
+    """Flag the coordinate rows of a FieldName whose polygon boundary crosses or touches itself."""
+    coordinates, ring_of_row, ring_ids, x, y, ring_count = _polygon_rings(df)
+    intersecting = find_self_intersecting_rings(ring_ids, x, y, np.bincount(ring_ids, minlength=ring_count))
+    return _ring_error_frame(coordinates, ring_of_row, intersecting, "polygon_self_intersecting")
+
+def find_crs_errors(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flag CRS values that cannot be parsed, are not in the bundled CRS table or do not match
+    their declared type, coordinates outside the area of use of their CRS, and every row of a
+    FieldName that uses more than one CRS.
+
+    Each distinct CRS value is checked once and the result is mapped back to its rows.
+    """
+    value_of_row, values = pd.factorize(df["CRS"])
+    checks = [check_crs(value) for value in values]
+
+    # Null CRS values are numbered -1 and pick the trailing entry, which never fails
+    row_error_codes = np.array([check.error_code for check in checks] + [None], dtype=object)[value_of_row]
+    frames = [
+        _error_frame(df.index[row_error_codes == error_code], "CRS", "row_validation", error_code)
+        for error_code in ("crs_invalid_format", "crs_unknown", "crs_kind_mismatch")
+    ]
+
+    unbounded = (-np.inf, -np.inf, np.inf, np.inf)
+    row_bounds = np.array([check.bounds or unbounded for check in checks] + [unbounded], dtype=float)[value_of_row]
+    x = pd.to_numeric(df["X"], errors="coerce").to_numpy(dtype=float)
+    y = pd.to_numeric(df["Y"], errors="coerce").to_numpy(dtype=float)
+    outside = (
+        (x < row_bounds[:, 0]) | (y < row_bounds[:, 1]) |
+        (x > row_bounds[:, 2]) | (y > row_bounds[:, 3])
+    )
+    frames.append(_error_frame(df.index[outside], "CRS", "row_validation", "crs_out_of_bounds"))
+
+    # Compare the CRS each value names, so "EPSG:4267" and "Geographic2D:EPSG::4267" agree
+    key_ids = {}
+    value_key_ids = [key_ids.setdefault(check.key, len(key_ids)) for check in checks]
+    row_keys = pd.Series(np.array(value_key_ids + [np.nan], dtype=float)[value_of_row], index=df.index)
+    inconsistent = row_keys.groupby([df[key] for key in _group_keys(df)], sort=False).transform("nunique") > 1
+    failing = df.loc[inconsistent.to_numpy()]
+    frames.append(_error_frame(failing.index, failing["FieldName"].to_numpy(), "group_validation", "crs_inconsistent"))
+    return pd.concat(frames, ignore_index=True)
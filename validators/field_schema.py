@@ -0,0 +1,104 @@
+import traceback
+from datetime import datetime
+
+import pandas as pd
+import pandera as pa
+from pandera.typing import Series
+
+from config.logger_config import configure_logger
+from validators.dates import parse_dates
+from validators.field_rules import (
+    ERROR_COLUMNS,
+    empty_error_frame,
+    find_crs_errors,
+    find_future_discovery_dates,
+    find_inconsistent_field_data,
+    find_incomplete_polygons,
+    find_polygon_shape_errors,
+    find_self_intersecting_polygons,
+    find_unclosed_polygons,
+)
+
+# Configure logger
+logger = configure_logger("validation.log")
+
+# Business rules checked after the Pandera schema; each returns an error frame
+CUSTOM_CHECKS = (
+    # DiscoveryDate is <= today
+    find_future_discovery_dates,
+    # FieldType and DiscoveryDate are consistent for each FieldName
+    find_inconsistent_field_data,
+    # X, Y and CRS are either all present or all null
+    find_incomplete_polygons,
+    # The first and last X, Y of a polygon match
+    find_unclosed_polygons,
+    # A polygon has at least 3 distinct vertices and an area
+    find_polygon_shape_errors,
+    # The boundary of a polygon does not cross or touch itself
+    find_self_intersecting_polygons,
+    # The CRS is valid, covers the coordinates and is the same for a FieldName
+    find_crs_errors,
+)
+
+def build_schema(schema_code, class_name="DynamicFieldSchema"):
+    """
+    Compile generated Pandera schema code without the custom validation checks.
+
+    This module does not touch the database, so it can be used from validator processes.
+
+    :param schema_code: Source of the generated Pandera DataFrameModel class.
+    :param class_name: Name of the class defined by `schema_code`.
+    :return: The schema class.
+    """
+    exec_globals = {"pa": pa, "Series": Series, "pd": pd, "datetime": datetime}
+    exec(schema_code, exec_globals)
+    return exec_globals[class_name]
+
+def build_custom_schema(schema_code, class_name="DynamicFieldSchema"):
+    """
+    Compile generated Pandera schema code and add the custom validation checks.
+
+    :param schema_code: Source of the generated Pandera DataFrameModel class.
+    :param class_name: Name of the class defined by `schema_code`.
+    :return: The schema class including the custom checks.
+    """
+    base_schema_class = build_schema(schema_code, class_name)
+
+    # Pandera takes public class attributes for fields, so the checks are kept private
+    class CustomDynamicFieldSchema(base_schema_class):
+        _custom_checks = CUSTOM_CHECKS
+
+    return CustomDynamicFieldSchema
+
+def run_validation(df, schema_class):
+    """
+    Validate a DataFrame against a compiled schema and collect every error found.
+
+    :param df: DataFrame to validate; DiscoveryDate is converted to datetime in place.
+    :param schema_class: Schema class returned by `build_custom_schema`.
+    :return: DataFrame with one row per validation error.
+    """
+    error_frames = [empty_error_frame()]
+    try:
+        # Convert DiscoveryDate to datetime, as ISO 8601 or day first
+        df['DiscoveryDate'] = parse_dates(df['DiscoveryDate'])
+
+        try:
+            validated = schema_class.validate(df, lazy=True)
+        except pa.errors.SchemaErrors as e:
+            failure_cases = e.failure_cases
+            error_frames.append(pd.DataFrame({
+                "row_index": pd.to_numeric(failure_cases["index"], errors="coerce").astype("Int64"),
+                "field_name": failure_cases["column"],
+                "error_type": "row_validation",
+                "error_code": failure_cases["check"],
+            }, columns=ERROR_COLUMNS))
+            logger.warning("Validation schema errors detected.")
+            validated = e.data
+
+        # The custom checks see the coerced frame; schemas from `build_schema` have none
+        for check in getattr(schema_class, "_custom_checks", ()):
+            error_frames.append(check(validated))
+    except Exception as ex:
+        logger.error("Unexpected error during validation: %s", traceback.format_exc())
+    return pd.concat(error_frames, ignore_index=True)
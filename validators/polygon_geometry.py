@@ -0,0 +1,424 @@
+import numpy as np
+
+# Rings whose area is below this share of their squared extent are considered flat
+ZERO_AREA_TOLERANCE = 1e-9
+
+# Rings with up to this many vertices compare all their pairs of edges at once with NumPy,
+# larger ones use the sweep line
+PAIRWISE_MAX_VERTICES = 64
+
+# Pairs of edges compared per NumPy operation, bounding the memory of the pairwise check
+PAIRWISE_CHUNK_SIZE = 1 << 20
+
+def build_rings(ring_ids, x, y):
+    """
+    Turn the vertices of many polygons into rings that can be measured together.
+
+    Vertices keep their order within each ring. A vertex repeating the previous one and the
+    closing vertex (a repeat of the first) are dropped, so every ring lists its distinct
+    vertices once and its last edge runs back to the first vertex.
+
+    :param ring_ids: Integer ring of each vertex, from 0 to the number of rings - 1.
+    :param x: X coordinate of each vertex.
+    :param y: Y coordinate of each vertex.
+    :return: Tuple of (ring_ids, x, y, positions) arrays sorted by ring; positions are the
+        indexes of the kept vertices in the input arrays.
+    """
+    positions = np.argsort(ring_ids, kind="stable")
+    ring_ids, x, y = ring_ids[positions], x[positions], y[positions]
+    if not len(ring_ids):
+        return ring_ids, x, y, positions
+
+    same_ring = ring_ids[1:] == ring_ids[:-1]
+    repeated = np.concatenate(([False], same_ring & (x[1:] == x[:-1]) & (y[1:] == y[:-1])))
+    keep = ~repeated
+    positions, ring_ids, x, y = positions[keep], ring_ids[keep], x[keep], y[keep]
+
+    # Drop the closing vertex of rings that list their first vertex again at the end
+    first = _ring_starts(ring_ids)
+    last = np.concatenate((first[1:], [len(ring_ids)])) - 1
+    closing = last[(last > first) & (x[last] == x[first]) & (y[last] == y[first])]
+    keep = np.ones(len(ring_ids), dtype=bool)
+    keep[closing] = False
+    return ring_ids[keep], x[keep], y[keep], positions[keep]
+
+def _ring_starts(ring_ids):
+    """Return the position of the first vertex of each ring in arrays sorted by ring."""
+    if not len(ring_ids):
+        return np.array([], dtype=int)
+    return np.flatnonzero(np.concatenate(([True], ring_ids[1:] != ring_ids[:-1])))
+
+def _following_vertices(ring_ids, first):
+    """Return the position of the next vertex of each vertex; the last vertex of a ring is followed by its first."""
+    following = np.arange(1, len(ring_ids) + 1)
+    last = np.concatenate((first[1:], [len(ring_ids)])) - 1
+    following[last] = first
+    return following
+
+def measure_rings(ring_ids, x, y, ring_count):
+    """
+    Compute the vertex count, signed shoelace area and extent of every ring.
+
+    Coordinates are taken relative to the first vertex of their ring, so large projected
+    coordinates do not lose precision in the products. A positive area means the vertices
+    run counterclockwise.
+
+    :param ring_ids: Ring of each vertex, as returned by `build_rings`.
+    :param x: X coordinate of each vertex, as returned by `build_rings`.
+    :param y: Y coordinate of each vertex, as returned by `build_rings`.
+    :param ring_count: Number of rings.
+    :return: Tuple of (vertex_count, area, extent) arrays indexed by ring.
+    """
+    vertex_count = np.bincount(ring_ids, minlength=ring_count)
+    if not len(ring_ids):
+        return vertex_count, np.zeros(ring_count), np.zeros(ring_count)
+
+    first = _ring_starts(ring_ids)
+    first_of_vertex = np.repeat(first, vertex_count[ring_ids[first]])
+    x = x - x[first_of_vertex]
+    y = y - y[first_of_vertex]
+
+    following = _following_vertices(ring_ids, first)
+    area = np.bincount(ring_ids, weights=x * y[following] - x[following] * y, minlength=ring_count) / 2
+
+    extent = np.zeros(ring_count)
+    extent[ring_ids[first]] = np.maximum(
+        np.maximum.reduceat(x, first) - np.minimum.reduceat(x, first),
+        np.maximum.reduceat(y, first) - np.minimum.reduceat(y, first),
+    )
+    return vertex_count, area, extent
+
+def is_flat(area, extent):
+    """Return which rings have no area, e.g. because all their vertices are collinear."""
+    return np.abs(area) <= ZERO_AREA_TOLERANCE * extent * extent
+
+def _orientation(ax, ay, bx, by, cx, cy):
+    """Return 1 if a, b, c turn counterclockwise, -1 if clockwise and 0 if they are collinear."""
+    value = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (value > 0) - (value < 0)
+
+def _within(ax, ay, bx, by, px, py):
+    """Return whether p, collinear with segment a-b, lies on the segment."""
+    return min(ax, bx) <= px <= max(ax, bx) and min(ay, by) <= py <= max(ay, by)
+
+def segments_intersect(a, b, c, d):
+    """
+    Return whether the closed segments a-b and c-d share a point.
+
+    :param a: (x, y) tuple; likewise for b, c and d.
+    """
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = a, b, c, d
+    o1 = _orientation(ax, ay, bx, by, cx, cy)
+    o2 = _orientation(ax, ay, bx, by, dx, dy)
+    o3 = _orientation(cx, cy, dx, dy, ax, ay)
+    o4 = _orientation(cx, cy, dx, dy, bx, by)
+    if o1 != o2 and o3 != o4:
+        return True
+    return (
+        (o1 == 0 and _within(ax, ay, bx, by, cx, cy)) or
+        (o2 == 0 and _within(ax, ay, bx, by, dx, dy)) or
+        (o3 == 0 and _within(cx, cy, dx, dy, ax, ay)) or
+        (o4 == 0 and _within(cx, cy, dx, dy, bx, by))
+    )
+
+class _SweepStatus:
+    """
+    Edges crossing the sweep line, from bottom to top, kept in a treap (a randomized balanced
+    binary search tree).
+
+    Nodes are the edge indexes themselves and their links are stored in lists indexed by edge,
+    so an edge leaving the sweep is found without searching, and inserting or removing an edge
+    and finding its neighbours take O(log n) expected time.
+    """
+
+    def __init__(self, edge_count, seed=0):
+        rng = np.random.default_rng(seed)
+        self.priority = rng.random(edge_count).tolist()
+        self.left = [-1] * edge_count
+        self.right = [-1] * edge_count
+        self.parent = [-1] * edge_count
+        self.root = -1
+
+    def insert(self, edge, is_below):
+        """
+        Add an edge.
+
+        :param edge: Index of the edge.
+        :param is_below: Function telling whether an active edge is below the new one.
+        """
+        parent, node = -1, self.root
+        while node != -1:
+            parent = node
+            node = self.right[node] if is_below(node) else self.left[node]
+        self.parent[edge] = parent
+        if parent == -1:
+            self.root = edge
+        elif is_below(parent):
+            self.right[parent] = edge
+        else:
+            self.left[parent] = edge
+        while self.parent[edge] != -1 and self.priority[edge] > self.priority[self.parent[edge]]:
+            self._rotate_up(edge)
+
+    def remove(self, edge):
+        """Remove an active edge."""
+        # Rotate the edge down until it is a leaf, keeping the heap order of the priorities
+        while self.left[edge] != -1 or self.right[edge] != -1:
+            left, right = self.left[edge], self.right[edge]
+            if right == -1 or (left != -1 and self.priority[left] > self.priority[right]):
+                self._rotate_up(left)
+            else:
+                self._rotate_up(right)
+        parent = self.parent[edge]
+        if parent == -1:
+            self.root = -1
+        elif self.left[parent] == edge:
+            self.left[parent] = -1
+        else:
+            self.right[parent] = -1
+        self.parent[edge] = -1
+
+    def below(self, edge):
+        """Return the active edge just below an active edge, or -1."""
+        if self.left[edge] != -1:
+            node = self.left[edge]
+            while self.right[node] != -1:
+                node = self.right[node]
+            return node
+        node, parent = edge, self.parent[edge]
+        while parent != -1 and self.left[parent] == node:
+            node, parent = parent, self.parent[parent]
+        return parent
+
+    def above(self, edge):
+        """Return the active edge just above an active edge, or -1."""
+        if self.right[edge] != -1:
+            node = self.right[edge]
+            while self.left[node] != -1:
+                node = self.left[node]
+            return node
+        node, parent = edge, self.parent[edge]
+        while parent != -1 and self.right[parent] == node:
+            node, parent = parent, self.parent[parent]
+        return parent
+
+    def _rotate_up(self, node):
+        """Rotate a node above its parent."""
+        parent = self.parent[node]
+        grandparent = self.parent[parent]
+        if self.left[parent] == node:
+            child = self.right[node]
+            self.left[parent] = child
+            self.right[node] = parent
+        else:
+            child = self.left[node]
+            self.right[parent] = child
+            self.left[node] = parent
+        if child != -1:
+            self.parent[child] = parent
+        self.parent[parent] = node
+        self.parent[node] = grandparent
+        if grandparent == -1:
+            self.root = node
+        elif self.left[grandparent] == parent:
+            self.left[grandparent] = node
+        else:
+            self.right[grandparent] = node
+
+def ring_self_intersects(x, y):
+    """
+    Check whether the boundary of a ring crosses or touches itself (Shamos-Hoey sweep line).
+
+    Edges are swept from left to right, ordered by height at the sweep position in a balanced
+    tree; an edge is only compared with its neighbours in that order when it enters or leaves,
+    so a ring of n vertices costs O(n log n) instead of the n² of comparing every pair of edges.
+    Consecutive edges share a vertex and only count as intersecting when they fold back over
+    each other.
+
+    :param x: X coordinates of the distinct vertices of the ring, as returned by `build_rings`.
+    :param y: Y coordinates of the distinct vertices of the ring.
+    :return: True if two edges of the ring intersect.
+    """
+    count = len(x)
+    if count < 3:
+        return False
+
+    # Consecutive edges share a vertex; they only intersect when the boundary folds back on itself
+    previous_x, previous_y = np.roll(x, 1) - x, np.roll(y, 1) - y
+    next_x, next_y = np.roll(x, -1) - x, np.roll(y, -1) - y
+    folds = (previous_x * next_y - previous_y * next_x == 0) & (previous_x * next_x + previous_y * next_y > 0)
+    if folds.any():
+        return True
+
+    # Each edge runs from its lexicographically smaller endpoint to the larger one
+    points = list(zip(x.tolist(), y.tolist()))
+    edges = []
+    slopes = []
+    events = []
+    for index in range(count):
+        start, end = points[index], points[(index + 1) % count]
+        left, right = (start, end) if start <= end else (end, start)
+        edges.append((left, right))
+        slopes.append((right[1] - left[1]) / (right[0] - left[0]) if right[0] != left[0] else float("inf"))
+        # At the same point, edges enter before others leave, so touching edges meet
+        events.append((left, 0, index))
+        events.append((right, 1, index))
+    events.sort()
+
+    def crosses(first, second):
+        if first == -1 or second == -1 or abs(first - second) in (1, count - 1):
+            return False
+        return segments_intersect(*edges[first], *edges[second])
+
+    def height(edge, sweep_x, sweep_y):
+        (lx, ly), (rx, ry) = edges[edge]
+        if lx == rx:
+            # Vertical edge: it is at the event's height if it covers it
+            return min(max(sweep_y, ly), ry)
+        return ly + slopes[edge] * (sweep_x - lx)
+
+    # Edges crossing the sweep line; until two of them intersect, their order does not change
+    active = _SweepStatus(count)
+    for (event_x, event_y), leaving, edge in events:
+        if leaving:
+            if crosses(active.below(edge), active.above(edge)):
+                return True
+            active.remove(edge)
+            continue
+
+        key = (event_y, slopes[edge])
+        active.insert(edge, lambda other: (height(other, event_x, event_y), slopes[other]) < key)
+        if crosses(active.below(edge), edge) or crosses(edge, active.above(edge)):
+            return True
+    return False
+
+def _star_shaped_rings(ring_ids, x, y, vertex_count):
+    """
+    Find the rings whose vertices wind once around their mean point, each edge turning by
+    less than half a turn in the same direction.
+
+    Every edge of such a ring stays within its own angular sector around that point, so the
+    ring is simple. Convex rings and most field boundaries pass this test, which saves them
+    the sweep line. Margins keep rounding errors from passing a ring that is not simple.
+
+    :return: Boolean array indexed by ring.
+    """
+    ring_count = len(vertex_count)
+    if not len(ring_ids):
+        return np.zeros(ring_count, dtype=bool)
+    counts = np.maximum(vertex_count, 1)
+    dx = x - (np.bincount(ring_ids, weights=x, minlength=ring_count) / counts)[ring_ids]
+    dy = y - (np.bincount(ring_ids, weights=y, minlength=ring_count) / counts)[ring_ids]
+    angles = np.arctan2(dy, dx)
+
+    following = _following_vertices(ring_ids, _ring_starts(ring_ids))
+    turns = (angles[following] - angles + np.pi) % (2 * np.pi) - np.pi
+    margin = 1e-9
+    counterclockwise = (turns > margin) & (turns < np.pi - margin)
+    clockwise = (turns < -margin) & (turns > margin - np.pi)
+    off_centre = (dx != 0) | (dy != 0)
+
+    def all_per_ring(values):
+        return np.bincount(ring_ids, weights=values, minlength=ring_count) == vertex_count
+
+    winding = np.bincount(ring_ids, weights=turns, minlength=ring_count) / (2 * np.pi)
+    return (
+        all_per_ring(off_centre) &
+        ((all_per_ring(counterclockwise) & (np.abs(winding - 1) < 1e-6)) |
+         (all_per_ring(clockwise) & (np.abs(winding + 1) < 1e-6)))
+    )
+
+def _segments_intersect_arrays(ax, ay, bx, by, cx, cy, dx, dy):
+    """Vectorized `segments_intersect` over arrays of segment pairs a-b and c-d."""
+    o1 = np.sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+    o2 = np.sign((bx - ax) * (dy - ay) - (by - ay) * (dx - ax))
+    o3 = np.sign((dx - cx) * (ay - cy) - (dy - cy) * (ax - cx))
+    o4 = np.sign((dx - cx) * (by - cy) - (dy - cy) * (bx - cx))
+
+    def within(px, py, qx, qy, rx, ry):
+        return (
+            (np.minimum(px, qx) <= rx) & (rx <= np.maximum(px, qx)) &
+            (np.minimum(py, qy) <= ry) & (ry <= np.maximum(py, qy))
+        )
+
+    return (
+        ((o1 != o2) & (o3 != o4)) |
+        ((o1 == 0) & within(ax, ay, bx, by, cx, cy)) |
+        ((o2 == 0) & within(ax, ay, bx, by, dx, dy)) |
+        ((o3 == 0) & within(cx, cy, dx, dy, ax, ay)) |
+        ((o4 == 0) & within(cx, cy, dx, dy, bx, by))
+    )
+
+def _pairwise_self_intersecting(rings, first, x, y, following, count):
+    """
+    Compare every pair of non-consecutive edges of rings that all have `count` vertices.
+
+    Only pairs whose bounding boxes overlap go through the orientation tests.
+
+    :param following: Position of the next vertex of each vertex; edge k runs from vertex k to it.
+    :return: Array of the ids of the rings where two of those edges intersect.
+    """
+    edge_i, edge_j = np.triu_indices(count, k=2)
+    non_consecutive = ~((edge_i == 0) & (edge_j == count - 1))
+    edge_i, edge_j = edge_i[non_consecutive], edge_j[non_consecutive]
+
+    end_x, end_y = x[following], y[following]
+    low_x, high_x = np.minimum(x, end_x), np.maximum(x, end_x)
+    low_y, high_y = np.minimum(y, end_y), np.maximum(y, end_y)
+
+    found = []
+    rings_per_chunk = max(1, PAIRWISE_CHUNK_SIZE // max(len(edge_i), 1))
+    for chunk_start in range(0, len(rings), rings_per_chunk):
+        chunk = rings[chunk_start:chunk_start + rings_per_chunk]
+        start = first[chunk][:, None]
+        a, c = start + edge_i, start + edge_j
+        overlapping = (
+            (low_x[a] <= high_x[c]) & (low_x[c] <= high_x[a]) &
+            (low_y[a] <= high_y[c]) & (low_y[c] <= high_y[a])
+        )
+        ring_position, _ = np.nonzero(overlapping)
+        a, c = a[overlapping], c[overlapping]
+        intersecting = _segments_intersect_arrays(x[a], y[a], end_x[a], end_y[a], x[c], y[c], end_x[c], end_y[c])
+        found.append(chunk[np.unique(ring_position[intersecting])])
+    return np.concatenate(found) if found else np.array([], dtype=int)
+
+def find_self_intersecting_rings(ring_ids, x, y, vertex_count):
+    """
+    Find the rings whose boundary crosses or touches itself.
+
+    Star-shaped rings are simple and skipped. The others are checked pairwise with NumPy,
+    grouped by vertex count, up to PAIRWISE_MAX_VERTICES vertices, and with the
+    `ring_self_intersects` sweep line above that.
+
+    :param ring_ids: Ring of each vertex, as returned by `build_rings`.
+    :param x: X coordinate of each vertex, as returned by `build_rings`.
+    :param y: Y coordinate of each vertex, as returned by `build_rings`.
+    :param vertex_count: Vertex count of each ring, as returned by `measure_rings`.
+    :return: Array of the ids of the self-intersecting rings.
+    """
+    if not len(ring_ids):
+        return np.array([], dtype=int)
+    first = np.concatenate(([0], np.cumsum(vertex_count)))
+
+    # Consecutive edges share a vertex; they only intersect when the boundary folds back on itself
+    following = _following_vertices(ring_ids, _ring_starts(ring_ids))
+    preceding = np.empty_like(following)
+    preceding[following] = np.arange(len(following))
+    previous_x, previous_y = x[preceding] - x, y[preceding] - y
+    next_x, next_y = x[following] - x, y[following] - y
+    folds = (previous_x * next_y - previous_y * next_x == 0) & (previous_x * next_x + previous_y * next_y > 0)
+    folded = np.bincount(ring_ids[folds], minlength=len(vertex_count)) > 0
+
+    # A triangle has no pair of non-consecutive edges, so only a fold can make it intersect itself
+    candidates = np.flatnonzero(
+        (vertex_count >= 4) & ~folded & ~_star_shaped_rings(ring_ids, x, y, vertex_count)
+    )
+    intersecting = [np.flatnonzero(folded & (vertex_count >= 3))]
+    small = candidates[vertex_count[candidates] <= PAIRWISE_MAX_VERTICES]
+    for count in np.unique(vertex_count[small]):
+        intersecting.append(_pairwise_self_intersecting(small[vertex_count[small] == count], first, x, y, following, int(count)))
+    intersecting.append(np.array([
+        ring for ring in candidates[vertex_count[candidates] > PAIRWISE_MAX_VERTICES]
+        if ring_self_intersects(x[first[ring]:first[ring + 1]], y[first[ring]:first[ring + 1]])
+    ], dtype=int))
+    return np.sort(np.concatenate(intersecting))
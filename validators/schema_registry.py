@@ -0,0 +1,56 @@
+import hashlib
+import threading
+
+from config.logger_config import configure_logger
+from utils.generate_pandera_schema import fetch_schema_definition
+
+# Configure logger
+logger = configure_logger("schema_registry.log")
+
+# Built schemas per table and builder: {(table_name, build_schema): (fingerprint, schema)}
+_compiled_schemas = {}
+_registry_lock = threading.Lock()
+
+def schema_fingerprint(query, data_columns):
+    """
+    Hash a stored table definition.
+
+    :param query: CREATE statement stored in sql_script_store.
+    :param data_columns: Comma-separated data columns stored in sql_script_store.
+    :return: SHA-256 hex digest identifying the definition.
+    """
+    definition = f"{query}\0{data_columns or ''}"
+    return hashlib.sha256(definition.encode("utf-8")).hexdigest()
+
+def get_schema(table_name, build_schema):
+    """
+    Return the validation schema for a table, building it only when its definition changed.
+
+    The definition comes from the cached schema catalog, so a call makes no query; the PRAGMA
+    query, source generation and class construction done by `build_schema` only run on the first
+    call or after a new schema was applied and the stored DDL / data_columns changed.
+
+    :param table_name: Name of the table the schema validates.
+    :param build_schema: Callable taking the table name and returning the schema (class or source).
+    :return: The schema returned by `build_schema`, cached per table and builder.
+    """
+    definition = fetch_schema_definition(table_name)
+    if definition is None:
+        raise ValueError(f"No schema definition found for table: {table_name}")
+
+    fingerprint = schema_fingerprint(*definition)
+    with _registry_lock:
+        cache_key = (table_name, build_schema)
+        cached = _compiled_schemas.get(cache_key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        logger.info("Compiling validation schema for table '%s' (definition %s).", table_name, fingerprint[:12])
+        schema = build_schema(table_name)
+        _compiled_schemas[cache_key] = (fingerprint, schema)
+        return schema
+
+def clear_schema_cache():
+    """Drop every compiled schema so the next lookup rebuilds it."""
+    with _registry_lock:
+        _compiled_schemas.clear()
@@ -0,0 +1,150 @@
+from config.logger_config import configure_logger
+from utils.bulk_insert_util import get_duckdb_connection
+from utils.id_allocator import reserve_ids
+from validators.polygon_geometry import ZERO_AREA_TOLERANCE
+
+# Configure logger
+logger = configure_logger("validation.log")
+
+# Vertex count, signed shoelace area and extent of each FieldName's polygon, the way
+# `validators.polygon_geometry` measures them: vertices in file order, without repeats of the
+# previous vertex or the closing vertex, and coordinates taken relative to the first vertex
+POLYGON_RING_MEASURES = """
+    WITH coordinates AS (
+        SELECT row_index, FieldName, CAST(X AS DOUBLE) AS X, CAST(Y AS DOUBLE) AS Y,
+            lag(X) OVER (PARTITION BY FieldName ORDER BY row_index) AS previous_x,
+            lag(Y) OVER (PARTITION BY FieldName ORDER BY row_index) AS previous_y
+        FROM {staging}
+        WHERE FieldName IS NOT NULL AND X IS NOT NULL AND Y IS NOT NULL
+    ), distinct_vertices AS (
+        SELECT row_index, FieldName, X, Y,
+            first_value(X) OVER ring AS first_x, first_value(Y) OVER ring AS first_y,
+            row_number() OVER ring AS position, COUNT(*) OVER (PARTITION BY FieldName) AS vertex_count
+        FROM coordinates
+        WHERE previous_x IS NULL OR X <> previous_x OR Y <> previous_y
+        WINDOW ring AS (PARTITION BY FieldName ORDER BY row_index)
+    ), vertices AS (
+        SELECT row_index, FieldName, X - first_x AS x, Y - first_y AS y
+        FROM distinct_vertices
+        WHERE NOT (position = vertex_count AND position > 1 AND X = first_x AND Y = first_y)
+    ), edges AS (
+        SELECT FieldName, x, y,
+            coalesce(lead(x) OVER ring, 0) AS next_x, coalesce(lead(y) OVER ring, 0) AS next_y
+        FROM vertices
+        WINDOW ring AS (PARTITION BY FieldName ORDER BY row_index)
+    )
+    SELECT FieldName, COUNT(*) AS vertex_count, SUM(x * next_y - next_x * y) / 2 AS area,
+        greatest(max(x) - min(x), max(y) - min(y)) AS extent
+    FROM edges
+    GROUP BY FieldName
+"""
+
+# Field business rules as set-based queries over a staged upload. Each query selects the
+# failing rows of `{staging}` as (row_index, field_name), plus error_code for a rule without a
+# fixed code; `row_index` is the row's position in the file.
+FIELD_SQL_RULES = [
+    # DiscoveryDate must not be in the future
+    ("future_discovery_date", "row_validation", """
+        SELECT row_index, 'DiscoveryDate' AS field_name
+        FROM {staging}
+        WHERE DiscoveryDate > CAST(CAST(current_localtimestamp() AS DATE) AS TIMESTAMP)
+    """),
+    # FieldType and DiscoveryDate must be consistent for each FieldName
+    ("Inconsistent_field_data", "group_validation", """
+        SELECT s.row_index, s.FieldName AS field_name
+        FROM {staging} s
+        JOIN (
+            SELECT FieldName
+            FROM {staging}
+            GROUP BY FieldName
+            HAVING COUNT(DISTINCT FieldType) > 1 OR COUNT(DISTINCT DiscoveryDate) > 1
+        ) g ON s.FieldName = g.FieldName
+    """),
+    # X, Y and CRS must be all present or all null on every row of a FieldName
+    ("polygon_incomplete", "group_validation", """
+        SELECT s.row_index, s.FieldName AS field_name
+        FROM {staging} s
+        JOIN (
+            SELECT FieldName
+            FROM {staging}
+            GROUP BY FieldName
+            HAVING bool_or((X IS NULL) <> (Y IS NULL) OR (Y IS NULL) <> (CRS IS NULL))
+        ) g ON s.FieldName = g.FieldName
+    """),
+    # The first and last coordinates of a FieldName's polygon must match
+    ("polygon_not_closed", "group_validation", """
+        SELECT s.row_index, s.FieldName AS field_name
+        FROM {staging} s
+        JOIN (
+            SELECT FieldName
+            FROM {staging}
+            WHERE X IS NOT NULL AND Y IS NOT NULL
+            GROUP BY FieldName
+            HAVING COUNT(*) >= 2 AND (
+                arg_min(X, row_index) <> arg_max(X, row_index) OR
+                arg_min(Y, row_index) <> arg_max(Y, row_index)
+            )
+        ) g ON s.FieldName = g.FieldName
+        WHERE s.X IS NOT NULL AND s.Y IS NOT NULL
+    """),
+    # A FieldName's polygon must have at least 3 distinct vertices and an area, whichever way
+    # its vertices run; the rings are measured once for both error codes
+    (None, "group_validation", f"""
+        SELECT s.row_index, s.FieldName AS field_name,
+            CASE
+                WHEN g.vertex_count < 3 THEN 'polygon_too_few_vertices'
+                ELSE 'polygon_zero_area'
+            END AS error_code
+        FROM {{staging}} s
+        JOIN ({POLYGON_RING_MEASURES}) g ON s.FieldName = g.FieldName
+        WHERE s.X IS NOT NULL AND s.Y IS NOT NULL
+            AND (g.vertex_count < 3 OR abs(g.area) <= {ZERO_AREA_TOLERANCE} * g.extent * g.extent)
+    """),
+]
+
+def run_sql_rules(session, staging_table, file_id, rules=FIELD_SQL_RULES):
+    """
+    Run the business rules inside DuckDB and write their errors straight to `validation_errors`.
+
+    The rules run as one query whose rows are inserted with INSERT ... SELECT, so the error
+    rows never pass through Python.
+
+    :param session: SQLAlchemy session whose connection owns the staging table.
+    :param staging_table: Name of the staging table holding the upload.
+    :param file_id: ID of the file being validated.
+    :param rules: List of (error_code, error_type, query) tuples; a rule whose error_code is None
+        selects the code of each failing row in an error_code column.
+    :return: Number of errors written.
+    """
+    connection = get_duckdb_connection(session)
+    selects = []
+    for error_code, error_type, query in rules:
+        code_column = "error_code" if error_code is None else f"'{error_code}'"
+        selects.append(
+            f"SELECT row_index, field_name, '{error_type}' AS error_type, {code_column} AS error_code "
+            f"FROM ({query.format(staging=staging_table)})"
+        )
+    failing_rows = " UNION ALL ".join(selects)
+
+    # Materialize the errors first, so a block of ids of the right size can be reserved
+    errors_table = f"{staging_table}_errors"
+    connection.execute(f"CREATE OR REPLACE TEMP TABLE {errors_table} AS {failing_rows}")
+    try:
+        count = connection.execute(f"SELECT COUNT(*) FROM {errors_table}").fetchone()[0]
+        if count:
+            error_ids = reserve_ids(session, "validation_errors", count)
+            connection.execute(
+                f"""
+                INSERT INTO validation_errors (error_id, file_id, row_index, field_name, error_type, error_code, created_at)
+                SELECT ? + row_number() OVER (ORDER BY row_index) - 1,
+                    ?, row_index, field_name, error_type, error_code, current_localtimestamp()
+                FROM {errors_table}
+                ORDER BY row_index
+                """,
+                [error_ids.start, file_id]
+            )
+    finally:
+        connection.execute(f"DROP TABLE IF EXISTS {errors_table}")
+
+    logger.info("%s business rule errors written for file ID %s.", count, file_id)
+    return count
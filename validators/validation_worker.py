@@ -0,0 +1,46 @@
+import time
+
+import pandas as pd
+
+from utils.pipeline_metrics import peak_memory_bytes
+from validators.field_schema import build_custom_schema, run_validation
+
+# Schema classes compiled in this worker process, keyed by their source
+_compiled_schemas = {}
+
+def _get_compiled_schema(schema_code):
+    """Compile the schema source once per worker process."""
+    schema_class = _compiled_schemas.get(schema_code)
+    if schema_class is None:
+        schema_class = build_custom_schema(schema_code)
+        _compiled_schemas[schema_code] = schema_class
+    return schema_class
+
+def validate_file_task(file_id, filepath, column_list, schema_code):
+    """
+    Parse and validate one uploaded file inside a validator process.
+
+    Validator processes never open the DuckDB database; everything they need is passed in
+    and the results are sent back to the writer process.
+
+    :param file_id: ID of the file in the `files` table.
+    :param filepath: Path of the CSV file to validate.
+    :param column_list: Columns required in the file.
+    :param schema_code: Source of the generated Pandera schema class.
+    :return: Dictionary with the parsed DataFrame, the error frame, any missing columns, the
+        stage durations and the worker's peak memory.
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(filepath)
+    timings = {"read_csv": time.perf_counter() - start}
+
+    missing_columns = [col for col in column_list if col not in df.columns]
+    if missing_columns:
+        return {"file_id": file_id, "missing_columns": missing_columns, "df": None, "errors_df": None,
+                "timings": timings, "peak_memory_bytes": peak_memory_bytes()}
+
+    start = time.perf_counter()
+    errors_df = run_validation(df, _get_compiled_schema(schema_code))
+    timings["validation"] = time.perf_counter() - start
+    return {"file_id": file_id, "missing_columns": [], "df": df, "errors_df": errors_df,
+            "timings": timings, "peak_memory_bytes": peak_memory_bytes()}